@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2026 Orange and others.
+#
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+"""Bulk class to push the results to the DB in chunks"""
+
+import json
+import logging
+from urllib.parse import urlparse
+
+import requests
+
+from xtesting.core import testcase
+from xtesting.utils import env
+from xtesting.utils import session
+
+LOGGER = logging.getLogger('xtesting.ci.bulk')
+
+UNSUPPORTED = (400, 404, 405, 415, 422, 501)
+"""HTTP status codes meaning that the DB does not support the format"""
+
+
+class Bulk():
+    """Push chunks of result records to the DB
+
+    Every chunk is first posted as one json array to the bulk endpoint of
+    the DB (TEST_DB_BULK_URL). If it does not support it, the chunk is
+    streamed as NDJSON (one record per line). The records are finally
+    pushed one by one to TEST_DB_URL as before. The first format accepted
+    by the DB is kept for the next chunks.
+
+    A success of TEST_DB_URL says nothing about the support of a chunk
+    (it could store it as one result). That's why the chunks are only
+    posted if TEST_DB_BULK_URL is explicitly set.
+    """
+
+    BULK = 'bulk'
+    NDJSON = 'ndjson'
+    SINGLE = 'single'
+
+    def __init__(self, size, interval):
+        self.size = size
+        self.interval = interval
+        self.modes = [self.BULK, self.NDJSON, self.SINGLE]
+
+    @staticmethod
+    def post(mode, url, data):
+        """Post one chunk as a json array or as NDJSON"""
+        if mode == Bulk.BULK:
+            return session.post(
+                url, data=json.dumps(data, sort_keys=True),
+                headers=testcase.TestCase.headers)
+        return session.post(
+            url, data=''.join(
+                json.dumps(item, sort_keys=True) + '\n' for item in data),
+            headers={'Content-Type': 'application/x-ndjson'})
+
+    def push(self, records):
+        """Push a chunk of result records
+
+        Returns:
+            the push_to_db() value of every record
+        """
+        url = env.get('TEST_DB_BULK_URL')
+        if not url or urlparse(env.get('TEST_DB_URL')).scheme == 'file':
+            return [record.push_to_db() for record in records]
+        results = [testcase.TestCase.EX_PUSH_TO_DB_ERROR] * len(records)
+        indexes, data = [], []
+        for i, record in enumerate(records):
+            try:
+                assert not record.is_skipped
+                data.append(record.get_db_data())
+                indexes.append(i)
+            except AssertionError:
+                LOGGER.error("Please run %s before publishing the results",
+                             record.case_name)
+        while data and self.modes[0] != self.SINGLE:
+            try:
+                req = self.post(self.modes[0], url, data)
+                req.raise_for_status()
+            except requests.exceptions.HTTPError as exc:
+                if exc.response.status_code not in UNSUPPORTED:
+                    LOGGER.exception("Cannot push %d results to DB",
+                                     len(data))
+                    return results
+                LOGGER.info("The DB does not support %s (%s)",
+                            self.modes.pop(0), exc.response.status_code)
+                continue
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception("Cannot push %d results to DB", len(data))
+                return results
+            LOGGER.info("%d results were pushed to DB in one request (%s)",
+                        len(data), self.modes[0])
+            for i in indexes:
+                results[i] = testcase.TestCase.EX_OK
+            return results
+        for i in indexes:
+            results[i] = records[i].push_to_db()
+        return results
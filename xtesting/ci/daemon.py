@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2026 Orange and others.
+#
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+"""Serve run_tests over a UNIX socket to save its startup
+
+run_tests --serve imports all the drivers and parses testcases.yaml
+once. Every request of run_tests_client is then run in a child process
+forked from the daemon with the arguments, the environment variables,
+the working directory and the standard outputs of the client.
+
+This module only depends on the standard library to keep the client
+thin.
+"""
+
+import json
+import logging
+import os
+import socket
+import sys
+
+from xtesting.utils import constants
+
+LOGGER = logging.getLogger('xtesting.ci.daemon')
+
+REAP_INTERVAL = 1
+
+
+def reap_children():
+    """Reap the child processes which exited"""
+    try:
+        while os.waitpid(-1, os.WNOHANG)[0]:
+            pass
+    except ChildProcessError:
+        pass
+
+
+def handle(conn, handler):
+    """Run one request in the child process forked for it
+
+    The standard outputs of the client are received over the socket and
+    replace the ones of the child process. The value returned by
+    handler(argv) is sent back once it returns.
+    """
+    conn.settimeout(None)
+    _, fds, _, _ = socket.recv_fds(conn, 1, 2)
+    with conn.makefile('rb') as rfile:
+        data = json.loads(rfile.readline())
+    sys.stdout.flush()
+    sys.stderr.flush()
+    for i, fdesc in enumerate(fds):
+        os.dup2(fdesc, i + 1)
+        os.close(fdesc)
+    os.chdir(data['cwd'])
+    os.environ.clear()
+    os.environ.update(data['env'])
+    try:
+        result = handler(data['argv'])
+    except SystemExit as exc:
+        result = exc.code if isinstance(exc.code, int) else os.EX_USAGE
+    except Exception:  # pylint: disable=broad-except
+        LOGGER.exception("Cannot run %s", data['argv'])
+        result = os.EX_SOFTWARE
+    sys.stdout.flush()
+    sys.stderr.flush()
+    conn.sendall(json.dumps({'result': result}).encode('utf-8') + b'\n')
+    conn.close()
+
+
+def serve(handler, path=constants.SOCKET_PATH):
+    """Fork a child process calling handler(argv) for every client
+
+    It serves until it is interrupted.
+    """
+    if os.path.exists(path):
+        os.remove(path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen()
+    server.settimeout(REAP_INTERVAL)
+    LOGGER.info("Serving run_tests on %s", path)
+    try:
+        while True:
+            reap_children()
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                continue
+            if os.fork() == 0:
+                status = os.EX_OK
+                try:
+                    server.close()
+                    handle(conn, handler)
+                except BaseException:  # pylint: disable=broad-except
+                    LOGGER.exception("Cannot handle the request")
+                    status = os.EX_SOFTWARE
+                finally:
+                    os._exit(status)  # pylint: disable=protected-access
+            conn.close()
+    except KeyboardInterrupt:
+        LOGGER.info("Stopping serving run_tests")
+    finally:
+        server.close()
+        os.remove(path)
+    return os.EX_OK
+
+
+def request(argv, path=constants.SOCKET_PATH):
+    """Submit run_tests arguments to run_tests --serve
+
+    The outputs are written by the daemon straight to the ones of the
+    current process.
+
+    Returns:
+        the exit code of run_tests
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError as exc:
+            print(f"Cannot connect to run_tests --serve ({path}): {exc}",
+                  file=sys.stderr)
+            return os.EX_UNAVAILABLE
+        sys.stdout.flush()
+        sys.stderr.flush()
+        try:
+            socket.send_fds(
+                sock, [b'\0'], [sys.stdout.fileno(), sys.stderr.fileno()])
+            sock.sendall(json.dumps({
+                'argv': argv, 'env': dict(os.environ),
+                'cwd': os.getcwd()}).encode('utf-8') + b'\n')
+            with sock.makefile('rb') as rfile:
+                response = rfile.readline()
+        except (BrokenPipeError, ConnectionResetError):
+            response = b''
+    if not response:
+        print("run_tests --serve exited without any result",
+              file=sys.stderr)
+        return os.EX_SOFTWARE
+    return json.loads(response)['result']
+
+
+def main():
+    """Entry point of the thin client (it accepts all run_tests options)"""
+    return request(sys.argv[1:])
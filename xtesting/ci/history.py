@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2026 Orange and others.
+#
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+"""History class to keep the durations measured by the previous runs"""
+
+import json
+import logging
+import os
+
+from xtesting.utils import constants
+
+LOGGER = logging.getLogger('xtesting.ci.history')
+
+
+class History():
+    """Durations of the test cases in seconds
+
+    The last duration measured for every test case is stored in a local
+    json file. The test cases never run before fall back to default.
+    """
+
+    DEFAULT_DURATION = 60.0
+
+    def __init__(self, filename=constants.DURATIONS_PATH,
+                 default=DEFAULT_DURATION):
+        self.filename = filename
+        self.default = default
+        self.durations = {}
+        self.updated = False
+        self.load()
+
+    def load(self):
+        """Load the durations from the history file"""
+        try:
+            with open(self.filename, encoding='utf-8') as hfile:
+                self.durations = json.load(hfile)
+        except (OSError, ValueError):
+            LOGGER.debug("No valid history found in %s", self.filename)
+            self.durations = {}
+
+    def get(self, name):
+        """Get the expected duration of a test case"""
+        return self.durations.get(name, self.default)
+
+    def update(self, test_case):
+        """Store the duration measured by a test case
+
+        Skipped test cases and invalid times are ignored.
+        """
+        if test_case.is_skipped:
+            return
+        try:
+            duration = float(test_case.stop_time) - float(
+                test_case.start_time)
+        except (TypeError, ValueError):
+            return
+        if test_case.start_time and duration >= 0:
+            self.durations[test_case.case_name] = duration
+            self.updated = True
+
+    def save(self):
+        """Write the history file if any duration was updated"""
+        if not self.updated:
+            return
+        try:
+            with open(f'{self.filename}.tmp', 'w',
+                      encoding='utf-8') as hfile:
+                json.dump(self.durations, hfile, sort_keys=True, indent=2)
+            os.replace(f'{self.filename}.tmp', self.filename)
+            self.updated = False
+        except OSError:
+            LOGGER.exception("Cannot write %s", self.filename)
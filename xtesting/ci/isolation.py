@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2026 Orange and others.
+#
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+"""Run functions in child processes forked from a pre-warmed server
+
+The forkserver imports all the drivers declared in the xtesting.testcase
+namespace once. Every child process is then forked from it which keeps
+their startups cheap and the memory of the runner flat.
+"""
+
+import logging
+import multiprocessing
+import os
+import resource
+import signal
+import time
+
+from xtesting.ci import registry
+from xtesting.core import testcase
+
+LOGGER = logging.getLogger('xtesting.ci.isolation')
+
+_CONTEXT = None
+
+WATCHDOG_INTERVAL = 1
+
+
+class IsolationError(Exception):
+    """Exception when the child process exits without any result"""
+
+    reason = 'crash'
+
+
+class LimitExceeded(IsolationError):
+    """Exception when the child process is killed for breaching a limit"""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+class Cancelled(IsolationError):
+    """Exception when the child process is killed as the run is cancelled"""
+
+    reason = 'cancelled'
+
+
+class ExecutedTestCase(testcase.TestCase):
+    """Result record of a test case executed in a child process
+
+    It only keeps what is needed by the runner and by push_to_db().
+    """
+
+    attributes = ['project_name', 'case_name', 'criteria', 'result',
+                  'start_time', 'stop_time', 'is_skipped', 'details']
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.successful = kwargs.get(
+            'successful', testcase.TestCase.EX_TESTCASE_FAILED)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build the record from the dict returned by to_dict()"""
+        record = cls(**data)
+        for attribute in cls.attributes:
+            setattr(record, attribute, data[attribute])
+        return record
+
+    @classmethod
+    def from_test_case(cls, test_case):
+        """Build the record of a test case"""
+        data = {attribute: getattr(test_case, attribute)
+                for attribute in cls.attributes}
+        data['successful'] = test_case.is_successful()
+        return cls.from_dict(data)
+
+    def to_dict(self):
+        """Get all the attributes of the record"""
+        data = {attribute: getattr(self, attribute)
+                for attribute in self.attributes}
+        data['successful'] = self.successful
+        return data
+
+    def is_successful(self):
+        return self.successful
+
+    def run(self, **kwargs):
+        return self.EX_RUN_ERROR
+
+
+def get_preloaded_modules():
+    """Get the modules of all the drivers"""
+    modules = ['xtesting.ci.run_tests']
+    for value in registry.get_registry().get_drivers().values():
+        module = value.partition(':')[0].strip()
+        if module not in modules:
+            modules.append(module)
+    return modules
+
+
+def get_context():
+    """Get the forkserver context (it preloads the drivers once)"""
+    global _CONTEXT  # pylint: disable=global-statement
+    if _CONTEXT is None:
+        _CONTEXT = multiprocessing.get_context('forkserver')
+        _CONTEXT.set_forkserver_preload(get_preloaded_modules())
+    return _CONTEXT
+
+
+def get_rss(pgid):
+    """Get the resident memory in bytes of all the processes of a group"""
+    rss = 0
+    for pid in os.listdir('/proc'):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f'/proc/{pid}/stat', encoding='utf-8') as sfile:
+                fields = sfile.read().rsplit(')', 1)[1].split()
+            if int(fields[2]) != pgid:
+                continue
+            with open(f'/proc/{pid}/statm', encoding='utf-8') as sfile:
+                rss += int(sfile.read().split()[1]) * resource.getpagesize()
+        except (OSError, IndexError, ValueError):
+            continue
+    return rss
+
+
+def kill(process):
+    """Kill the child process and all the processes it started"""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        process.kill()
+    process.join()
+
+
+def watch(process, reader, limits, cancel_event=None):
+    """Wait for the output of the child process while enforcing limits
+
+    Raises:
+        LimitExceeded if the timeout or the memory limit is breached,
+        Cancelled if cancel_event is set
+    """
+    deadline = None
+    if limits.get('timeout'):
+        deadline = time.monotonic() + limits['timeout']
+    while not reader.poll(WATCHDOG_INTERVAL):
+        if cancel_event and cancel_event.is_set():
+            kill(process)
+            raise Cancelled("The child process was killed as the run is "
+                            "cancelled")
+        if deadline and time.monotonic() > deadline:
+            kill(process)
+            raise LimitExceeded(
+                'timeout',
+                f"The child process was killed after {limits['timeout']}s")
+        if limits.get('memory_limit') and get_rss(
+                process.pid) > limits['memory_limit']:
+            kill(process)
+            raise LimitExceeded(
+                'memory_limit',
+                "The child process was killed as it used more than "
+                f"{limits['memory_limit']} bytes")
+
+
+def _target(writer, environ, limits, function, *args):
+    os.environ.clear()
+    os.environ.update(environ)
+    os.setpgid(0, 0)
+    if limits.get('cpu_limit'):
+        cpu_limit = int(limits['cpu_limit'])
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit, cpu_limit + 1))
+    try:
+        output = (True, function(*args))
+    except Exception as exc:  # pylint: disable=broad-except
+        output = (False, exc)
+    try:
+        writer.send(output)
+    except Exception as exc:  # pylint: disable=broad-except
+        writer.send((False, IsolationError(
+            f"Cannot send the output of the child process: {exc}")))
+    writer.close()
+
+
+def run(function, *args, limits=None, cancel_event=None):
+    """Call function(*args) in a child process
+
+    The child process inherits the current environment variables.
+
+    The child process leads its own process group so that all the
+    processes it starts are killed with it (see kill()).
+
+    The limits (timeout, cpu_limit in seconds and memory_limit in bytes)
+    apply to the child process and to all the processes it starts. The
+    CPU time of each process is limited via setrlimit whereas a watchdog
+    kills them all if the timeout or the overall memory limit is
+    breached. The watchdog kills them as well as soon as cancel_event (a
+    multiprocessing event) is set.
+
+    Returns:
+        the value returned by function
+
+    Raises:
+        the exception raised by function, LimitExceeded if a limit is
+        breached, Cancelled if the run is cancelled or IsolationError if
+        the child process exits without any output.
+    """
+    limits = limits or {}
+    context = get_context()
+    reader, writer = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_target,
+        args=(writer, dict(os.environ), limits, function) + args)
+    process.start()
+    writer.close()
+    try:
+        watch(process, reader, limits, cancel_event)
+        succeeded, output = reader.recv()
+    except EOFError as exc:
+        process.join()
+        if process.exitcode == -signal.SIGXCPU:
+            raise LimitExceeded(
+                'cpu_limit',
+                "The child process was killed after "
+                f"{limits['cpu_limit']}s of CPU time") from exc
+        raise IsolationError(
+            f"The child process exited with {process.exitcode}") from exc
+    except KeyboardInterrupt:
+        # the process group no longer receives the signals of the terminal
+        kill(process)
+        raise
+    finally:
+        reader.close()
+    process.join()
+    if not succeeded:
+        raise output
+    return output
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2026 Orange and others.
+#
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+"""Journal class to resume interrupted campaigns"""
+
+import json
+import logging
+import os
+
+from xtesting.ci import isolation
+from xtesting.utils import constants
+
+LOGGER = logging.getLogger('xtesting.ci.journal')
+
+
+class Journal():
+    """Append-only journal of the finished test cases
+
+    Every finished test case is written as one json line (results,
+    times and details) and synced to disk before the next one starts.
+    A new campaign truncates the journal at its first write whereas a
+    resumed one loads it to skip the test cases already finished.
+    """
+
+    def __init__(self, filename=constants.JOURNAL_PATH):
+        self.filename = filename
+        self.records = {}
+        self.truncate = True
+        self.partial = False
+
+    def load(self):
+        """Load the journal of the interrupted campaign
+
+        The last line is ignored if it was partially written.
+        """
+        self.records = {}
+        self.truncate = False
+        try:
+            with open(self.filename, encoding='utf-8') as jfile:
+                for line in jfile:
+                    self.partial = not line.endswith('\n')
+                    try:
+                        data = json.loads(line)
+                    except ValueError:
+                        LOGGER.warning("Ignoring invalid journal entry %s",
+                                       line.rstrip())
+                        continue
+                    self.records[data['case_name']] = data
+        except OSError:
+            LOGGER.info("No journal found in %s", self.filename)
+        LOGGER.info("Test cases already finished: %s",
+                    ' '.join(self.records))
+
+    def get_test_case(self, name):
+        """Get the result record of a finished test case
+
+        Returns:
+            an ExecutedTestCase or None if the test case is not journaled
+        """
+        if name not in self.records:
+            return None
+        return isolation.ExecutedTestCase.from_dict(self.records[name])
+
+    def append(self, test_case):
+        """Journal a finished test case (only once)"""
+        if test_case.case_name in self.records:
+            return
+        data = isolation.ExecutedTestCase.from_test_case(
+            test_case).to_dict()
+        try:
+            with open(self.filename, 'w' if self.truncate else 'a',
+                      encoding='utf-8') as jfile:
+                if self.partial:
+                    jfile.write('\n')
+                jfile.write(json.dumps(data, default=str) + '\n')
+                jfile.flush()
+                os.fsync(jfile.fileno())
+            self.truncate = False
+            self.partial = False
+            self.records[test_case.case_name] = data
+        except OSError:
+            LOGGER.exception("Cannot journal %s", test_case.case_name)
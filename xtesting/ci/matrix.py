@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2026 Orange and others.
+#
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+"""Run the same campaign against several scenarios in one invocation
+
+run_tests --matrix KEY=VALUE[,KEY=VALUE] (once per scenario) runs the
+campaign with every env overlay (e.g. DEPLOY_SCENARIO and INSTALLER_TYPE)
+in child processes forked from the runner. testcases.yaml is parsed and
+the drivers are imported only once. Every scenario stores its results in
+its own directory of RESULTS_DIR and all of them are merged into one
+report.
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import re
+import sys
+
+from xtesting.utils import constants
+
+LOGGER = logging.getLogger('xtesting.ci.matrix')
+
+RESULTS_FILE = 'matrix.json'
+
+
+def parse_scenario(value):
+    """Parse KEY=VALUE[,KEY=VALUE] as passed to run_tests --matrix"""
+    try:
+        overlay = dict(item.split('=', 1) for item in value.split(','))
+        assert all(re.fullmatch(r'[A-Za-z_]\w*', key) for key in overlay)
+    except (AssertionError, ValueError) as exc:
+        raise argparse.ArgumentTypeError(
+            f"{value} is not a valid scenario "
+            "(KEY=VALUE[,KEY=VALUE])") from exc
+    return overlay
+
+
+def get_names(scenarios):
+    """Get the names of the scenarios (i.e. of their result directories)
+
+    A name is made of the values of the overlay (e.g.
+    os-nosdn-nofeature-ha_fuel). The duplicates are suffixed by their
+    positions.
+    """
+    names = []
+    for i, overlay in enumerate(scenarios):
+        name = re.sub(r'[^\w.-]+', '_', '_'.join(overlay.values())).strip(
+            '._') or 'scenario'
+        names.append(f'{name}-{i + 1}' if name in names else name)
+    return names
+
+
+def get_environ(overlay):
+    """Get the snapshot of the env vars of a scenario"""
+    environ = dict(os.environ)
+    environ.update(overlay)
+    return environ
+
+
+def get_results_dir(name):
+    """Get the result directory of a scenario"""
+    return os.path.join(constants.RESULTS_DIR, name)
+
+
+def dump(name, overlay, result, rows):
+    """Dump the results of a scenario to be merged by the runner"""
+    filename = os.path.join(get_results_dir(name), RESULTS_FILE)
+    with open(filename, 'w', encoding='utf-8') as rfile:
+        json.dump({'scenario': name, 'env': overlay, 'result': result,
+                   'testcases': rows}, rfile, indent=2)
+
+
+def load(name):
+    """Load the results dumped by a scenario
+
+    Returns:
+        the results or None if the scenario did not dump any
+    """
+    filename = os.path.join(get_results_dir(name), RESULTS_FILE)
+    try:
+        with open(filename, encoding='utf-8') as rfile:
+            return json.load(rfile)
+    except (OSError, ValueError):
+        LOGGER.error("No results found for the scenario %s", name)
+        return None
+
+
+def run(scenarios, function):
+    """Call function(name, overlay) for every scenario in a child process
+    forked for it and wait for all of them
+
+    Returns:
+        the results dumped by every scenario (None if it did not dump any)
+    """
+    names = get_names(scenarios)
+    pids = []
+    for name, overlay in zip(names, scenarios):
+        with contextlib.suppress(OSError):
+            os.remove(os.path.join(get_results_dir(name), RESULTS_FILE))
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            status = os.EX_SOFTWARE
+            try:
+                function(name, overlay)
+                status = os.EX_OK
+            except BaseException:  # pylint: disable=broad-except
+                LOGGER.exception("Cannot run the scenario %s", name)
+            finally:
+                os._exit(status)  # pylint: disable=protected-access
+        LOGGER.info("Running the scenario %s (pid %d)", name, pid)
+        pids.append(pid)
+    for pid in pids:
+        os.waitpid(pid, 0)
+    return [load(name) for name in names]
+
+
+def merge(results):
+    """Merge the results dumped by every scenario
+
+    Every row is prefixed by the name of its scenario.
+
+    Returns:
+        the rows of the combined report and True if any scenario failed
+    """
+    rows = []
+    failed = False
+    for result in results:
+        failed = failed or result['result'] != os.EX_OK
+        for row in result['testcases']:
+            rows.append([result['scenario']] + row)
+            failed = failed or row[4] == 'FAIL'
+    return rows, failed
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2026 Orange and others.
+#
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+"""Publisher class to push the results to the DB in the background"""
+
+import logging
+import queue
+import threading
+import time
+
+from xtesting.ci import bulk
+from xtesting.ci import isolation
+from xtesting.core import testcase
+from xtesting.utils import env
+from xtesting.utils import sink
+
+LOGGER = logging.getLogger('xtesting.ci.publisher')
+
+
+class Publisher():
+    """Queue of the results to push to the DB
+
+    The runner hands over the result record of every finished test case
+    and moves on whereas a background thread pushes them one by one. The
+    queue is flushed at the end of the run.
+
+    The records are spooled before being pushed (if a spool is given) so
+    that they can be pushed again if the DB is down.
+
+    If TEST_DB_BULK_URL is set and if TEST_DB_BATCH_SIZE is greater than
+    1, the records are pushed in chunks of TEST_DB_BATCH_SIZE results or
+    of all the results queued for TEST_DB_BATCH_INTERVAL seconds (see
+    Bulk).
+    """
+
+    FLUSH_TIMEOUT = 120
+    """seconds given to the pending results to be pushed at the end"""
+
+    OK = 'OK'
+    FAIL = 'FAIL'
+    PENDING = 'PENDING'
+
+    def __init__(self, spool=None):
+        self.queue = None
+        self.thread = None
+        self.statuses = {}
+        self.spool = spool
+        self.bulk = None
+
+    def __getstate__(self):
+        # the child processes never push and cannot share the queue
+        state = self.__dict__.copy()
+        state['queue'] = None
+        state['thread'] = None
+        return state
+
+    def start(self):
+        """Start the background thread"""
+        size = int(env.get('TEST_DB_BATCH_SIZE'))
+        if size > 1 and env.get('TEST_DB_BULK_URL'):
+            self.bulk = bulk.Bulk(
+                size, float(env.get('TEST_DB_BATCH_INTERVAL')))
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(
+            target=self.drain, name='publisher', daemon=True)
+        self.thread.start()
+
+    def submit(self, test_case):
+        """Queue the results of a test case
+
+        The test case is serialized as a result record and spooled
+        unless its driver overrides push_to_db().
+        """
+        uid = None
+        if type(test_case).push_to_db is testcase.TestCase.push_to_db:
+            test_case = isolation.ExecutedTestCase.from_test_case(test_case)
+            if self.spool:
+                uid = self.spool.add(test_case)
+        if self.thread is None:
+            self.start()
+        self.statuses[test_case.case_name] = self.PENDING
+        self.queue.put((test_case, uid))
+
+    def drain(self):
+        """Push the queued results until flush() is called"""
+        batch = []
+        deadline = None
+        while True:
+            try:
+                item = self.queue.get(timeout=max(
+                    deadline - time.monotonic(), 0) if batch else None)
+            except queue.Empty:
+                self.push_batch(batch)
+                continue
+            if item is None:
+                self.push_batch(batch)
+                return
+            if self.bulk and isinstance(item[0], isolation.ExecutedTestCase):
+                if not batch:
+                    deadline = time.monotonic() + self.bulk.interval
+                batch.append(item)
+                if len(batch) >= self.bulk.size:
+                    self.push_batch(batch)
+            else:
+                self.push(*item)
+
+    def push(self, test_case, uid):
+        """Push the results of one test case"""
+        try:
+            result = test_case.push_to_db()
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception("Cannot push the results of %s",
+                             test_case.case_name)
+            result = testcase.TestCase.EX_PUSH_TO_DB_ERROR
+        self.set_status(test_case, uid, result)
+
+    def push_batch(self, batch):
+        """Push the batched results as one chunk and empty the batch"""
+        if not batch:
+            return
+        try:
+            results = self.bulk.push([test_case for test_case, _ in batch])
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception("Cannot push %d results", len(batch))
+            results = [testcase.TestCase.EX_PUSH_TO_DB_ERROR] * len(batch)
+        for (test_case, uid), result in zip(batch, results):
+            self.set_status(test_case, uid, result)
+        batch.clear()
+
+    def set_status(self, test_case, uid, result):
+        """Set the push status of a test case (and ack its record)"""
+        if result == testcase.TestCase.EX_OK:
+            self.statuses[test_case.case_name] = self.OK
+            if uid:
+                self.spool.ack(uid)
+        else:
+            self.statuses[test_case.case_name] = self.FAIL
+
+    def flush(self, timeout=FLUSH_TIMEOUT):
+        """Wait for the pending results to be pushed (at most timeout
+        seconds)
+
+        The results written to file:// URLs are flushed too and the
+        spool is compacted once all the pushes are over.
+
+        Returns:
+            True if all the results were pushed to the DB
+        """
+        if self.thread is None:
+            return True
+        start_time = time.time()
+        self.queue.put(None)
+        self.thread.join(timeout)
+        pending = [name for name, status in self.statuses.items()
+                   if status == self.PENDING]
+        if pending:
+            LOGGER.error("The results of %s were not pushed to DB after "
+                         "%d seconds", ' '.join(pending), timeout)
+        else:
+            LOGGER.info("The queue of results was flushed in %.2f seconds",
+                        time.time() - start_time)
+            if self.spool:
+                self.spool.compact()
+        self.thread = None
+        sink.flush()
+        return all(status == self.OK for status in self.statuses.values())
+
+    def get_status(self, name):
+        """Get the push status of a test case ('' if it was not queued)"""
+        return self.statuses.get(name, '')
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2026 Orange and others.
+#
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+"""Registry class to resolve the drivers of the test cases
+
+The entry points of the xtesting.testcase namespace are only scanned
+once. The index of the drivers is also stored in a json file of the cache
+dir which remains valid as long as the installed distributions are
+unchanged.
+"""
+
+from importlib import metadata
+import hashlib
+import importlib
+import json
+import logging
+import os
+import sys
+
+from xtesting.utils import constants
+
+LOGGER = logging.getLogger('xtesting.ci.registry')
+
+NAMESPACE = 'xtesting.testcase'
+
+_REGISTRY = None
+
+
+def get_key():
+    """Get the key identifying the installed distributions
+
+    Installing, upgrading or removing a distribution modifies the
+    directory of sys.path holding its metadata. The current directory is
+    ignored as its content changes all the time.
+    """
+    paths = []
+    for path in filter(None, sys.path):
+        try:
+            paths.append([path, os.stat(path).st_mtime_ns])
+        except OSError:
+            continue
+    return hashlib.sha256(json.dumps(
+        [sys.version, paths]).encode('utf-8')).hexdigest()
+
+
+class Registry():
+    """Index of the drivers (e.g. robotframework -> module:class)
+
+    The drivers are scanned again if a test case refers to a driver which
+    is unknown or which cannot be loaded (i.e. if the index is stale).
+    """
+
+    def __init__(self, filename=constants.DRIVERS_PATH, namespace=NAMESPACE):
+        self.filename = filename
+        self.namespace = namespace
+        self.drivers = None
+        self.scanned = False
+        self.classes = {}
+
+    def load(self):
+        """Load the index from the local file if it is still valid"""
+        try:
+            with open(self.filename, encoding='utf-8') as rfile:
+                data = json.load(rfile)
+            if data['key'] == get_key() and (
+                    data['namespace'] == self.namespace):
+                self.drivers = data['drivers']
+                return True
+        except (OSError, ValueError, KeyError, TypeError):
+            LOGGER.debug("No valid driver index found in %s", self.filename)
+        return False
+
+    def save(self):
+        """Write the index to the local file"""
+        try:
+            os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+            with open(f'{self.filename}.tmp', 'w',
+                      encoding='utf-8') as rfile:
+                json.dump({'key': get_key(), 'namespace': self.namespace,
+                           'drivers': self.drivers}, rfile, sort_keys=True)
+            os.replace(f'{self.filename}.tmp', self.filename)
+        except OSError:
+            LOGGER.debug("Cannot write %s", self.filename)
+
+    def scan(self):
+        """Scan the entry points of all the installed distributions"""
+        self.drivers = {}
+        for entry_point in metadata.entry_points(group=self.namespace):
+            if entry_point.name in self.drivers:
+                LOGGER.warning(
+                    "Ignoring %s as the driver %s is already provided by %s",
+                    entry_point.value, entry_point.name,
+                    self.drivers[entry_point.name])
+                continue
+            self.drivers[entry_point.name] = entry_point.value
+        self.scanned = True
+        self.classes = {}
+        self.save()
+
+    def get_drivers(self):
+        """Get the index of the drivers"""
+        if self.drivers is None and not self.load():
+            self.scan()
+        return self.drivers
+
+    def import_class(self, name):
+        """Import the class of a driver listed in the index"""
+        if name not in self.classes:
+            if name not in self.get_drivers():
+                raise LookupError(
+                    f"No driver {name} found in {self.namespace}")
+            module, _, attributes = self.get_drivers()[name].partition(':')
+            driver = importlib.import_module(module.strip())
+            for attribute in attributes.strip().split('.'):
+                driver = getattr(driver, attribute)
+            self.classes[name] = driver
+        return self.classes[name]
+
+    def get_class(self, name):
+        """Get the class of a driver (the index is refreshed if stale)"""
+        try:
+            return self.import_class(name)
+        except (LookupError, ImportError, AttributeError):
+            if self.scanned:
+                raise
+            LOGGER.debug("Scanning the drivers again to find %s", name)
+            self.scan()
+            return self.import_class(name)
+
+    def get_driver(self, name, **kwargs):
+        """Instantiate a driver"""
+        return self.get_class(name)(**kwargs)
+
+
+def get_registry():
+    """Get the registry shared by all the runners of the process"""
+    global _REGISTRY  # pylint: disable=global-statement
+    if _REGISTRY is None:
+        _REGISTRY = Registry()
+    return _REGISTRY
@@ -14,19 +14,32 @@
 """
 
 import argparse
+import asyncio
+from concurrent import futures
+import contextlib
 import errno
+import functools
+import importlib
 import logging
-import logging.config
 import os
 import re
 import sys
 import textwrap
+import time
 
 import enum
 import prettytable
-from stevedore import driver
-import yaml
 
+from xtesting.ci import daemon
+from xtesting.ci import history
+from xtesting.ci import isolation
+from xtesting.ci import journal
+from xtesting.ci import matrix
+from xtesting.ci import publisher
+from xtesting.ci import registry
+from xtesting.ci import scheduler
+from xtesting.ci import shard
+from xtesting.ci import spool
 from xtesting.ci import tier_builder
 from xtesting.core import testcase
 from xtesting.utils import config
@@ -47,6 +60,59 @@ class BlockingTestFailed(Exception):
     """Exception when the blocking test fails"""
 
 
+_WORKER_RUNNER = None
+
+
+def _init_worker(runner):
+    """Store the runner shared by all test cases of a pool worker
+
+    The worker leads its own process group so that it can be killed with
+    all the processes it started if the run is cancelled.
+    """
+    global _WORKER_RUNNER  # pylint: disable=global-statement
+    _WORKER_RUNNER = runner
+    testcase.TestCase.cancel_event = runner.cancel_event
+    testcase.TestCase.dir_results = runner.results_dir
+    os.setpgid(0, 0)
+
+
+def _run_test_in_worker(test):
+    """Run one test case in a pool worker
+
+    Returns:
+        the return value of Runner.run_test() and the result record of the
+        test case (None if it was not loaded) as the driver itself may not
+        be picklable
+    """
+    _WORKER_RUNNER.executed_test_cases.clear()
+    result = _WORKER_RUNNER.run_test(test)
+    test_case = _WORKER_RUNNER.executed_test_cases.get(test.get_name())
+    return result, isolation.ExecutedTestCase.from_test_case(
+        test_case) if test_case else None
+
+
+def _run_test_in_child(test, test_dict, flags):
+    """Run one test case in a child process forked by the forkserver
+
+    Only the test case, its description and the runner flags are sent.
+
+    Returns:
+        the return value of Runner.execute_test() and the result record of the
+        test case (None if it was not loaded)
+    """
+    if not logging.getLogger('xtesting').handlers:
+        config.configure_logging()
+    runner = Runner(tiers=tier_builder.TestDescriptions(
+        {test.get_name(): test_dict}))
+    vars(runner).update(flags)
+    testcase.TestCase.cancel_event = runner.cancel_event
+    testcase.TestCase.dir_results = runner.results_dir
+    result = runner.execute_test(test)
+    test_case = runner.executed_test_cases.get(test.get_name())
+    return result, isolation.ExecutedTestCase.from_test_case(
+        test_case) if test_case else None
+
+
 class RunTestsParser():
     """Parser to run tests"""
     # pylint: disable=too-few-public-methods
@@ -56,7 +122,11 @@ class RunTestsParser():
         self.parser.add_argument("-t", "--test", dest="test", action='store',
                                  help="Test case or tier (group of tests) "
                                  "to be executed. It will run all the test "
-                                 "if not specified.")
+                                 "if not specified. It also accepts a "
+                                 "comma-separated list of test cases, tiers "
+                                 "and tags (tag:name) which may be glob "
+                                 "patterns (e.g. healthcheck,vping_*,"
+                                 "tag:smoke).")
         self.parser.add_argument("-n", "--noclean", help="Do not clean "
                                  "OpenStack resources after running each "
                                  "test (default=false).",
@@ -67,6 +137,48 @@ class RunTestsParser():
         self.parser.add_argument("-p", "--push", help="Push artifacts to "
                                  "S3 repository (default=false).",
                                  action="store_true")
+        self.parser.add_argument("-j", "--jobs", help="Number of test cases "
+                                 "of a tier run in parallel (default=1).",
+                                 type=int, default=1)
+        self.parser.add_argument("-i", "--isolate", help="Run each test "
+                                 "case in a child process forked from a "
+                                 "pre-warmed server (default=false).",
+                                 action="store_true")
+        self.parser.add_argument("-d", "--default-duration",
+                                 help="Expected duration in seconds of the "
+                                 "test cases missing in the history when "
+                                 "running them in parallel (default="
+                                 f"{history.History.DEFAULT_DURATION}).",
+                                 type=float,
+                                 default=history.History.DEFAULT_DURATION)
+        self.parser.add_argument("-s", "--shard", help="Only run the i-th "
+                                 "of N balanced shards of the test cases "
+                                 "(i/N) and dump its results.",
+                                 type=shard.parse_shard)
+        self.parser.add_argument("--durations", help="History file shared "
+                                 "by all the shards to weight the split "
+                                 "(default=same weight for every test "
+                                 "case).", metavar="FILE")
+        self.parser.add_argument("-R", "--resume", help="Skip the test "
+                                 "cases already finished according to the "
+                                 "journal of the interrupted campaign "
+                                 "(default=false).",
+                                 action="store_true")
+        self.parser.add_argument("-m", "--matrix", help="Run the campaign "
+                                 "against one more scenario given as env "
+                                 "vars (e.g. DEPLOY_SCENARIO=os-nosdn-"
+                                 "nofeature-ha,INSTALLER_TYPE=fuel). All "
+                                 "the scenarios run concurrently and store "
+                                 "their results in their own directories "
+                                 f"of {constants.RESULTS_DIR}.",
+                                 action="append",
+                                 metavar="KEY=VALUE[,KEY=VALUE]",
+                                 type=matrix.parse_scenario)
+        self.parser.add_argument("--serve", help="Serve run_tests on "
+                                 f"{constants.SOCKET_PATH} for "
+                                 "run_tests_client which accepts the same "
+                                 "options (default=false).",
+                                 action="store_true")
 
     def parse_args(self, argv=None):
         """Parse arguments.
@@ -81,16 +193,34 @@ class RunTestsParser():
 
 class Runner():
     """Runner class"""
+    # pylint: disable=too-many-instance-attributes,too-many-public-methods
 
-    def __init__(self):
+    CANCEL_TIMEOUT = 10
+    """seconds given to the running test cases to stop once cancelled"""
+
+    def __init__(self, tiers=None):
         self.executed_test_cases = {}
         self.overall_result = Result.EX_OK
         self.clean_flag = True
         self.report_flag = False
         self.push_flag = False
-        self.tiers = tier_builder.TierBuilder(config.get_xtesting_config(
-            constants.TESTCASE_DESCRIPTION,
-            constants.TESTCASE_DESCRIPTION_DEFAULT))
+        self.jobs = 1
+        self.isolate_flag = False
+        self.history = history.History()
+        self.journal = journal.Journal()
+        self.publisher = publisher.Publisher(spool.Spool())
+        self.shard = None
+        self.shard_tests = None
+        self.shard_durations = None
+        self.selected_tests = None
+        self.cancel_event = None
+        self.cancelled_tests = []
+        self.results_dir = constants.RESULTS_DIR
+        self.overlay = {}
+        self.tiers = tiers or tier_builder.TierBuilder(
+            config.get_xtesting_config(
+                constants.TESTCASE_DESCRIPTION,
+                constants.TESTCASE_DESCRIPTION_DEFAULT))
 
     @staticmethod
     def source_envfile(rc_file=constants.ENV_FILE):
@@ -112,26 +242,19 @@ class Runner():
             rcfd.seek(0, 0)
             LOGGER.debug("Sourcing env file %s\n\n%s", rc_file, rcfd.read())
 
-    @staticmethod
-    def get_dict_by_test(testname):
-        # pylint: disable=missing-docstring
-        with open(config.get_xtesting_config(
-                constants.TESTCASE_DESCRIPTION,
-                constants.TESTCASE_DESCRIPTION_DEFAULT),
-                encoding='utf-8') as tyaml:
-            testcases_yaml = yaml.safe_load(tyaml)
-        for dic_tier in testcases_yaml.get("tiers"):
-            for dic_testcase in dic_tier['testcases']:
-                if dic_testcase['case_name'] == testname:
-                    return dic_testcase
-        LOGGER.error('Project %s is not defined in testcases.yaml', testname)
-        return None
+    def get_dict_by_test(self, testname):
+        """Get the description of a test case (testcases.yaml is only
+        parsed once by the tier builder)"""
+        dic_testcase = self.tiers.get_dict_by_test(testname)
+        if dic_testcase is None:
+            LOGGER.error(
+                'Project %s is not defined in testcases.yaml', testname)
+        return dic_testcase
 
-    @staticmethod
-    def get_run_dict(testname):
+    def get_run_dict(self, testname):
         """Obtain the 'run' block of the testcase from testcases.yaml"""
         try:
-            dic_testcase = Runner.get_dict_by_test(testname)
+            dic_testcase = self.get_dict_by_test(testname)
             if not dic_testcase:
                 LOGGER.error("Cannot get %s's config options", testname)
             elif 'run' in dic_testcase:
@@ -143,7 +266,6 @@ class Runner():
 
     def run_test(self, test):
         """Run one test case"""
-        # pylint: disable=too-many-branches,broad-exception-raised
         if not test.is_enabled() or test.is_skipped():
             msg = prettytable.PrettyTable(
                 header_style='upper', padding_width=5,
@@ -152,95 +274,558 @@ class Runner():
             msg.add_row([test.get_name(), test.get_project(), "00:00", "SKIP"])
             LOGGER.info("Test result:\n\n%s\n", msg)
             return testcase.TestCase.EX_TESTCASE_SKIPPED
-        result = testcase.TestCase.EX_TESTCASE_FAILED
+        record = self.journal.get_test_case(test.get_name())
+        if record:
+            LOGGER.info("Test case '%s' already finished (journal)",
+                        test.get_name())
+            self.executed_test_cases[test.get_name()] = record
+            return record.is_successful()
+        if self.isolate_flag or test.get_limits():
+            return self.run_test_isolated(test)
+        return self.execute_test(test)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def catch_test_errors(test, run_dict):
+        """Log the exceptions raised when loading or running a test case"""
+        try:
+            yield
+        except ImportError:
+            LOGGER.exception("Cannot import module %s", run_dict['module'])
+        except AttributeError:
+            LOGGER.exception("Cannot get class %s", run_dict['class'])
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception(
+                "\n\nPlease fix the testcase %s.\n"
+                "All exceptions should be caught by the testcase instead!"
+                "\n\n",
+                test.get_name())
+
+    def load_test(self, test, run_dict):
+        """Load the driver of one test case and prepare its execution
+
+        Returns:
+            the test case, None if its requirements are unmet
+        """
+        LOGGER.info("Loading test case '%s'...", test.get_name())
+        test_dict = self.get_dict_by_test(test.get_name())
+        test_case = registry.get_registry().get_driver(
+            run_dict['name'], **test_dict)
+        self.executed_test_cases[test.get_name()] = test_case
+        test_case.check_requirements()
+        if test_case.is_skipped:
+            LOGGER.info("Skipping test case '%s'...", test.get_name())
+            LOGGER.info("Test result:\n\n%s\n", test_case)
+            return None
+        if 'env' in run_dict:
+            for key, value in run_dict['env'].items():
+                if key not in os.environ:
+                    LOGGER.info("Setting env for test case '%s'...",
+                                test.get_name())
+                    os.environ[key] = str(value)
+        LOGGER.info("Running test case '%s'...", test.get_name())
+        return test_case
+
+    def finish_test(self, test_case):
+        """Clean and publish the artifacts of an executed test case (its
+        results are pushed to the DB in the background by record())"""
+        result = test_case.is_successful()
+        LOGGER.info("Test result:\n\n%s\n", test_case)
+        if self.clean_flag:
+            test_case.clean()
+        if self.push_flag:
+            test_case.publish_artifacts()
+        return result
+
+    def execute_test(self, test):
+        """Load the driver and execute one test case in this process"""
+        # pylint: disable=broad-exception-raised
         run_dict = self.get_run_dict(test.get_name())
-        if run_dict:
+        if not run_dict:
+            raise Exception("Cannot import the class for the test case.")
+        with self.catch_test_errors(test, run_dict):
+            test_case = self.load_test(test, run_dict)
+            if not test_case:
+                return testcase.TestCase.EX_TESTCASE_SKIPPED
             try:
-                LOGGER.info("Loading test case '%s'...", test.get_name())
-                test_dict = Runner.get_dict_by_test(test.get_name())
-                test_case = driver.DriverManager(
-                    namespace='xtesting.testcase',
-                    name=run_dict['name'],
-                    invoke_on_load=True,
-                    invoke_kwds=test_dict).driver
-                self.executed_test_cases[test.get_name()] = test_case
-                test_case.check_requirements()
-                if test_case.is_skipped:
-                    LOGGER.info("Skipping test case '%s'...", test.get_name())
-                    LOGGER.info("Test result:\n\n%s\n", test_case)
-                    return testcase.TestCase.EX_TESTCASE_SKIPPED
-                if 'env' in run_dict:
-                    for key, value in run_dict['env'].items():
-                        if key not in os.environ:
-                            LOGGER.info("Setting env for test case '%s'...",
-                                        test.get_name())
-                            os.environ[key] = str(value)
-                LOGGER.info("Running test case '%s'...", test.get_name())
-                try:
-                    kwargs = run_dict['args']
-                    test_case.run(**kwargs)
-                except KeyError:
-                    test_case.run()
-                result = test_case.is_successful()
-                LOGGER.info("Test result:\n\n%s\n", test_case)
-                if self.clean_flag:
-                    test_case.clean()
-                if self.push_flag:
-                    test_case.publish_artifacts()
-                if self.report_flag:
-                    test_case.push_to_db()
-            except ImportError:
-                LOGGER.exception("Cannot import module %s", run_dict['module'])
-            except AttributeError:
-                LOGGER.exception("Cannot get class %s", run_dict['class'])
-            except Exception:  # pylint: disable=broad-except
-                LOGGER.exception(
-                    "\n\nPlease fix the testcase %s.\n"
-                    "All exceptions should be caught by the testcase instead!"
-                    "\n\n",
-                    test.get_name())
-        else:
+                kwargs = run_dict['args']
+                test_case.run(**kwargs)
+            except KeyError:
+                test_case.run()
+            return self.finish_test(test_case)
+        return testcase.TestCase.EX_TESTCASE_FAILED
+
+    async def aexecute_test(self, test):
+        """Load the driver and execute one test case in the event loop
+
+        The test case is awaited via arun() whereas loading the driver and
+        pushing the results run in the default executor.
+        """
+        # pylint: disable=broad-exception-raised
+        loop = asyncio.get_running_loop()
+        run_dict = self.get_run_dict(test.get_name())
+        if not run_dict:
             raise Exception("Cannot import the class for the test case.")
+        with self.catch_test_errors(test, run_dict):
+            test_case = await loop.run_in_executor(
+                None, self.load_test, test, run_dict)
+            if not test_case:
+                return testcase.TestCase.EX_TESTCASE_SKIPPED
+            await test_case.arun(**run_dict.get('args', {}))
+            return await loop.run_in_executor(
+                None, self.finish_test, test_case)
+        return testcase.TestCase.EX_TESTCASE_FAILED
+
+    def is_async(self, test):
+        """Check if the driver of a test case overrides arun()"""
+        try:
+            return registry.get_registry().get_class(self.get_run_dict(
+                test.get_name())['name']).arun is not testcase.TestCase.arun
+        except Exception:  # pylint: disable=broad-except
+            return False
+
+    async def arun_test(self, test):
+        """Run one test case in the event loop
+
+        Only the drivers overriding arun() run in the event loop. The
+        synchronous ones may rely on process-wide state (e.g. robot, pytest
+        or behave) and run in child processes instead. All but the native
+        asyncio test cases are handed over to the default executor.
+        """
+        loop = asyncio.get_running_loop()
+        if (not test.is_enabled() or test.is_skipped() or
+                self.journal.get_test_case(test.get_name())):
+            return await loop.run_in_executor(None, self.run_test, test)
+        if self.isolate_flag or test.get_limits() or not self.is_async(test):
+            return await loop.run_in_executor(
+                None, self.run_test_isolated, test)
+        return await self.aexecute_test(test)
+
+    def run_test_isolated(self, test):
+        """Run one test case in a child process
+
+        Only the result record of the test case comes back from the child
+        process. If the child process breaches a limit (timeout, cpu_limit
+        or memory_limit) or crashes, the test case is recorded as failed
+        with the reason in its details. Cancelled is raised if the run is
+        cancelled meanwhile.
+        """
+        flags = {key: getattr(self, key) for key in [
+            'clean_flag', 'push_flag', 'results_dir', 'cancel_event']}
+        start_time = time.time()
+        try:
+            result, record = isolation.run(
+                _run_test_in_child, test,
+                self.get_dict_by_test(test.get_name()), flags,
+                limits=test.get_limits(), cancel_event=self.cancel_event)
+        except isolation.Cancelled:
+            raise
+        except isolation.IsolationError as exc:
+            LOGGER.error("Cannot run %s in a child process: %s",
+                         test.get_name(), exc)
+            record = isolation.ExecutedTestCase(
+                case_name=test.get_name(), project_name=test.get_project(),
+                criteria=test.get_criteria())
+            record.start_time = start_time
+            record.stop_time = time.time()
+            record.details = {'reason': exc.reason, 'message': str(exc)}
+            result = testcase.TestCase.EX_TESTCASE_FAILED
+        if record:
+            self.executed_test_cases[test.get_name()] = record
         return result
 
+    def record(self, test_case):
+        """Store the duration, journal and queue the results of a finished
+        test case (unless skipped or already journaled) to push them to DB"""
+        if self.report_flag and not test_case.is_skipped and (
+                not self.journal.get_test_case(test_case.case_name)):
+            self.publisher.submit(test_case)
+        self.history.update(test_case)
+        self.journal.append(test_case)
+
+    def check_test(self, test):
+        """Check the result of one executed test case
+
+        Returns:
+            True if the test case failed and is blocking,
+            False otherwise.
+        """
+        test_case = self.executed_test_cases[test.get_name()]
+        self.record(test_case)
+        if test_case.is_successful() == test_case.EX_TESTCASE_FAILED:
+            LOGGER.error("The test case '%s' failed.", test.get_name())
+            self.overall_result = Result.EX_ERROR
+            return test.is_blocking()
+        return False
+
+    @staticmethod
+    def kill_workers(executor):
+        """Kill the workers of the pool and all the processes they started"""
+        # pylint: disable=protected-access
+        for process in list((executor._processes or {}).values()):
+            isolation.kill(process)
+
+    def cancel_running_tests(self, executor, running, test_scheduler):
+        """Cancel the test cases running in the pool
+
+        The running test cases are asked to stop via the cancellation
+        token. The ones finished within CANCEL_TIMEOUT seconds are left in
+        running to be checked as usual. The workers still busy are killed
+        and their test cases reported as cancelled.
+        """
+        self.cancel_event.set()
+        _, not_done = futures.wait(running, timeout=self.CANCEL_TIMEOUT)
+        if not_done:
+            self.kill_workers(executor)
+        for future in not_done:
+            test = running.pop(future)
+            LOGGER.info("Cancelling %s as the tier failed", test.get_name())
+            test_scheduler.set_cancelled(test.get_name())
+
+    def run_tests_in_pool(self, test_scheduler):
+        """Run the scheduled test cases in a pool of self.jobs processes
+
+        The test cases are submitted as soon as the scheduler considers
+        them ready and a worker is free. If a blocking test case fails and
+        fail_fast is set, the running test cases are cancelled too.
+
+        Returns:
+            the name of the first blocking test case which failed,
+            None otherwise.
+        """
+        running = {}
+        blocking_test = None
+        self.cancel_event = isolation.get_context().Event()
+        with futures.ProcessPoolExecutor(
+                max_workers=self.jobs, initializer=_init_worker,
+                initargs=(self,)) as executor:
+            while not test_scheduler.is_finished():
+                for test in test_scheduler.get_ready_tests(
+                        self.jobs - len(running)):
+                    running[executor.submit(_run_test_in_worker, test)] = test
+                done, _ = futures.wait(
+                    running, return_when=futures.FIRST_COMPLETED)
+                for future in done:
+                    test = running.pop(future)
+                    try:
+                        _, test_case = future.result()
+                    except isolation.Cancelled:
+                        test_scheduler.set_cancelled(test.get_name())
+                        continue
+                    except Exception:  # pylint: disable=broad-except
+                        LOGGER.exception(
+                            "Cannot get the results of %s", test.get_name())
+                        test_case = None
+                    if test_case is None:
+                        LOGGER.error(
+                            "The test case '%s' failed.", test.get_name())
+                        self.overall_result = Result.EX_ERROR
+                        failed = test.is_blocking()
+                    else:
+                        self.executed_test_cases[test.get_name()] = test_case
+                        failed = self.check_test(test)
+                    test_scheduler.set_finished(test.get_name(), failed)
+                    if failed and not blocking_test:
+                        blocking_test = test.get_name()
+                if blocking_test and running and test_scheduler.fail_fast:
+                    self.cancel_running_tests(
+                        executor, running, test_scheduler)
+        return blocking_test
+
+    async def acancel_running_tests(self, running, test_scheduler):
+        """Cancel the test cases running in the event loop
+
+        As cancel_running_tests() but the tasks still running after
+        CANCEL_TIMEOUT seconds are cancelled and their results dropped.
+        """
+        self.cancel_event.set()
+        _, not_done = await asyncio.wait(running, timeout=self.CANCEL_TIMEOUT)
+        for task in not_done:
+            test = running.pop(task)
+            LOGGER.info("Cancelling %s as the tier failed", test.get_name())
+            task.cancel()
+            test_scheduler.set_cancelled(test.get_name())
+        if not_done:
+            await asyncio.wait(not_done)
+        for test in test_scheduler.cancelled:
+            self.executed_test_cases.pop(test, None)
+
+    async def arun_scheduled(self, test_scheduler, tiers):
+        """Run the scheduled test cases concurrently in one event loop
+
+        At most tier.get_concurrency() test cases of every tier run at
+        once. If a blocking test case fails and fail_fast is set, the
+        running test cases are cancelled too.
+
+        Returns:
+            the name of the first blocking test case which failed,
+            None otherwise.
+        """
+        semaphores = {}
+        for tier in tiers:
+            semaphore = asyncio.Semaphore(tier.get_concurrency())
+            for test in self.get_tests(tier):
+                semaphores[test.get_name()] = semaphore
+
+        async def arun_test(test):
+            async with semaphores[test.get_name()]:
+                return await self.arun_test(test)
+
+        running = {}
+        blocking_test = None
+        self.cancel_event = isolation.get_context().Event()
+        testcase.TestCase.cancel_event = self.cancel_event
+        try:
+            while not test_scheduler.is_finished():
+                for test in test_scheduler.get_ready_tests():
+                    running[asyncio.ensure_future(arun_test(test))] = test
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    test = running.pop(task)
+                    try:
+                        task.result()
+                        failed = self.check_test(test)
+                    except isolation.Cancelled:
+                        test_scheduler.set_cancelled(test.get_name())
+                        continue
+                    except Exception:  # pylint: disable=broad-except
+                        LOGGER.exception(
+                            "Cannot get the results of %s", test.get_name())
+                        self.overall_result = Result.EX_ERROR
+                        failed = test.is_blocking()
+                    test_scheduler.set_finished(test.get_name(), failed)
+                    if failed and not blocking_test:
+                        blocking_test = test.get_name()
+                if blocking_test and running and test_scheduler.fail_fast:
+                    await self.acancel_running_tests(running, test_scheduler)
+        finally:
+            testcase.TestCase.cancel_event = self.cancel_event = None
+        return blocking_test
+
+    def run_scheduled(self, test_scheduler, tiers=()):
+        """Run the test cases in the order given by the scheduler
+
+        The test cases run in a pool of processes if jobs > 1, or in an
+        event loop if any tier allows running test cases concurrently.
+
+        Returns:
+            the name of the first blocking test case which failed,
+            None otherwise.
+        """
+        if self.jobs > 1:
+            blocking_test = self.run_tests_in_pool(test_scheduler)
+        elif any(tier.get_concurrency() > 1 for tier in tiers):
+            blocking_test = asyncio.run(
+                self.arun_scheduled(test_scheduler, tiers))
+        else:
+            blocking_test = None
+            while not test_scheduler.is_finished():
+                for test in test_scheduler.get_ready_tests(1):
+                    self.run_test(test)
+                    failed = self.check_test(test)
+                    test_scheduler.set_finished(test.get_name(), failed)
+                    if failed and not blocking_test:
+                        blocking_test = test.get_name()
+        for name in test_scheduler.cancelled:
+            LOGGER.info("The test case '%s' was cancelled.", name)
+        self.cancelled_tests.extend(test_scheduler.cancelled)
+        return blocking_test
+
+    def get_scheduler(self, tests, fail_fast=False):
+        """Get the scheduler of the test cases
+
+        The longest test cases are started first when they run in
+        parallel. They are packed according to their resources so that
+        the host is never oversubscribed.
+        """
+        return scheduler.Scheduler(
+            tests, fail_fast=fail_fast,
+            durations=self.history.get if self.jobs > 1 else None,
+            capacity=scheduler.get_capacity())
+
+    @staticmethod
+    def has_dependencies(tests):
+        """Check if any test case declares depends_on"""
+        return any(test.get_depends_on() for test in tests)
+
+    def get_tests(self, tier):
+        """Get the test cases of a tier which are selected and which belong
+        to the shard"""
+        if not self.is_selected(tier):
+            return []
+        tests = tier.get_tests()
+        if self.selected_tests is not None:
+            tests = [test for test in tests
+                     if test.get_name() in self.selected_tests]
+        if self.shard_tests is None:
+            return tests
+        return [test for test in tests if test.get_name() in self.shard_tests]
+
+    def is_selected(self, tier):
+        """Check if a tier may hold selected test cases
+
+        The tiers which are loaded lazily (include) and which are still
+        not loaded after the selection cannot.
+        """
+        return self.selected_tests is None or tier.is_loaded()
+
+    def select(self, selection):
+        """Select the test cases matching a multi-selection
+
+        Returns:
+            True if every item of the selection matches a test case
+        """
+        try:
+            selected_tests = self.tiers.select(selection)
+        except ValueError as exc:
+            LOGGER.error("%s", exc)
+            return False
+        LOGGER.info("Selected test cases: %s", ' '.join(selected_tests))
+        self.selected_tests = set(selected_tests)
+        if self.shard:
+            self.set_shard(*self.shard)
+        return True
+
+    def set_shard(self, index, count):
+        """Select the i-th of N shards of all the enabled test cases (or of
+        the selected ones)
+
+        The split must be the same on every node. It is weighted by the
+        durations of the shared history file if any but never by the local
+        history which differs from node to node.
+        """
+        self.shard = (index, count)
+        tests = [test for tier in self.tiers.get_tiers()
+                 for test in tier.get_tests()
+                 if self.selected_tests is None or
+                 test.get_name() in self.selected_tests]
+        durations = None
+        if self.shard_durations:
+            durations = history.History(
+                self.shard_durations, self.history.default).get
+        shard_tests = shard.split(tests, count, durations)[index - 1]
+        LOGGER.info("Shard %d/%d: %s", index, count, ' '.join(shard_tests))
+        self.shard_tests = set(shard_tests)
+
     def run_tier(self, tier):
         """Run one tier"""
-        tests = tier.get_tests()
-        if not tests:
+        tests = self.get_tests(tier)
+        if not tests and self.shard_tests is not None and tier.get_tests():
+            LOGGER.info("There are no test cases in this tier for the "
+                        "given shard")
+        elif not tests:
             LOGGER.info("There are no supported test cases in this tier "
                         "for the given scenario")
             self.overall_result = Result.EX_ERROR
+        elif self.has_dependencies(tests):
+            self.run_scheduled(self.get_scheduler(tests), [tier])
+        elif self.jobs > 1 or tier.get_concurrency() > 1:
+            blocking_test = self.run_scheduled(
+                self.get_scheduler(tests, fail_fast=True), [tier])
+            if blocking_test:
+                raise BlockingTestFailed(
+                    f"The test case {blocking_test} "
+                    "failed and is blocking")
         else:
-            for test in tests:
+            for i, test in enumerate(tests):
                 self.run_test(test)
-                test_case = self.executed_test_cases[test.get_name()]
-                if test_case.is_successful() == test_case.EX_TESTCASE_FAILED:
-                    LOGGER.error("The test case '%s' failed.", test.get_name())
-                    self.overall_result = Result.EX_ERROR
-                    if test.is_blocking():
-                        raise BlockingTestFailed(
-                            f"The test case {test.get_name()} "
-                            "failed and is blocking")
+                if self.check_test(test):
+                    self.cancelled_tests.extend(
+                        test.get_name() for test in tests[i + 1:])
+                    raise BlockingTestFailed(
+                        f"The test case {test.get_name()} "
+                        "failed and is blocking")
         return self.overall_result
 
     def run_all(self):
-        """Run all available testcases"""
+        """Run all available testcases
+
+        If any test case declares depends_on, all of them are scheduled
+        as one dependency graph whatever their tiers. A blocking failure
+        only cancels the test cases depending on it.
+        """
         tiers_to_run = []
         msg = prettytable.PrettyTable(
             header_style='upper', padding_width=5,
             field_names=['tiers', 'description', 'testcases'])
         for tier in self.tiers.get_tiers():
-            if tier.get_tests():
+            if self.get_tests(tier):
                 tiers_to_run.append(tier)
                 msg.add_row([tier.get_name(),
                              textwrap.fill(tier.description, width=40),
                              textwrap.fill(' '.join([str(x.get_name(
-                                 )) for x in tier.get_tests()]), width=40)])
+                                 )) for x in self.get_tests(tier)]),
+                                 width=40)])
         LOGGER.info("TESTS TO BE EXECUTED:\n\n%s\n", msg)
+        tests = [
+            test for tier in tiers_to_run for test in self.get_tests(tier)]
+        if self.has_dependencies(tests):
+            self.run_scheduled(self.get_scheduler(tests), tiers_to_run)
+            return
         for tier in tiers_to_run:
             self.run_tier(tier)
 
-    def main(self, **kwargs):  # pylint: disable=too-many-branches
+    def run_scenario(self, name, overlay, **kwargs):
+        """Run the campaign against one scenario of the matrix (in the
+        child process forked for it)
+
+        The test cases are selected again according to the env overlay.
+        The results, the journal and the history are stored in the
+        directory of the scenario.
+        """
+        self.results_dir = matrix.get_results_dir(name)
+        os.makedirs(self.results_dir, exist_ok=True)
+        testcase.TestCase.dir_results = self.results_dir
+        self.history = history.History(
+            os.path.join(self.results_dir,
+                         os.path.basename(constants.DURATIONS_PATH)),
+            self.history.default)
+        self.journal = journal.Journal(os.path.join(
+            self.results_dir, os.path.basename(constants.JOURNAL_PATH)))
+        self.overlay = overlay
+        os.environ.update(overlay)
+        self.tiers.generate_tiers()
+        result = self.main(**kwargs)
+        test = kwargs.get('test')
+        rows = self.get_summary_rows(self.tiers.get_tier(test))
+        if not self.tiers.get_tier(test) and not tier_builder.is_selection(
+                test) and self.tiers.get_test(test):
+            rows = [row for row in rows if row[0] == test]
+        matrix.dump(name, overlay, result.value, rows)
+        return result
+
+    def run_matrix(self, **kwargs):
+        """Run the campaign against all the scenarios of the matrix
+
+        Every scenario runs concurrently in a child process forked from
+        the runner (testcases.yaml and the drivers are only loaded once).
+        Their results are merged into one report.
+        """
+        scenarios = kwargs.pop('matrix')
+        self.source_envfile()
+        preload_modules()
+        environs = [matrix.get_environ(overlay) for overlay in scenarios]
+        for name, tests in zip(matrix.get_names(scenarios),
+                               self.tiers.evaluate(environs)):
+            LOGGER.info("Scenario %s: %s", name, ' '.join(tests))
+        results = matrix.run(
+            scenarios, functools.partial(self.run_scenario, **kwargs))
+        rows, failed = matrix.merge([result for result in results if result])
+        if failed or None in results:
+            self.overall_result = Result.EX_ERROR
+        msg = prettytable.PrettyTable(
+            header_style='upper', padding_width=5,
+            field_names=['scenario', 'test case', 'project', 'tier',
+                         'duration', 'result'])
+        for row in rows:
+            msg.add_row(row)
+        LOGGER.info("Xtesting matrix report:\n\n%s\n", msg)
+        LOGGER.info("Execution exit value: %s", self.overall_result)
+        return self.overall_result
+
+    def main(self, **kwargs):
+        # pylint: disable=too-many-branches,too-many-statements
         """Entry point of class Runner"""
         if 'noclean' in kwargs:
             self.clean_flag = not kwargs['noclean']
@@ -248,22 +833,44 @@ class Runner():
             self.report_flag = kwargs['report']
         if 'push' in kwargs:
             self.push_flag = kwargs['push']
+        if 'jobs' in kwargs:
+            self.jobs = kwargs['jobs']
+        if 'isolate' in kwargs:
+            self.isolate_flag = kwargs['isolate']
+        if 'default_duration' in kwargs:
+            self.history.default = kwargs['default_duration']
+        if kwargs.get('matrix'):
+            return self.run_matrix(**kwargs)
         try:
             LOGGER.info("Deployment description:\n\n%s\n", env.string())
             self.source_envfile()
+            os.environ.update(self.overlay)
+            if kwargs.get('resume'):
+                self.journal.load()
+            if kwargs.get('shard'):
+                self.shard_durations = kwargs.get('durations')
+                self.set_shard(*kwargs['shard'])
             if 'test' in kwargs:
                 LOGGER.debug("Test args: %s", kwargs['test'])
                 if self.tiers.get_tier(kwargs['test']):
                     self.run_tier(self.tiers.get_tier(kwargs['test']))
-                elif self.tiers.get_test(kwargs['test']):
+                elif not tier_builder.is_selection(
+                        kwargs['test']) and self.tiers.get_test(
+                            kwargs['test']):
                     result = self.run_test(
                         self.tiers.get_test(kwargs['test']))
+                    if kwargs['test'] in self.executed_test_cases:
+                        self.record(self.executed_test_cases[kwargs['test']])
                     if result == testcase.TestCase.EX_TESTCASE_FAILED:
                         LOGGER.error("The test case '%s' failed.",
                                      kwargs['test'])
                         self.overall_result = Result.EX_ERROR
                 elif kwargs['test'] == "all":
                     self.run_all()
+                elif tier_builder.is_selection(kwargs['test']):
+                    if not self.select(kwargs['test']):
+                        return Result.EX_ERROR
+                    self.run_all()
                 else:
                     LOGGER.error("Unknown test case or tier '%s', or not "
                                  "supported by the given scenario '%s'.",
@@ -279,38 +886,64 @@ class Runner():
         except Exception:  # pylint: disable=broad-except
             LOGGER.exception("Failures when running testcase(s)")
             self.overall_result = Result.EX_ERROR
-        if not self.tiers.get_test(kwargs['test']):
+        self.publisher.flush()
+        if self.tiers.get_tier(kwargs['test']) or tier_builder.is_selection(
+                kwargs['test']) or not self.tiers.get_test(kwargs['test']):
             self.summary(self.tiers.get_tier(kwargs['test']))
+        if self.shard:
+            shard.dump(self.results_dir, self.shard, self.overall_result.value,
+                       self.get_summary_rows(self.tiers.get_tier(
+                           kwargs['test'])))
+        self.history.save()
         LOGGER.info("Execution exit value: %s", self.overall_result)
         return self.overall_result
 
-    def summary(self, tier=None):
-        """To generate xtesting report showing the overall results"""
-        msg = prettytable.PrettyTable(
-            header_style='upper', padding_width=5,
-            field_names=['test case', 'project', 'tier',
-                         'duration', 'result'])
+    def get_summary_rows(self, tier=None):
+        """Get the rows of the xtesting report"""
+        rows = []
+        cancelled_tests = set(self.cancelled_tests)
         tiers = [tier] if tier else self.tiers.get_tiers()
         for each_tier in tiers:
-            for test in each_tier.get_tests():
+            for test in self.get_tests(each_tier):
                 try:
                     test_case = self.executed_test_cases[test.get_name()]
                 except KeyError:
-                    msg.add_row([test.get_name(), test.get_project(),
-                                 each_tier.get_name(), "00:00", "SKIP"])
+                    rows.append([test.get_name(), test.get_project(),
+                                 each_tier.get_name(), "00:00",
+                                 "CANCELLED" if test.get_name() in
+                                 cancelled_tests else "SKIP"])
                 else:
                     if test_case.is_skipped:
                         result = 'SKIP'
                     else:
                         result = 'PASS' if (test_case.is_successful(
                             ) == test_case.EX_OK) else 'FAIL'
-                    msg.add_row(
+                    rows.append(
                         [test_case.case_name, test_case.project_name,
                          self.tiers.get_tier_name(test_case.case_name),
                          test_case.get_duration(), result])
+            if not self.is_selected(each_tier):
+                continue
             for test in each_tier.get_skipped_test():
-                msg.add_row([test.get_name(), test.get_project(),
+                if self.selected_tests is not None and (
+                        test.get_name() not in self.selected_tests):
+                    continue
+                rows.append([test.get_name(), test.get_project(),
                              each_tier.get_name(), "00:00", "SKIP"])
+        return rows
+
+    def summary(self, tier=None):
+        """To generate xtesting report showing the overall results (and
+        the push status of every test case if the results are pushed)"""
+        field_names = ['test case', 'project', 'tier', 'duration', 'result']
+        if self.report_flag:
+            field_names.append('push')
+        msg = prettytable.PrettyTable(
+            header_style='upper', padding_width=5, field_names=field_names)
+        for row in self.get_summary_rows(tier):
+            if self.report_flag:
+                row.append(self.publisher.get_status(row[0]))
+            msg.add_row(row)
         LOGGER.info("Xtesting report:\n\n%s\n", msg)
 
 
@@ -322,18 +955,44 @@ def main():
         if ex.errno != errno.EEXIST:
             print(f"Cannot create {constants.RESULTS_DIR}")
             return testcase.TestCase.EX_RUN_ERROR
-    if env.get('DEBUG').lower() == 'true':
-        logging.config.fileConfig(config.get_xtesting_config(
-            'logging.debug.ini', constants.DEBUG_INI_PATH_DEFAULT))
-    else:
-        logging.config.fileConfig(config.get_xtesting_config(
-            'logging.ini', constants.INI_PATH_DEFAULT))
-    logging.captureWarnings(True)
+    config.configure_logging()
     parser = RunTestsParser()
     args = parser.parse_args(sys.argv[1:])
     # Reset argv to prevent wrong usage by the underlying test framework
     # e.g. pyats fails by expecting an arg to -p (publish to database) when
     # called via Robot.run()
     sys.argv = [sys.argv[0]]
+    if args['serve']:
+        return serve()
     runner = Runner()
     return runner.main(**args).value
+
+
+def run_request(tiers, argv):
+    """Run the arguments received by run_tests --serve (in a forked child)
+
+    testcases.yaml is not parsed again. The test cases are only selected
+    again according to the environment variables of the client.
+    """
+    args = RunTestsParser().parse_args(argv)
+    args.pop('serve')
+    tiers.generate_tiers()
+    return Runner(tiers=tiers).main(**args).value
+
+
+def preload_modules():
+    """Import all the drivers before forking the child processes"""
+    for module in isolation.get_preloaded_modules():
+        try:
+            importlib.import_module(module)
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception("Cannot preload %s", module)
+
+
+def serve():
+    """Preload all the drivers and testcases.yaml and serve run_tests"""
+    preload_modules()
+    tiers = tier_builder.TierBuilder(config.get_xtesting_config(
+        constants.TESTCASE_DESCRIPTION,
+        constants.TESTCASE_DESCRIPTION_DEFAULT))
+    return daemon.serve(functools.partial(run_request, tiers))
@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2026 Orange and others.
+#
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+"""Scheduler class to order the test cases to be executed"""
+
+import graphlib
+import logging
+import os
+
+LOGGER = logging.getLogger('xtesting.ci.scheduler')
+
+
+def get_capacity():
+    """Get the number of CPUs and the memory (in bytes) of the host"""
+    return {'cpu': os.cpu_count() or 1,
+            'mem': os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')}
+
+
+class Scheduler():
+    """Schedule test cases according to their dependencies
+
+    A test case is ready as soon as all the test cases it depends on
+    (depends_on in testcases.yaml) are finished. The ready test cases are
+    returned in the campaign order by default.
+
+    If durations (a callable returning the expected duration of a test
+    case) is given, the ready test cases are returned longest first. The
+    duration of a test case includes the longest chain of test cases
+    depending on it, which is the longest-processing-time ordering when
+    no dependency is declared.
+
+    If capacity (e.g. {'cpu': 8, 'mem': 16 * 1024 ** 3}) is given, the
+    ready test cases are packed so that the resources they declare
+    (resources in testcases.yaml) never exceed it. A test case needing
+    more than the capacity runs alone. Whatever the capacity, a named
+    lock is never held by two running test cases.
+
+    When a blocking test case fails, all the test cases which depend on
+    it (directly or not) are cancelled. If fail_fast is set, all the
+    pending test cases are cancelled instead (i.e. the tier behavior).
+    Dependencies on test cases which are not scheduled are ignored.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, tests, fail_fast=False, durations=None,
+                 capacity=None):
+        self.tests = {}
+        self.dependencies = {}
+        self.dependents = {}
+        self.fail_fast = fail_fast
+        self.capacity = capacity or {}
+        self.used = dict.fromkeys(self.capacity, 0)
+        self.locks = {}
+        for test in tests:
+            self.tests[test.get_name()] = test
+            self.dependents[test.get_name()] = []
+        for name, test in self.tests.items():
+            self.dependencies[name] = []
+            for dependency in test.get_depends_on():
+                if dependency not in self.tests:
+                    LOGGER.warning(
+                        "%s depends on %s which is not scheduled",
+                        name, dependency)
+                    continue
+                self.dependencies[name].append(dependency)
+                self.dependents[dependency].append(name)
+        try:
+            order = list(graphlib.TopologicalSorter(
+                self.dependencies).static_order())
+        except graphlib.CycleError as exc:
+            raise ValueError(
+                f"Circular dependencies between {exc.args[1]}") from exc
+        self.priorities = {}
+        if durations:
+            for name in reversed(order):
+                self.priorities[name] = durations(name) + max(
+                    (self.priorities[dependent]
+                     for dependent in self.dependents[name]), default=0)
+        self.pending = list(self.tests)
+        self.running = []
+        self.finished = []
+        self.cancelled = []
+
+    def is_ready(self, name):
+        """Check if all the dependencies of a test case are finished"""
+        return all(
+            dependency in self.finished
+            for dependency in self.dependencies[name])
+
+    def fits(self, name):
+        """Check if the resources needed by a test case are available"""
+        resources = self.tests[name].get_resources()
+        if any(lock in self.locks for lock in resources.get('locks', [])):
+            return False
+        return not self.running or all(
+            self.used[key] + resources.get(key, 0) <= value
+            for key, value in self.capacity.items())
+
+    def acquire(self, name):
+        """Reserve the resources and the locks of a test case"""
+        resources = self.tests[name].get_resources()
+        for key in self.used:
+            self.used[key] += resources.get(key, 0)
+        for lock in resources.get('locks', []):
+            self.locks[lock] = name
+
+    def release(self, name):
+        """Release the resources and the locks of a test case"""
+        resources = self.tests[name].get_resources()
+        for key in self.used:
+            self.used[key] -= resources.get(key, 0)
+        for lock in resources.get('locks', []):
+            del self.locks[lock]
+
+    def get_ready_tests(self, limit=None):
+        """Start the test cases ready to be executed
+
+        The ready test cases are started in order as long as their
+        resources and locks are available.
+
+        Args:
+            limit: the maximum number of test cases to start
+
+        Returns:
+            the list of the test cases started
+        """
+        ready = [name for name in self.pending if self.is_ready(name)]
+        if self.priorities:
+            ready.sort(key=lambda name: -self.priorities[name])
+        started = []
+        for name in ready:
+            if limit is not None and len(started) >= limit:
+                break
+            if not self.fits(name):
+                continue
+            self.acquire(name)
+            self.pending.remove(name)
+            self.running.append(name)
+            started.append(name)
+        return [self.tests[name] for name in started]
+
+    def cancel(self, name):
+        """Cancel all the pending test cases depending on a test case"""
+        for dependent in self.dependents[name]:
+            if dependent in self.pending:
+                self.pending.remove(dependent)
+                self.cancelled.append(dependent)
+                LOGGER.info(
+                    "Cancelling %s as %s failed and is blocking",
+                    dependent, name)
+                self.cancel(dependent)
+
+    def set_finished(self, name, blocking_failure=False):
+        """Mark a test case as finished
+
+        Args:
+            name: the test case name
+            blocking_failure: True if the test case failed and is blocking
+        """
+        self.running.remove(name)
+        self.release(name)
+        self.finished.append(name)
+        if blocking_failure:
+            if self.fail_fast:
+                self.cancelled.extend(self.pending)
+                del self.pending[:]
+            else:
+                self.cancel(name)
+
+    def set_cancelled(self, name):
+        """Mark a running test case as cancelled"""
+        self.running.remove(name)
+        self.release(name)
+        self.cancelled.append(name)
+
+    def is_finished(self):
+        """Check if no test case remains pending or running"""
+        return not self.pending and not self.running
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2026 Orange and others.
+#
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+"""Split a campaign across several nodes and merge their results
+
+run_tests --shard i/N only runs the i-th of N balanced shards and dumps
+its results. merge_results then gathers all shard results into one
+report and one exit code.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+
+import prettytable
+
+LOGGER = logging.getLogger('xtesting.ci.shard')
+
+
+def parse_shard(value):
+    """Parse i/N (1 <= i <= N) as passed to run_tests --shard"""
+    try:
+        index, count = [int(item) for item in value.split('/')]
+        assert 1 <= index <= count
+    except (AssertionError, ValueError) as exc:
+        raise argparse.ArgumentTypeError(
+            f"{value} is not a valid shard (i/N with 1 <= i <= N)") from exc
+    return index, count
+
+
+def get_groups(tests):
+    """Group the test cases linked by depends_on
+
+    A test case and all its dependencies must run on the same node.
+
+    Returns:
+        the lists of test case names (in the campaign order)
+    """
+    parents = {test.get_name(): test.get_name() for test in tests}
+
+    def find(name):
+        while parents[name] != name:
+            name = parents[name]
+        return name
+
+    for test in tests:
+        for dependency in test.get_depends_on():
+            if dependency in parents:
+                parents[find(dependency)] = find(test.get_name())
+    groups = {}
+    for test in tests:
+        groups.setdefault(find(test.get_name()), []).append(test.get_name())
+    return list(groups.values())
+
+
+def split(tests, count, durations=None):
+    """Split the test cases into count balanced shards
+
+    The groups of test cases are assigned longest first to the least
+    loaded shard. The split only depends on the test cases and on their
+    durations. Every node must pass the same ones (i.e. the same
+    testcases.yaml and the same durations file) to get the same split.
+    Every test case weighs the same if durations is None.
+
+    Returns:
+        the lists of test case names of every shard
+    """
+    groups = get_groups(tests)
+    weights = [sum(durations(name) for name in group) if durations
+               else len(group) for group in groups]
+    shards = [[] for _ in range(count)]
+    loads = [0] * count
+    for i in sorted(range(len(groups)),
+                    key=lambda i: (-weights[i], groups[i][0])):
+        j = min(range(count), key=lambda j: (loads[j], j))
+        shards[j].extend(groups[i])
+        loads[j] += weights[i]
+    return shards
+
+
+def dump(results_dir, shard, result, rows):
+    """Dump the results of the shard (i, N) to be merged by merge_results"""
+    filename = os.path.join(results_dir, f'shard{shard[0]}of{shard[1]}.json')
+    try:
+        with open(filename, 'w', encoding='utf-8') as rfile:
+            json.dump({'shard': list(shard), 'result': result,
+                       'testcases': rows}, rfile, indent=2)
+        LOGGER.info("The results of the shard were dumped in %s", filename)
+    except OSError:
+        LOGGER.exception("Cannot dump the results in %s", filename)
+
+
+def merge(results):
+    """Merge the results dumped by every shard
+
+    A test case executed by a shard overrides the SKIP rows reported by
+    the other ones.
+
+    Returns:
+        the rows of the merged report and True if any shard failed
+    """
+    rows = {}
+    failed = False
+    for result in results:
+        failed = failed or result['result'] != os.EX_OK
+        for row in result['testcases']:
+            if row[0] not in rows or rows[row[0]][4] == 'SKIP':
+                rows[row[0]] = row
+            failed = failed or row[4] == 'FAIL'
+    return list(rows.values()), failed
+
+
+def main():
+    """Entry point merging the results dumped by run_tests --shard"""
+    parser = argparse.ArgumentParser(
+        description="Merge the results dumped by run_tests --shard")
+    parser.add_argument("files", nargs='+', help="shard results")
+    args = parser.parse_args(sys.argv[1:])
+    results = []
+    for filename in args.files:
+        with open(filename, encoding='utf-8') as rfile:
+            results.append(json.load(rfile))
+    rows, failed = merge(results)
+    msg = prettytable.PrettyTable(
+        header_style='upper', padding_width=5,
+        field_names=['test case', 'project', 'tier',
+                     'duration', 'result'])
+    for row in rows:
+        msg.add_row(row)
+    result = os.EX_SOFTWARE if failed else os.EX_OK
+    print(f"Xtesting report:\n\n{msg}\n")
+    print(f"Execution exit value: {result}")
+    return result
@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2026 Orange and others.
+#
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+"""Spool class to never lose the results which cannot be pushed to DB"""
+
+import argparse
+import contextlib
+import fcntl
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+
+from xtesting.ci import isolation
+from xtesting.core import testcase
+from xtesting.utils import config
+from xtesting.utils import constants
+from xtesting.utils import env
+
+LOGGER = logging.getLogger('xtesting.ci.spool')
+
+ENV_VARS = ['TEST_DB_URL', 'TEST_DB_EXT_URL', 'INSTALLER_TYPE',
+            'DEPLOY_SCENARIO', 'NODE_NAME', 'BUILD_TAG']
+"""env vars read by push_to_db()"""
+
+
+@contextlib.contextmanager
+def overlay(environ):
+    """Set the env vars of a spooled record (None unsets them)"""
+    saved = dict(os.environ)
+    for key, value in environ.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+
+
+class Spool():
+    """Append-only spool of the results to push to the DB
+
+    Every result record is written with the env vars read by push_to_db()
+    and synced to disk before being pushed. An ack line is appended once
+    it is pushed. The records never acked (e.g. the DB was down) can be
+    pushed again by replay_spool without rerunning any test.
+
+    The acked records are dropped by compact() at the end of every run so
+    that the spool only grows with the records never pushed.
+    """
+
+    def __init__(self, filename=constants.SPOOL_PATH):
+        self.filename = filename
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def locked(self, operation):
+        """Lock the spool against the other runners sharing it
+
+        The appends share the lock whereas compact() takes it exclusively.
+        """
+        with self.lock, open(f'{self.filename}.lock', 'a',
+                             encoding='utf-8') as lfile:
+            fcntl.flock(lfile, operation)
+            yield
+
+    def append(self, data):
+        """Append one json line and sync it to disk
+
+        Every line is written at once so that several runners may share
+        the spool.
+        """
+        line = (json.dumps(data, default=str) + '\n').encode('utf-8')
+        with self.locked(fcntl.LOCK_SH):
+            fdesc = os.open(
+                self.filename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fdesc, line)
+                os.fsync(fdesc)
+            finally:
+                os.close(fdesc)
+
+    def add(self, record):
+        """Spool a result record before pushing it
+
+        Returns:
+            the id of the spooled record, None if it cannot be spooled
+        """
+        uid = uuid.uuid4().hex
+        try:
+            self.append({'id': uid, 'record': record.to_dict(),
+                         'env': {key: env.get(key) for key in ENV_VARS}})
+        except OSError:
+            LOGGER.exception("Cannot spool %s", record.case_name)
+            return None
+        return uid
+
+    def ack(self, uid):
+        """Mark a spooled record as pushed"""
+        try:
+            self.append({'ack': uid})
+        except OSError:
+            LOGGER.exception("Cannot ack %s", uid)
+
+    def get_unacked(self):
+        """Get the spooled records which were never pushed
+
+        The invalid lines (e.g. partially written) are ignored.
+
+        Returns:
+            the entries (id, record and env) in the spool order
+        """
+        entries = {}
+        try:
+            with open(self.filename, encoding='utf-8') as sfile:
+                for line in sfile:
+                    try:
+                        data = json.loads(line)
+                        if 'ack' in data:
+                            entries.pop(data['ack'], None)
+                        else:
+                            entries[data['id']] = data
+                    except (ValueError, KeyError, TypeError):
+                        LOGGER.warning("Ignoring invalid spool entry %s",
+                                       line.rstrip())
+        except OSError:
+            LOGGER.info("No spool found in %s", self.filename)
+        return list(entries.values())
+
+    def compact(self):
+        """Rewrite the spool with only the records never pushed
+
+        The records spooled meanwhile by the other runners are kept as the
+        spool is read again under the exclusive lock.
+        """
+        if not os.path.isfile(self.filename):
+            return
+        try:
+            with self.locked(fcntl.LOCK_EX):
+                entries = self.get_unacked()
+                with open(f'{self.filename}.tmp', 'w',
+                          encoding='utf-8') as sfile:
+                    for data in entries:
+                        sfile.write(json.dumps(data, default=str) + '\n')
+                    sfile.flush()
+                    os.fsync(sfile.fileno())
+                os.replace(f'{self.filename}.tmp', self.filename)
+        except OSError:
+            LOGGER.exception("Cannot compact %s", self.filename)
+
+    def replay(self, attempts=5, backoff=1.0):
+        """Push again the records which were never pushed
+
+        Every record is tried up to attempts times with an exponential
+        backoff. The replay stops at the first record which still cannot
+        be pushed (the DB is probably down). The spool is then compacted.
+
+        Returns:
+            the numbers of records pushed and still unacked
+        """
+        entries = self.get_unacked()
+        pushed = 0
+        for data in entries:
+            record = isolation.ExecutedTestCase.from_dict(data['record'])
+            for attempt in range(attempts):
+                if attempt:
+                    time.sleep(backoff * 2 ** (attempt - 1))
+                with overlay(data['env']):
+                    if record.push_to_db() == testcase.TestCase.EX_OK:
+                        break
+            else:
+                LOGGER.error("Cannot push %s again after %d attempts",
+                             record.case_name, attempts)
+                break
+            self.ack(data['id'])
+            pushed += 1
+        self.compact()
+        return pushed, len(entries) - pushed
+
+
+def main():
+    """Entry point pushing again the spooled results"""
+    parser = argparse.ArgumentParser(
+        description="Push again the results which could not be pushed to "
+                    "the DB without running any test case")
+    parser.add_argument("--attempts", type=int, default=5,
+                        help="Attempts per result (default=5)")
+    parser.add_argument("--backoff", type=float, default=1.0,
+                        help="Seconds before the first retry, doubled at "
+                             "every attempt (default=1.0)")
+    args = parser.parse_args(sys.argv[1:])
+    config.configure_logging()
+    pushed, unacked = Spool().replay(args.attempts, args.backoff)
+    LOGGER.info("Results pushed again: %d, still unacked: %d",
+                pushed, unacked)
+    return os.EX_SOFTWARE if unacked else os.EX_OK
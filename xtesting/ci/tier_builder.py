@@ -9,72 +9,230 @@
 
 """TierBuilder class to parse testcases config file"""
 
+import fnmatch
+import functools
+import os
 import re
-import yaml
 
 from xtesting.ci import tier_handler
+from xtesting.utils import config
+from xtesting.utils import constants
 from xtesting.utils import env
 
 
+def parse_size(value):
+    """Convert sizes such as 512M or 4G into bytes"""
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+    value = str(value).strip().upper().rstrip('B')
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def to_names(value):
+    """Get a list of names from a list or a single name of testcases.yaml
+    (e.g. depends_on: setup)"""
+    if not value:
+        return []
+    if not isinstance(value, list):
+        value = [value]
+    return [str(name) for name in value]
+
+
+def get_limits(dic_testcase):
+    """Get the limits enforced by the runner (timeout, cpu_limit and
+    memory_limit in testcases.yaml)"""
+    limits = {}
+    for key in ('timeout', 'cpu_limit'):
+        if dic_testcase.get(key):
+            limits[key] = float(dic_testcase[key])
+    if dic_testcase.get('memory_limit'):
+        limits['memory_limit'] = parse_size(dic_testcase['memory_limit'])
+    return limits
+
+
+def get_resources(dic_testcase):
+    """Get the resources needed by a test case (resources in
+    testcases.yaml, e.g. {cpu: 2, mem: 4G, locks: [tgen]})"""
+    resources = dict(dic_testcase.get('resources') or {})
+    if 'cpu' in resources:
+        resources['cpu'] = float(resources['cpu'])
+    if 'mem' in resources:
+        resources['mem'] = parse_size(resources['mem'])
+    if 'locks' in resources:
+        resources['locks'] = to_names(resources['locks'])
+    return resources
+
+
+def get_tags(dic_testcase):
+    """Get the tags of a test case (tags in testcases.yaml, a list or a
+    single tag)"""
+    return to_names(dic_testcase.get('tags'))
+
+
+def get_depends_on(dic_testcase):
+    """Get the test cases which must be run before a test case (depends_on
+    in testcases.yaml, a list or a single test case)"""
+    return to_names(dic_testcase.get('depends_on'))
+
+
+@functools.lru_cache(maxsize=None)
+def compile_regex(pattern):
+    """Compile a regular expression once for all the test cases"""
+    return re.compile(pattern)
+
+
+@functools.lru_cache(maxsize=None)
+def match(regex, value):
+    """Check if a value matches a compiled regular expression
+
+    The results are memoized as the same env vars are checked against the
+    same expressions by many test cases.
+    """
+    return regex.search(value) is not None
+
+
+def get_dependencies(dic_testcase):
+    """Get the dependencies of a test case (dependencies in testcases.yaml,
+    e.g. [{DEPLOY_SCENARIO: '^os-'}]) as pairs (env var, compiled regex)"""
+    dependencies = []
+    for dependency in dic_testcase.get('dependencies') or []:
+        key = list(dependency.keys())[0]
+        dependencies.append((key, compile_regex(str(dependency[key]))))
+    return tuple(dependencies)
+
+
+def check_dependencies(dependencies, environ):
+    """Check if the env vars meet all the dependencies of a test case
+
+    environ is a snapshot of the env vars (e.g. dict(os.environ)). The
+    unset ones fall back to their defaults as in env.get().
+    """
+    for key, regex in dependencies:
+        if not match(regex, environ.get(key, env.INPUTS.get(key)) or ''):
+            return False
+    return True
+
+
+def is_selection(value):
+    """Check if -t lists several items or patterns (see TierBuilder.select)
+    instead of naming one tier or one test case"""
+    return bool(value) and (value.startswith('tag:') or any(
+        char in value for char in ',*?['))
+
+
 class TierBuilder():
-    # pylint: disable=missing-docstring
+    # pylint: disable=missing-docstring,too-many-instance-attributes
 
-    def __init__(self, testcases_file):
+    def __init__(self, testcases_file, cache_dir=constants.CACHE_DIR):
         self.ci_installer = env.get('INSTALLER_TYPE')
         self.ci_scenario = env.get('DEPLOY_SCENARIO')
         self.testcases_file = testcases_file
+        self.cache_dir = cache_dir
         self.dic_tier_array = None
+        self.dic_testcases = {}
+        self.environ = {}
         self.tier_objects = []
+        self.tiers_by_name = {}
+        self.tiers_by_test = {}
+        self.tags = {}
         self.testcases_yaml = None
         self.generate_tiers()
 
     def read_test_yaml(self):
-        with open(self.testcases_file, encoding='utf-8') as tc_file:
-            self.testcases_yaml = yaml.safe_load(tc_file)
+        self.testcases_yaml = config.load_yaml(
+            self.testcases_file, self.cache_dir)
 
         self.dic_tier_array = []
         for tier in self.testcases_yaml.get("tiers"):
             self.dic_tier_array.append(tier)
 
+    def read_include(self, dic_tier):
+        """Read the test cases of a tier from its include file
+
+        The path is relative to testcases.yaml and the file lists the test
+        cases as a tier does (i.e. testcases: [...]).
+        """
+        filename = os.path.join(
+            os.path.dirname(self.testcases_file), dic_tier['include'])
+        return (config.load_yaml(filename, self.cache_dir) or {}).get(
+            'testcases') or []
+
+    def get_dict_by_test(self, test_name):
+        """Get the description of a test case as found in testcases.yaml"""
+        if test_name not in self.dic_testcases:
+            self.load_tiers()
+        return self.dic_testcases.get(test_name)
+
     def generate_tiers(self):
+        """Generate the tiers (the tiers including other files are only
+        loaded when their test cases are needed)"""
         if self.dic_tier_array is None:
             self.read_test_yaml()
 
+        self.environ = dict(os.environ)
         del self.tier_objects[:]
+        self.tiers_by_name.clear()
+        self.tiers_by_test.clear()
+        self.dic_testcases.clear()
+        self.tags.clear()
         for dic_tier in self.dic_tier_array:
             tier = tier_handler.Tier(
                 name=dic_tier['name'],
-                description=dic_tier.get('description', ''))
-            for dic_testcase in dic_tier['testcases']:
-                testcase = tier_handler.TestCase(
-                    name=dic_testcase['case_name'],
-                    enabled=dic_testcase.get('enabled', True),
-                    skipped=False,
-                    criteria=dic_testcase.get('criteria', 100),
-                    blocking=dic_testcase.get('blocking', True),
-                    description=dic_testcase.get('description', ''),
-                    project=dic_testcase['project_name'])
-                if not dic_testcase.get('dependencies'):
-                    if testcase.is_enabled():
-                        tier.add_test(testcase)
-                    else:
-                        testcase.skipped = True
-                        tier.skip_test(testcase)
-                else:
-                    for dependency in dic_testcase['dependencies']:
-                        kenv = list(dependency.keys())[0]
-                        if not re.search(dependency[kenv],
-                                         env.get(kenv) or ''):
-                            testcase.skipped = True
-                            tier.skip_test(testcase)
-                            break
-                    else:
-                        if testcase.is_enabled():
-                            tier.add_test(testcase)
-                        else:
-                            testcase.skipped = True
-                            tier.skip_test(testcase)
-            self.tier_objects.append(tier)
+                description=dic_tier.get('description', ''),
+                concurrency=int(dic_tier.get('concurrency', 1)))
+            if 'include' in dic_tier:
+                tier.loader = functools.partial(self.load_tier, dic_tier)
+            else:
+                self.add_testcases(tier, dic_tier['testcases'])
+            self.add_tier(tier)
+
+    def load_tier(self, dic_tier, tier):
+        self.add_testcases(tier, self.read_include(dic_tier))
+        self.index_tier(tier)
+
+    def load_tiers(self):
+        for tier in self.tier_objects:
+            tier.load()
+
+    def add_testcases(self, tier, dic_testcases):
+        for dic_testcase in dic_testcases:
+            self.dic_testcases.setdefault(
+                dic_testcase['case_name'], dic_testcase)
+            testcase = tier_handler.TestCase(
+                name=dic_testcase['case_name'],
+                enabled=dic_testcase.get('enabled', True),
+                skipped=False,
+                criteria=dic_testcase.get('criteria', 100),
+                blocking=dic_testcase.get('blocking', True),
+                description=dic_testcase.get('description', ''),
+                project=dic_testcase['project_name'],
+                depends_on=get_depends_on(dic_testcase),
+                limits=get_limits(dic_testcase),
+                resources=get_resources(dic_testcase),
+                tags=get_tags(dic_testcase),
+                dependencies=get_dependencies(dic_testcase))
+            self.index_tags(testcase)
+            if testcase.is_enabled() and check_dependencies(
+                    testcase.get_dependencies(), self.environ):
+                tier.add_test(testcase)
+            else:
+                testcase.skipped = True
+                tier.skip_test(testcase)
+
+    def add_tier(self, tier):
+        self.tier_objects.append(tier)
+        self.tiers_by_name.setdefault(tier.get_name(), tier)
+        if tier.is_loaded():
+            self.index_tier(tier)
+
+    def index_tier(self, tier):
+        for test_name in tier.tests_by_name:
+            self.tiers_by_test.setdefault(test_name, tier)
+
+    def index_tags(self, testcase):
+        for tag in testcase.get_tags():
+            self.tags.setdefault(tag, []).append(testcase.get_name())
 
     def get_tiers(self):
         return self.tier_objects
@@ -86,31 +244,103 @@ class TierBuilder():
         return tier_names
 
     def get_tier(self, tier_name):
-        for i, _ in enumerate(self.tier_objects):
-            if self.tier_objects[i].get_name() == tier_name:
-                return self.tier_objects[i]
-        return None
+        return self.tiers_by_name.get(tier_name)
+
+    def get_tier_by_test(self, test_name):
+        if test_name not in self.tiers_by_test:
+            self.load_tiers()
+        return self.tiers_by_test.get(test_name)
 
     def get_tier_name(self, test_name):
-        for i, _ in enumerate(self.tier_objects):
-            if self.tier_objects[i].is_test(test_name):
-                return self.tier_objects[i].name
-        return None
+        tier = self.get_tier_by_test(test_name)
+        return tier.name if tier else None
 
     def get_test(self, test_name):
-        for i, _ in enumerate(self.tier_objects):
-            if self.tier_objects[i].is_test(test_name):
-                return self.tier_objects[i].get_test(test_name)
-        return None
+        tier = self.get_tier_by_test(test_name)
+        return tier.get_test(test_name) if tier else None
+
+    def get_tagged_tests(self, tag):
+        self.load_tiers()
+        return self.tags.get(tag, [])
+
+    def select(self, selection):
+        """Get the names of the test cases matching a selection
+
+        The selection is a comma-separated list of tiers, test cases and
+        tags (tag:name) which may all be glob patterns, e.g.
+        healthcheck,vping_*,tag:smoke. The names are returned in the
+        campaign order.
+
+        Raises:
+            ValueError if an item of the selection matches nothing
+        """
+        selected = set()
+        for item in selection.split(','):
+            item = item.strip()
+            if not item:
+                continue
+            if item in self.tiers_by_name:
+                self.tiers_by_name[item].load()
+                matches = list(self.tiers_by_name[item].tests_by_name)
+            elif item.startswith('tag:'):
+                self.load_tiers()
+                matches = [
+                    name for tag, names in self.tags.items()
+                    if fnmatch.fnmatchcase(tag, item[len('tag:'):])
+                    for name in names]
+            else:
+                self.load_tiers()
+                matches = [
+                    test.get_name() for tier in self.tier_objects
+                    for test in tier.tests_by_name.values()
+                    if item == 'all' or fnmatch.fnmatchcase(
+                        tier.get_name(), item) or fnmatch.fnmatchcase(
+                            test.get_name(), item)]
+            if not matches:
+                raise ValueError(
+                    f"{item} matches no tier, test case or tag")
+            selected.update(matches)
+        return [test.get_name() for tier in self.tier_objects
+                for test in tier.tests_by_name.values()
+                if test.get_name() in selected]
+
+    def evaluate(self, environs):
+        """Resolve the whole catalog against several snapshots of the env
+        vars in one pass
+
+        Returns:
+            for every snapshot, the names of the test cases which would
+            run (i.e. enabled and whose dependencies are met)
+        """
+        self.load_tiers()
+        results = [[] for _ in environs]
+        for tier in self.tier_objects:
+            for test in tier.tests_by_name.values():
+                if not test.is_enabled():
+                    continue
+                for i, environ in enumerate(environs):
+                    if check_dependencies(test.get_dependencies(), environ):
+                        results[i].append(test.get_name())
+        return results
 
     def get_tests(self, tier_name):
-        for i, _ in enumerate(self.tier_objects):
-            if self.tier_objects[i].get_name() == tier_name:
-                return self.tier_objects[i].get_tests()
-        return None
+        tier = self.tiers_by_name.get(tier_name)
+        return tier.get_tests() if tier else None
 
     def __str__(self):
         output = ""
         for i, _ in enumerate(self.tier_objects):
             output += str(self.tier_objects[i]) + "\n"
         return output
+
+
+class TestDescriptions(dict):
+    """Descriptions of some test cases as found in testcases.yaml
+
+    It stands for the whole TierBuilder in the child processes which only
+    need the description of the test case they run.
+    """
+
+    def get_dict_by_test(self, test_name):
+        """Get the description of a test case as found in testcases.yaml"""
+        return self.get(test_name)
@@ -18,49 +18,69 @@ import prettytable
 
 class Tier():
 
-    def __init__(self, name, description=""):
+    def __init__(self, name, description="", concurrency=1, loader=None):
         self.tests_array = []
+        self.tests_tuple = None
         self.skipped_tests_array = []
+        self.tests_by_name = {}
         self.name = name
         self.description = description
+        self.concurrency = concurrency
+        self.loader = loader
+
+    def load(self):
+        """Add the test cases of the tier if they are loaded lazily
+
+        loader(tier) is only called at the first access to the test cases
+        (e.g. to load an include file of testcases.yaml).
+        """
+        if self.loader:
+            loader, self.loader = self.loader, None
+            loader(self)
+
+    def is_loaded(self):
+        return self.loader is None
 
     def add_test(self, testcase):
         self.tests_array.append(testcase)
+        self.tests_tuple = None
+        self.tests_by_name.setdefault(testcase.get_name(), testcase)
 
     def skip_test(self, testcase):
         self.skipped_tests_array.append(testcase)
+        self.tests_by_name.setdefault(testcase.get_name(), testcase)
 
     def get_tests(self):
-        array_tests = []
-        for test in self.tests_array:
-            array_tests.append(test)
-        return array_tests
+        """Get the enabled test cases (a tuple which cannot alter the tier)
+
+        The tuple is only built again if a test case was added since.
+        """
+        self.load()
+        if self.tests_tuple is None:
+            self.tests_tuple = tuple(self.tests_array)
+        return self.tests_tuple
 
     def get_skipped_test(self):
+        self.load()
         return self.skipped_tests_array
 
     def get_test_names(self):
-        array_tests = []
-        for test in self.tests_array:
-            array_tests.append(test.get_name())
-        return array_tests
+        return [test.get_name() for test in self.get_tests()]
 
     def get_test(self, test_name):
-        if self.is_test(test_name):
-            for test in self.tests_array + self.skipped_tests_array:
-                if test.get_name() == test_name:
-                    return test
-        return None
+        self.load()
+        return self.tests_by_name.get(test_name)
 
     def is_test(self, test_name):
-        for test in self.tests_array + self.skipped_tests_array:
-            if test.get_name() == test_name:
-                return True
-        return False
+        self.load()
+        return test_name in self.tests_by_name
 
     def get_name(self):
         return self.name
 
+    def get_concurrency(self):
+        return self.concurrency
+
     def __str__(self):
         msg = prettytable.PrettyTable(
             header_style='upper', padding_width=5,
@@ -76,7 +96,8 @@ class Tier():
 class TestCase():
 
     def __init__(self, name, enabled, skipped, criteria, blocking,
-                 description="", project=""):
+                 description="", project="", depends_on=None, limits=None,
+                 resources=None, tags=None, dependencies=None):
         # pylint: disable=too-many-arguments,too-many-positional-arguments
         self.name = name
         self.enabled = enabled
@@ -85,6 +106,11 @@ class TestCase():
         self.blocking = blocking
         self.description = description
         self.project = project
+        self.depends_on = depends_on or []
+        self.limits = limits or {}
+        self.resources = resources or {}
+        self.tags = tags or []
+        self.dependencies = dependencies or ()
 
     def get_name(self):
         return self.name
@@ -104,6 +130,21 @@ class TestCase():
     def get_project(self):
         return self.project
 
+    def get_depends_on(self):
+        return self.depends_on
+
+    def get_limits(self):
+        return self.limits
+
+    def get_resources(self):
+        return self.resources
+
+    def get_tags(self):
+        return self.tags
+
+    def get_dependencies(self):
+        return self.dependencies
+
     def __str__(self):
         msg = prettytable.PrettyTable(
             header_style='upper', padding_width=5,
@@ -38,11 +38,50 @@ class BehaveFramework(testcase.TestCase):
         self.fail_tests = 0
         self.skip_tests = 0
         self.response = None
+        self.rerun_files = []
+
+    def merge_results(self, response):
+        """Merge the scenarios which were rerun into the response.
+
+        Only the failed scenarios are rerun, the other ones are reported
+        as skipped in the rerun output and then ignored.
+
+        Returns:
+            the names of the scenarios which passed when retried
+        """
+        flaky = []
+        features = {feature['location']: feature for feature in self.response}
+        for feature in response:
+            if feature['location'] not in features:
+                continue
+            elements = features[feature['location']].setdefault(
+                'elements', [])
+            indexes = {
+                element['location']: i for i, element in enumerate(elements)}
+            for element in feature.get('elements', []):
+                i = indexes.get(element['location'])
+                if i is None or elements[i].get('status') != 'failed':
+                    continue
+                if element.get('status') == 'passed':
+                    flaky.append(element['name'])
+                elements[i] = element
+            if (features[feature['location']]['status'] == 'failed' and
+                    'failed' not in [
+                        element.get('status') for element in elements]):
+                features[feature['location']]['status'] = 'passed'
+        return flaky
 
     def parse_results(self):
-        """Parse output.json and get the details in it."""
+        """Parse output.json and get the details in it.
+
+        The results of the reruns (if any) are merged first.
+        """
+        flaky = []
         with open(self.json_file, encoding='utf-8') as stream_:
             self.response = json.load(stream_)
+            for rerun_file in self.rerun_files:
+                with open(rerun_file, encoding='utf-8') as rerun_stream:
+                    flaky.extend(self.merge_results(json.load(rerun_stream)))
             if self.response:
                 self.total_tests = len(self.response)
             for item in self.response:
@@ -60,6 +99,29 @@ class BehaveFramework(testcase.TestCase):
             self.details['fail_tests'] = self.fail_tests
             self.details['skip_tests'] = self.skip_tests
             self.details['tests'] = self.response
+            if flaky:
+                self.details['flaky'] = flaky
+
+    def rerun_failed_tests(self, config, retries):
+        """Rerun the failed scenarios listed by the rerun formatter"""
+        for retry in range(1, retries + 1):
+            rerun_list = os.path.join(self.res_dir, f'rerun{retry - 1}.txt')
+            if not os.path.exists(rerun_list):
+                break
+            with open(rerun_list, encoding='utf-8') as stream_:
+                scenarios = [line.strip() for line in stream_
+                             if line.strip() and not line.startswith('#')]
+            if not scenarios:
+                break
+            self.__logger.info(
+                "Rerunning %d failed scenarios (retry %d/%d)",
+                len(scenarios), retry, retries)
+            rerun_file = os.path.join(self.res_dir, f'rerun{retry}.json')
+            behave_main(config + [
+                '--format=json', f'--outfile={rerun_file}',
+                '--format=rerun',
+                f'--outfile={self.res_dir}/rerun{retry}.txt'] + scenarios)
+            self.rerun_files.append(rerun_file)
 
     def run(self, **kwargs):
         """Run the BehaveFramework feature files
@@ -67,6 +129,7 @@ class BehaveFramework(testcase.TestCase):
         Here are the steps:
            * create the output directories if required,
            * run behave features with parameters
+           * rerun the failed scenarios if retries is set
            * get the results in output.json,
 
         Args:
@@ -92,14 +155,22 @@ class BehaveFramework(testcase.TestCase):
         html_file = os.path.join(self.res_dir, 'output.html')
         config += ['--format=behave_html_formatter:HTMLFormatter',
                    f'--outfile={html_file}']
+        options = []
         if kwargs.get("tags", False):
-            config += ['--tags='+','.join(kwargs.get("tags", []))]
+            options += ['--tags='+','.join(kwargs.get("tags", []))]
         if kwargs.get("console", False):
-            config += ['--format=pretty', '--outfile=-']
+            options += ['--format=pretty', '--outfile=-']
+        config += options
+        if kwargs.get("retries", 0):
+            if os.path.exists(f'{self.res_dir}/rerun0.txt'):
+                os.remove(f'{self.res_dir}/rerun0.txt')
+            config += ['--format=rerun',
+                       f'--outfile={self.res_dir}/rerun0.txt']
         for feature in suites:
             config.append(feature)
         self.start_time = time.time()
         behave_main(config)
+        self.rerun_failed_tests(options, kwargs.get("retries", 0))
         self.stop_time = time.time()
 
         try:
@@ -21,12 +21,12 @@ import zipfile
 import boto3
 from boto3.s3.transfer import TransferConfig
 import botocore
-import requests
 
 from xtesting.core import testcase
 from xtesting.utils import env
 from xtesting.utils import config
 from xtesting.utils import constants
+from xtesting.utils import session
 
 __author__ = "Cedric Ollivier <cedric.ollivier@orange.com>"
 
@@ -68,10 +68,9 @@ class Campaign():
         """
         try:
             url = env.get('TEST_DB_URL')
-            req = requests.get(
+            req = session.get(
                 f"{url}?build_tag={env.get('BUILD_TAG')}",
-                headers=testcase.TestCase.headers,
-                timeout=10)
+                headers=testcase.TestCase.headers)
             req.raise_for_status()
             output = req.json()
             Campaign.__logger.debug("data from DB: \n%s", output)
@@ -29,10 +29,7 @@ def pytest_runtest_makereport(item, call):
     report = yreport.get_result()
     if report.when == 'call':
         test = {"name": report.nodeid, "status": report.outcome.upper()}
-        if report.passed:
-            Pytest.passed += 1
-        elif report.failed:
-            Pytest.failed += 1
+        if report.failed:
             test['failure'] = report.longreprtext
         Pytest.tests.append(test)
 
@@ -57,48 +54,87 @@ class Pytest(testcase.TestCase):
           args:
             opt1: arg1
             opt2: arg2
+
+    If retries is set in args, the failed tests are rerun up to retries
+    times (--last-failed).
     """
 
     __logger = logging.getLogger(__name__)
     tests = []
-    passed = 0
-    failed = 0
+
+    @staticmethod
+    def get_options(options):
+        """Flatten the options dict to a list"""
+        return [
+            str(item) for opt in zip(
+                [f'--{k}' if len(str(k)) > 1 else
+                    f'-{k}' for k in options.keys()],
+                options.values())
+            for item in opt if item is not None]
+
+    def parse_results(self, tests):
+        """Merge the results of all runs and compute the result
+
+        The last outcome of every test wins. The tests which failed
+        before passing when retried are listed as flaky.
+        """
+        merged = {}
+        flaky = []
+        for test in tests:
+            if (test['status'] == 'PASSED' and test['name'] in merged and
+                    merged[test['name']]['status'] == 'FAILED'):
+                flaky.append(test['name'])
+            merged[test['name']] = test
+        self.details["tests"] = list(merged.values())
+        if flaky:
+            self.details["flaky"] = flaky
+        passed = sum(test['status'] == 'PASSED' for test in merged.values())
+        failed = sum(test['status'] == 'FAILED' for test in merged.values())
+        if passed + failed:
+            self.result = passed / (passed + failed) * 100
 
     def run(self, **kwargs):
         # parsing args
         #  - 'dir' is mandatory
         #  - 'options' is an optional list or a dict flatten to a list
+        #  - 'retries' is the optional number of reruns of the failed tests
         status = self.EX_RUN_ERROR
         self.start_time = time.time()
+        first_test = len(Pytest.tests)
         try:
             if os.path.exists(os.path.join(self.dir_results, self.case_name)):
                 shutil.rmtree(os.path.join(self.dir_results, self.case_name))
             pydir = kwargs.pop('dir')
+            retries = kwargs.pop('retries', 0)
             options = kwargs.pop('options', {})
             options['html'] = f'{self.res_dir}/results.html'
             options['junitxml'] = f'{self.res_dir}/results.xml'
-            options['p'] = 'no:cacheprovider'
+            if retries:
+                options['override-ini'] = (
+                    f'cache_dir={self.res_dir}/.pytest_cache')
+            else:
+                options['p'] = 'no:cacheprovider'
             if 'tb' not in options:
                 options['tb'] = 'no'
-            options = [
-                str(item) for opt in zip(
-                    [f'--{k}' if len(str(k)) > 1 else
-                        f'-{k}' for k in options.keys()],
-                    options.values())
-                for item in opt if item is not None]
             with contextlib.redirect_stdout(io.StringIO()) as output:
-                pytest.main(
-                    args=[pydir] + ['-p', __name__] + options)
+                exit_code = pytest.main(
+                    args=[pydir] + ['-p', __name__] +
+                    self.get_options(options))
+                for retry in range(1, retries + 1):
+                    if exit_code != pytest.ExitCode.TESTS_FAILED:
+                        break
+                    options['html'] = f'{self.res_dir}/rerun{retry}.html'
+                    options['junitxml'] = f'{self.res_dir}/rerun{retry}.xml'
+                    exit_code = pytest.main(
+                        args=[pydir] + ['-p', __name__, '--last-failed'] +
+                        self.get_options(options))
             with open(f'{self.res_dir}/stdout.log',
                       'w', encoding='utf-8') as output_file:
                 output_file.write(output.getvalue())
             self.__logger.info(
                 "\n\n %s \n",
                 output.getvalue().splitlines()[-1].replace('=', ''))
-            self.details["tests"] = Pytest.tests
-            if Pytest.passed + Pytest.failed:
-                self.result = Pytest.passed / (
-                    Pytest.passed + Pytest.failed) * 100
+            self.parse_results(Pytest.tests[first_test:])
             status = self.EX_OK
         except Exception:  # pylint: # pylint: disable=broad-except
             self.__logger.exception("Cannot execute pytest")
@@ -17,6 +17,7 @@ import os
 from io import StringIO
 import robot.api
 from robot.errors import RobotError
+import robot.rebot
 from robot.reporting import resultwriter
 import robot.run
 from robot.utils.robottime import timestamp_to_secs
@@ -57,9 +58,13 @@ class RobotFramework(testcase.TestCase):
         super().__init__(**kwargs)
         self.xml_file = os.path.join(self.res_dir, 'output.xml')
         self.deny_skipping = kwargs.get("deny_skipping", False)
+        self.retried = set()
 
     def parse_results(self):
-        """Parse output.xml and get the details in it."""
+        """Parse output.xml and get the details in it.
+
+        The tests which only passed when retried are listed as flaky.
+        """
         result = robot.api.ExecutionResult(self.xml_file)
         visitor = ResultVisitor()
         result.visit(visitor)
@@ -80,6 +85,45 @@ class RobotFramework(testcase.TestCase):
         self.details = {}
         self.details['description'] = result.suite.name
         self.details['tests'] = visitor.get_data()
+        flaky = [
+            test['name'] for test in self.details['tests']
+            if test['status'] == 'PASS' and
+            (test['parent'], test['name']) in self.retried]
+        if flaky:
+            self.details['flaky'] = flaky
+
+    def get_failed_tests(self):
+        """Get the parents and the names of the failed tests"""
+        result = robot.api.ExecutionResult(self.xml_file)
+        visitor = ResultVisitor()
+        result.visit(visitor)
+        return {(test['parent'], test['name']) for test in visitor.get_data()
+                if test['status'] == 'FAIL'}
+
+    def rerun_failed_tests(self, suites, retries, **kwargs):
+        """Rerun the failed tests and merge their results in output.xml
+
+        Only the tests still failing are rerun (--rerunfailed) up to
+        retries times. rebot merges every rerun into output.xml and keeps
+        the overall start and end times.
+        """
+        starttime = robot.api.ExecutionResult(self.xml_file).suite.starttime
+        for retry in range(1, retries + 1):
+            failed = self.get_failed_tests()
+            if not failed:
+                break
+            self.__logger.info(
+                "Rerunning %d failed tests (retry %d/%d)",
+                len(failed), retry, retries)
+            self.retried.update(failed)
+            rerun_file = os.path.join(self.res_dir, f'rerun{retry}.xml')
+            robot.run(*suites, **dict(
+                kwargs, output=rerun_file, rerunfailed=self.xml_file))
+            robot.rebot(
+                self.xml_file, rerun_file, merge=True, output=self.xml_file,
+                starttime=starttime,
+                endtime=robot.api.ExecutionResult(rerun_file).suite.endtime,
+                log="NONE", report="NONE", stdout=kwargs["stdout"])
 
     def generate_report(self):
         """Generate html and xunit outputs"""
@@ -95,6 +139,7 @@ class RobotFramework(testcase.TestCase):
 
         Here are the steps:
            * create the output directories if required,
+           * rerun the failed tests if retries is set,
            * get the results in output.xml,
            * delete temporary files.
 
@@ -110,6 +155,7 @@ class RobotFramework(testcase.TestCase):
         except KeyError:
             self.__logger.exception("Mandatory args were not passed")
             return self.EX_RUN_ERROR
+        retries = kwargs.pop("retries", 0)
         if not os.path.exists(self.res_dir):
             try:
                 os.makedirs(self.res_dir)
@@ -127,6 +173,11 @@ class RobotFramework(testcase.TestCase):
         robot.run(*suites, **kwargs)
         self.__logger.info("\n%s", stream.getvalue())
         try:
+            if retries:
+                stream.seek(0)
+                stream.truncate()
+                self.rerun_failed_tests(suites, retries, **kwargs)
+                self.__logger.info("\n%s", stream.getvalue())
             self.parse_results()
             self.__logger.info("Results were successfully parsed")
             self.generate_report()
@@ -10,7 +10,9 @@
 """Define the parent class of all Xtesting TestCases."""
 
 import abc
+import asyncio
 from datetime import datetime
+import functools
 import json
 import logging
 import mimetypes
@@ -24,9 +26,10 @@ import botocore
 import prettytable
 import requests
 
-from xtesting.utils import decorators
 from xtesting.utils import env
 from xtesting.utils import constants
+from xtesting.utils import session
+from xtesting.utils import sink
 
 __author__ = "Cedric Ollivier <cedric.ollivier@orange.com>"
 
@@ -54,6 +57,8 @@ class TestCase(metaclass=abc.ABCMeta):
     """publish_artifacts() failed"""
 
     dir_results = constants.RESULTS_DIR
+    cancel_event = None
+    """event set by the runner to cancel the running test cases"""
     _job_name_rule = "(dai|week)ly-(.+?)-[0-9]*"
     headers = {'Content-Type': 'application/json'}
     __logger = logging.getLogger(__name__)
@@ -150,6 +155,18 @@ class TestCase(metaclass=abc.ABCMeta):
             self.__logger.error("Please run test before checking the results")
         return TestCase.EX_TESTCASE_FAILED
 
+    def is_cancelled(self):
+        """Check if the runner asked the test case to stop.
+
+        Long running test cases may poll it to stop early when a
+        blocking test case fails in parallel.
+
+        Returns:
+            True if the test case is cancelled,
+            False otherwise.
+        """
+        return bool(self.cancel_event and self.cancel_event.is_set())
+
     def check_requirements(self):
         """Check the requirements of the test case.
 
@@ -178,7 +195,64 @@ class TestCase(metaclass=abc.ABCMeta):
             kwargs: Arbitrary keyword arguments.
         """
 
-    @decorators.can_dump_request_to_file
+    async def arun(self, **kwargs):
+        """Run the test case in the event loop of the runner.
+
+        It allows the test cases mostly waiting for I/O to run
+        concurrently in one event loop (see concurrency in
+        testcases.yaml).
+
+        It can be overridden by native asyncio test cases. By default,
+        run() is called in the default executor of the event loop. Yet
+        run_tests only awaits the test cases overriding it: the other ones
+        run in child processes as their frameworks may not be thread-safe.
+
+        Args:
+            kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            the value returned by run().
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self.run, **kwargs))
+
+    def get_db_data(self):
+        """Get the results of the test case as pushed to the DB.
+
+        The installer, the scenario, the pod and the build tag are read
+        from env.
+
+        Returns:
+            the dict posted to TEST_DB_URL.
+
+        Raises:
+            AssertionError: the test case was not run.
+        """
+        assert self.project_name
+        assert self.case_name
+        assert self.start_time
+        assert self.stop_time
+        data = {"project_name": self.project_name,
+                "case_name": self.case_name,
+                "details": self.details}
+        data["installer"] = env.get('INSTALLER_TYPE')
+        data["scenario"] = env.get('DEPLOY_SCENARIO')
+        data["pod_name"] = env.get('NODE_NAME')
+        data["build_tag"] = env.get('BUILD_TAG')
+        data["criteria"] = 'PASS' if self.is_successful(
+            ) == TestCase.EX_OK else 'FAIL'
+        data["start_date"] = datetime.fromtimestamp(
+            self.start_time).strftime('%Y-%m-%d %H:%M:%S')
+        data["stop_date"] = datetime.fromtimestamp(
+            self.stop_time).strftime('%Y-%m-%d %H:%M:%S')
+        try:
+            data["version"] = re.search(
+                TestCase._job_name_rule,
+                env.get('BUILD_TAG')).group(2)
+        except Exception:  # pylint: disable=broad-except
+            data["version"] = "unknown"
+        return data
+
     def push_to_db(self):
         """Push the results of the test case to the DB.
 
@@ -203,6 +277,9 @@ class TestCase(metaclass=abc.ABCMeta):
             * NODE_NAME,
             * BUILD_TAG.
 
+        The results are appended as one json line to the local file if
+        TEST_DB_URL is a file:// URL (see xtesting.utils.sink).
+
         Returns:
             TestCase.EX_OK if results were pushed to DB.
             TestCase.EX_PUSH_TO_DB_ERROR otherwise.
@@ -210,44 +287,22 @@ class TestCase(metaclass=abc.ABCMeta):
         try:
             if self.is_skipped:
                 return TestCase.EX_PUSH_TO_DB_ERROR
-            assert self.project_name
-            assert self.case_name
-            assert self.start_time
-            assert self.stop_time
             url = env.get('TEST_DB_URL')
-            data = {"project_name": self.project_name,
-                    "case_name": self.case_name,
-                    "details": self.details}
-            data["installer"] = env.get('INSTALLER_TYPE')
-            data["scenario"] = env.get('DEPLOY_SCENARIO')
-            data["pod_name"] = env.get('NODE_NAME')
-            data["build_tag"] = env.get('BUILD_TAG')
-            data["criteria"] = 'PASS' if self.is_successful(
-                ) == TestCase.EX_OK else 'FAIL'
-            data["start_date"] = datetime.fromtimestamp(
-                self.start_time).strftime('%Y-%m-%d %H:%M:%S')
-            data["stop_date"] = datetime.fromtimestamp(
-                self.stop_time).strftime('%Y-%m-%d %H:%M:%S')
-            try:
-                data["version"] = re.search(
-                    TestCase._job_name_rule,
-                    env.get('BUILD_TAG')).group(2)
-            except Exception:  # pylint: disable=broad-except
-                data["version"] = "unknown"
-            req = requests.post(
-                url, data=json.dumps(data, sort_keys=True),
-                headers=self.headers,
-                timeout=10)
+            if urlparse(url).scheme == "file":
+                sink.get_sink(url).write(self.get_db_data())
+                return TestCase.EX_OK
+            req = session.post(
+                url, data=json.dumps(self.get_db_data(), sort_keys=True),
+                headers=self.headers)
             req.raise_for_status()
-            if urlparse(url).scheme != "file":
-                # href must be postprocessed as OPNFV testapi is misconfigured
-                # (localhost is returned)
-                uid = re.sub(r'^.*/api/v1/results/*', '', req.json()["href"])
-                netloc = env.get('TEST_DB_EXT_URL') if env.get(
-                    'TEST_DB_EXT_URL') else env.get('TEST_DB_URL')
-                self.__logger.info(
-                    "The results were successfully pushed to DB: \n\n%s\n",
-                    os.path.join(netloc, uid))
+            # href must be postprocessed as OPNFV testapi is misconfigured
+            # (localhost is returned)
+            uid = re.sub(r'^.*/api/v1/results/*', '', req.json()["href"])
+            netloc = env.get('TEST_DB_EXT_URL') if env.get(
+                'TEST_DB_EXT_URL') else env.get('TEST_DB_URL')
+            self.__logger.info(
+                "The results were successfully pushed to DB: \n\n%s\n",
+                os.path.join(netloc, uid))
         except AssertionError:
             self.__logger.exception(
                 "Please run test before publishing the results")
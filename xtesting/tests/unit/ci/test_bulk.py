@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+# pylint: disable=missing-docstring
+
+import json
+import logging
+import os
+import unittest
+
+import mock
+import requests
+
+from xtesting.ci import bulk
+from xtesting.ci import isolation
+from xtesting.core import testcase
+
+
+def get_response(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return response
+
+
+class BulkTesting(unittest.TestCase):
+
+    def setUp(self):
+        self.bulk = bulk.Bulk(10, 1.0)
+        self.records = []
+        for name in ['foo', 'bar']:
+            record = isolation.ExecutedTestCase(
+                case_name=name, project_name='xtesting')
+            record.start_time = 1
+            record.stop_time = 2
+            self.records.append(record)
+        patcher = mock.patch.dict(
+            os.environ, {'TEST_DB_URL': 'http://127.0.0.1/api',
+                         'TEST_DB_BULK_URL': 'http://127.0.0.1/api/bulk'})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @mock.patch('xtesting.utils.session.post', return_value=get_response(200))
+    def test_push_bulk(self, mock_method):
+        self.assertEqual(self.bulk.push(self.records),
+                         [testcase.TestCase.EX_OK] * 2)
+        mock_method.assert_called_once_with(
+            'http://127.0.0.1/api/bulk', data=mock.ANY,
+            headers={'Content-Type': 'application/json'})
+        data = json.loads(mock_method.call_args[1]['data'])
+        self.assertEqual([item['case_name'] for item in data], ['foo', 'bar'])
+        self.assertEqual(self.bulk.modes[0], bulk.Bulk.BULK)
+
+    @mock.patch('xtesting.utils.session.post',
+                side_effect=[get_response(400), get_response(200),
+                             get_response(200)])
+    def test_push_ndjson(self, mock_method):
+        self.assertEqual(self.bulk.push(self.records),
+                         [testcase.TestCase.EX_OK] * 2)
+        self.assertEqual(self.bulk.modes[0], bulk.Bulk.NDJSON)
+        self.assertEqual(
+            mock_method.call_args[1]['headers'],
+            {'Content-Type': 'application/x-ndjson'})
+        self.assertEqual(mock_method.call_args[0][0],
+                         'http://127.0.0.1/api/bulk')
+        lines = mock_method.call_args[1]['data'].splitlines()
+        self.assertEqual([json.loads(line)['case_name'] for line in lines],
+                         ['foo', 'bar'])
+        self.bulk.push(self.records[:1])
+        self.assertEqual(mock_method.call_count, 3)
+
+    @mock.patch('xtesting.ci.isolation.ExecutedTestCase.push_to_db',
+                side_effect=[testcase.TestCase.EX_OK,
+                             testcase.TestCase.EX_PUSH_TO_DB_ERROR])
+    @mock.patch('xtesting.utils.session.post',
+                side_effect=[get_response(404), get_response(415)])
+    def test_push_single(self, *args):
+        self.assertEqual(self.bulk.push(self.records), [
+            testcase.TestCase.EX_OK, testcase.TestCase.EX_PUSH_TO_DB_ERROR])
+        self.assertEqual(self.bulk.modes, [bulk.Bulk.SINGLE])
+        self.assertEqual(args[0].call_count, 2)
+        self.assertEqual(args[1].call_count, 2)
+
+    @mock.patch('xtesting.utils.session.post',
+                side_effect=[get_response(500),
+                             requests.exceptions.ConnectionError])
+    def test_push_ko(self, mock_method):
+        for _ in range(2):
+            self.assertEqual(
+                self.bulk.push(self.records),
+                [testcase.TestCase.EX_PUSH_TO_DB_ERROR] * 2)
+            self.assertEqual(self.bulk.modes[0], bulk.Bulk.BULK)
+        self.assertEqual(mock_method.call_count, 2)
+
+    @mock.patch('xtesting.utils.session.post', return_value=get_response(200))
+    def test_push_not_run(self, mock_method):
+        self.records[0].start_time = 0
+        self.records[1].is_skipped = True
+        self.assertEqual(self.bulk.push(self.records),
+                         [testcase.TestCase.EX_PUSH_TO_DB_ERROR] * 2)
+        mock_method.assert_not_called()
+
+    @mock.patch('xtesting.ci.isolation.ExecutedTestCase.push_to_db',
+                return_value=testcase.TestCase.EX_OK)
+    @mock.patch('xtesting.utils.session.post')
+    def test_push_file(self, *args):
+        with mock.patch.dict(os.environ, {'TEST_DB_URL': 'file:///foo'}):
+            self.assertEqual(self.bulk.push(self.records),
+                             [testcase.TestCase.EX_OK] * 2)
+        args[0].assert_not_called()
+        self.assertEqual(args[1].call_count, 2)
+
+    @mock.patch('xtesting.ci.isolation.ExecutedTestCase.push_to_db',
+                return_value=testcase.TestCase.EX_OK)
+    @mock.patch('xtesting.utils.session.post', return_value=get_response(200))
+    def test_push_no_bulk_url(self, *args):
+        with mock.patch.dict(os.environ, {'TEST_DB_BULK_URL': ''}):
+            self.assertEqual(self.bulk.push(self.records),
+                             [testcase.TestCase.EX_OK] * 2)
+        args[0].assert_not_called()
+        self.assertEqual(args[1].call_count, 2)
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    unittest.main(verbosity=2)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+# pylint: disable=missing-docstring
+
+import logging
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+
+import mock
+
+from xtesting.ci import daemon
+
+
+class DaemonTesting(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'run_tests.sock')
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.path)
+        self.server.listen()
+        # pylint: disable=consider-using-with
+        self.stdout = tempfile.TemporaryFile('w+')
+        self.stderr = tempfile.TemporaryFile('w+')
+
+    def tearDown(self):
+        self.server.close()
+        self.stdout.close()
+        self.stderr.close()
+        shutil.rmtree(self.tmpdir)
+
+    def _request(self, handler, argv=('-t', 'foo')):
+        def _handle():
+            conn, _ = self.server.accept()
+            daemon.handle(conn, handler)
+
+        thread = threading.Thread(target=_handle)
+        with mock.patch('sys.stdout', self.stdout), \
+                mock.patch('sys.stderr', self.stderr), \
+                mock.patch('os.dup2') as mock_dup2, \
+                mock.patch('os.chdir') as mock_chdir, \
+                mock.patch.dict(os.environ, {'FOO': 'bar'}):
+            thread.start()
+            result = daemon.request(list(argv), self.path)
+            thread.join()
+        self.assertEqual(mock_dup2.call_count, 2)
+        mock_chdir.assert_called_once_with(os.getcwd())
+        return result
+
+    def test_request(self):
+        environ = {}
+        handler = mock.Mock(
+            side_effect=lambda argv: environ.update(os.environ) or 0)
+        self.assertEqual(self._request(handler), 0)
+        handler.assert_called_once_with(['-t', 'foo'])
+        self.assertEqual(environ.get('FOO'), 'bar')
+
+    def test_request_exit(self):
+        handler = mock.Mock(side_effect=SystemExit(2))
+        self.assertEqual(self._request(handler), 2)
+
+    def test_request_exit_message(self):
+        handler = mock.Mock(side_effect=SystemExit('foo'))
+        self.assertEqual(self._request(handler), os.EX_USAGE)
+
+    def test_request_exception(self):
+        handler = mock.Mock(side_effect=ValueError)
+        self.assertEqual(self._request(handler), os.EX_SOFTWARE)
+
+    def test_request_no_result(self):
+        def _close():
+            conn, _ = self.server.accept()
+            conn.close()
+
+        thread = threading.Thread(target=_close)
+        thread.start()
+        with mock.patch('sys.stdout', self.stdout), \
+                mock.patch('sys.stderr', self.stderr):
+            self.assertEqual(
+                daemon.request([], self.path), os.EX_SOFTWARE)
+        thread.join()
+
+    def test_request_unavailable(self):
+        with mock.patch('sys.stderr', self.stderr):
+            self.assertEqual(
+                daemon.request([], os.path.join(self.tmpdir, 'foo')),
+                os.EX_UNAVAILABLE)
+
+    @mock.patch('xtesting.ci.daemon.os.waitpid',
+                side_effect=[(12, 0), (13, 0), (0, 0)])
+    def test_reap_children(self, mock_waitpid):
+        daemon.reap_children()
+        self.assertEqual(mock_waitpid.call_count, 3)
+
+    @mock.patch('xtesting.ci.daemon.os.waitpid',
+                side_effect=ChildProcessError)
+    def test_reap_children_none(self, mock_waitpid):
+        daemon.reap_children()
+        mock_waitpid.assert_called_once_with(-1, os.WNOHANG)
+
+
+class ServeTesting(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = mock.Mock()
+        self.server = mock.Mock()
+        self.server.accept.side_effect = [
+            socket.timeout, (self.conn, None), KeyboardInterrupt]
+        self.handler = mock.Mock()
+
+    @mock.patch('xtesting.ci.daemon.reap_children')
+    @mock.patch('xtesting.ci.daemon.handle')
+    @mock.patch('os._exit')
+    @mock.patch('os.fork', return_value=12)
+    @mock.patch('os.remove')
+    @mock.patch('os.path.exists', return_value=True)
+    def test_serve(self, *args):
+        with mock.patch('socket.socket', return_value=self.server):
+            self.assertEqual(
+                daemon.serve(self.handler, '/foo'), os.EX_OK)
+        self.server.bind.assert_called_once_with('/foo')
+        args[1].assert_has_calls([mock.call('/foo'), mock.call('/foo')])
+        args[3].assert_not_called()
+        args[4].assert_not_called()
+        self.conn.close.assert_called_once_with()
+        self.server.close.assert_called_once_with()
+        self.assertEqual(args[5].call_count, 3)
+
+    @mock.patch('xtesting.ci.daemon.reap_children')
+    @mock.patch('xtesting.ci.daemon.handle')
+    @mock.patch('os._exit')
+    @mock.patch('os.fork', return_value=0)
+    @mock.patch('os.remove')
+    @mock.patch('os.path.exists', return_value=False)
+    def test_serve_child(self, *args):
+        with mock.patch('socket.socket', return_value=self.server):
+            self.assertEqual(
+                daemon.serve(self.handler, '/foo'), os.EX_OK)
+        args[1].assert_called_once_with('/foo')
+        args[4].assert_called_once_with(self.conn, self.handler)
+        args[3].assert_called_once_with(os.EX_OK)
+
+    @mock.patch('xtesting.ci.daemon.reap_children')
+    @mock.patch('xtesting.ci.daemon.handle', side_effect=OSError)
+    @mock.patch('os._exit')
+    @mock.patch('os.fork', return_value=0)
+    @mock.patch('os.remove')
+    @mock.patch('os.path.exists', return_value=False)
+    def test_serve_child_ko(self, *args):
+        with mock.patch('socket.socket', return_value=self.server):
+            daemon.serve(self.handler, '/foo')
+        args[3].assert_called_once_with(os.EX_SOFTWARE)
+
+    @mock.patch('xtesting.ci.daemon.request', return_value=0)
+    def test_main(self, mock_request):
+        with mock.patch('sys.argv', ['run_tests_client', '-t', 'foo']):
+            self.assertEqual(daemon.main(), 0)
+        mock_request.assert_called_once_with(['-t', 'foo'])
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    unittest.main(verbosity=2)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+# pylint: disable=missing-docstring
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from xtesting.ci import history
+
+
+class HistoryTesting(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'durations.json')
+        with open(self.filename, 'w', encoding='utf-8') as hfile:
+            json.dump({'foo': 10.0}, hfile)
+        self.history = history.History(self.filename, default=5.0)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    @staticmethod
+    def _get_test_case(start_time=1, stop_time=3, is_skipped=False):
+        return mock.Mock(case_name='bar', start_time=start_time,
+                         stop_time=stop_time, is_skipped=is_skipped)
+
+    def test_get(self):
+        self.assertEqual(self.history.get('foo'), 10.0)
+        self.assertEqual(self.history.get('bar'), 5.0)
+
+    def test_load_missing(self):
+        self.assertEqual(
+            history.History(os.path.join(self.tmpdir, 'missing')).durations,
+            {})
+
+    def test_load_invalid(self):
+        with open(self.filename, 'w', encoding='utf-8') as hfile:
+            hfile.write('{')
+        self.assertEqual(history.History(self.filename).durations, {})
+
+    def test_update(self):
+        self.history.update(self._get_test_case())
+        self.assertEqual(self.history.get('bar'), 2.0)
+        self.assertTrue(self.history.updated)
+
+    def test_update_ignored(self):
+        self.history.update(self._get_test_case(is_skipped=True))
+        self.history.update(self._get_test_case(start_time=0))
+        self.history.update(self._get_test_case(start_time=4))
+        self.history.update(self._get_test_case(start_time=mock.Mock()))
+        self.assertEqual(self.history.get('bar'), 5.0)
+        self.assertFalse(self.history.updated)
+
+    def test_save(self):
+        self.history.update(self._get_test_case())
+        self.history.save()
+        self.assertFalse(self.history.updated)
+        self.assertEqual(history.History(self.filename).durations,
+                         {'foo': 10.0, 'bar': 2.0})
+
+    @mock.patch('os.replace')
+    def test_save_not_updated(self, *args):
+        self.history.save()
+        args[0].assert_not_called()
+
+    @mock.patch('os.replace', side_effect=OSError)
+    def test_save_ko(self, *args):
+        self.history.update(self._get_test_case())
+        self.history.save()
+        self.assertTrue(self.history.updated)
+        args[0].assert_called_once_with(
+            f'{self.filename}.tmp', self.filename)
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    unittest.main(verbosity=2)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+# pylint: disable=missing-docstring
+
+import logging
+import multiprocessing
+import os
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+
+import mock
+
+from xtesting.ci import isolation
+from xtesting.core import testcase
+
+
+class FakeTestCase(testcase.TestCase):
+
+    def run(self, **kwargs):
+        self.start_time = 1
+        self.stop_time = 2
+        self.result = 100
+        self.details = {'foo': 'bar'}
+        return self.EX_OK
+
+
+def _get_env(key):
+    return os.environ.get(key)
+
+
+def _raise():
+    raise ValueError('foo')
+
+
+def _exit():
+    os._exit(1)  # pylint: disable=protected-access
+
+
+def _sleep():
+    time.sleep(10)
+
+
+def _spawn(filename):
+    with subprocess.Popen(['/bin/sh', '-c', 'sleep 37']) as process:
+        with open(filename, 'w', encoding='utf-8') as pfile:
+            pfile.write(str(process.pid))
+        process.wait()
+
+
+def _is_running(pid):
+    try:
+        with open(f'/proc/{pid}/stat', encoding='utf-8') as sfile:
+            return sfile.read().rsplit(')', 1)[1].split()[0] not in 'ZX'
+    except OSError:
+        return False
+
+
+def _burn():
+    while True:
+        pass
+
+
+class IsolationTesting(unittest.TestCase):
+
+    def test_from_test_case(self):
+        test_case = FakeTestCase(case_name='foo', project_name='bar')
+        test_case.run()
+        record = isolation.ExecutedTestCase.from_test_case(test_case)
+        self.assertEqual(record.case_name, 'foo')
+        self.assertEqual(record.project_name, 'bar')
+        self.assertEqual(record.details, {'foo': 'bar'})
+        self.assertEqual(record.get_duration(), test_case.get_duration())
+        self.assertEqual(record.is_successful(), testcase.TestCase.EX_OK)
+        self.assertEqual(record.run(), testcase.TestCase.EX_RUN_ERROR)
+
+    def test_record_default(self):
+        self.assertEqual(isolation.ExecutedTestCase().is_successful(),
+                         testcase.TestCase.EX_TESTCASE_FAILED)
+
+    @mock.patch('xtesting.ci.registry.get_registry')
+    def test_get_preloaded_modules(self, *args):
+        args[0].return_value.get_drivers.return_value = {
+            'bashfeature': 'xtesting.core.feature:BashFeature',
+            'feature': 'xtesting.core.feature : Feature'}
+        self.assertEqual(isolation.get_preloaded_modules(),
+                         ['xtesting.ci.run_tests', 'xtesting.core.feature'])
+
+    @mock.patch('xtesting.ci.isolation.get_preloaded_modules',
+                return_value=['xtesting.ci.run_tests'])
+    @mock.patch('multiprocessing.get_context')
+    def test_get_context(self, *args):
+        with mock.patch('xtesting.ci.isolation._CONTEXT', None):
+            context = isolation.get_context()
+            self.assertEqual(isolation.get_context(), context)
+        args[0].assert_called_once_with('forkserver')
+        context.set_forkserver_preload.assert_called_once_with(
+            ['xtesting.ci.run_tests'])
+
+    @mock.patch('xtesting.ci.isolation.get_context',
+                return_value=multiprocessing.get_context('fork'))
+    def test_run(self, *args):
+        with mock.patch.dict(os.environ, {'XTESTING_FOO': 'bar'}):
+            self.assertEqual(isolation.run(_get_env, 'XTESTING_FOO'), 'bar')
+        args[0].assert_called_once_with()
+
+    @mock.patch('xtesting.ci.isolation.get_context',
+                return_value=multiprocessing.get_context('fork'))
+    def test_run_exception(self, *args):
+        with self.assertRaises(ValueError):
+            isolation.run(_raise)
+        args[0].assert_called_once_with()
+
+    @mock.patch('xtesting.ci.isolation.get_context',
+                return_value=multiprocessing.get_context('fork'))
+    def test_run_exit(self, *args):
+        with self.assertRaises(isolation.IsolationError):
+            isolation.run(_exit)
+        args[0].assert_called_once_with()
+
+    @mock.patch('xtesting.ci.isolation.get_context',
+                return_value=multiprocessing.get_context('fork'))
+    def test_run_unpicklable(self, *args):
+        with self.assertRaises(isolation.IsolationError):
+            isolation.run(lambda: lambda: None)
+        args[0].assert_called_once_with()
+
+
+@mock.patch('xtesting.ci.isolation.WATCHDOG_INTERVAL', 0.1)
+@mock.patch('xtesting.ci.isolation.get_context',
+            return_value=multiprocessing.get_context('fork'))
+class LimitsTesting(unittest.TestCase):
+
+    def test_timeout(self, *args):
+        start_time = time.monotonic()
+        with self.assertRaises(isolation.LimitExceeded) as context:
+            isolation.run(_sleep, limits={'timeout': 0.2})
+        self.assertEqual(context.exception.reason, 'timeout')
+        self.assertLess(time.monotonic() - start_time, 5)
+        args[0].assert_called_once_with()
+
+    def test_cpu_limit(self, *args):
+        with self.assertRaises(isolation.LimitExceeded) as context:
+            isolation.run(_burn, limits={'cpu_limit': 1, 'timeout': 30})
+        self.assertEqual(context.exception.reason, 'cpu_limit')
+        args[0].assert_called_once_with()
+
+    @mock.patch('xtesting.ci.isolation.get_rss', return_value=2048)
+    def test_memory_limit(self, *args):
+        with self.assertRaises(isolation.LimitExceeded) as context:
+            isolation.run(_sleep, limits={'memory_limit': 1024})
+        self.assertEqual(context.exception.reason, 'memory_limit')
+        args[0].assert_called_with(mock.ANY)
+
+    def test_within_limits(self, *args):
+        with mock.patch.dict(os.environ, {'XTESTING_FOO': 'bar'}):
+            self.assertEqual(isolation.run(
+                _get_env, 'XTESTING_FOO',
+                limits={'timeout': 10, 'cpu_limit': 10,
+                        'memory_limit': 1024 ** 3}), 'bar')
+        args[0].assert_called_once_with()
+
+    def test_cancelled(self, *args):
+        cancel_event = multiprocessing.get_context('fork').Event()
+        cancel_event.set()
+        with self.assertRaises(isolation.Cancelled) as context:
+            isolation.run(_sleep, cancel_event=cancel_event)
+        self.assertEqual(context.exception.reason, 'cancelled')
+        args[0].assert_called_once_with()
+
+    def test_cancelled_tree(self, *args):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        filename = os.path.join(tmpdir, 'pid')
+        cancel_event = multiprocessing.get_context('fork').Event()
+
+        def cancel():
+            while not os.path.isfile(filename) or not os.path.getsize(
+                    filename):
+                time.sleep(0.05)
+            cancel_event.set()
+
+        thread = threading.Thread(target=cancel, daemon=True)
+        thread.start()
+        with self.assertRaises(isolation.Cancelled):
+            isolation.run(_spawn, filename, cancel_event=cancel_event)
+        thread.join()
+        with open(filename, encoding='utf-8') as pfile:
+            pid = int(pfile.read())
+        deadline = time.monotonic() + 5
+        while _is_running(pid) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertFalse(_is_running(pid))
+        args[0].assert_called_once_with()
+
+    def test_interrupted(self, *args):
+        with mock.patch('xtesting.ci.isolation.watch',
+                        side_effect=KeyboardInterrupt), \
+                mock.patch('xtesting.ci.isolation.kill') as mock_method, \
+                self.assertRaises(KeyboardInterrupt):
+            isolation.run(_sleep)
+        mock_method.assert_called_once_with(mock.ANY)
+        mock_method.call_args[0][0].kill()
+        mock_method.call_args[0][0].join()
+        args[0].assert_called_once_with()
+
+
+class WatchdogTesting(unittest.TestCase):
+
+    def test_get_rss(self):
+        self.assertGreater(isolation.get_rss(os.getpgrp()), 0)
+        self.assertEqual(isolation.get_rss(-1), 0)
+
+    @mock.patch('os.killpg', side_effect=OSError)
+    def test_kill(self, *args):
+        process = mock.Mock(pid=42)
+        isolation.kill(process)
+        args[0].assert_called_once_with(42, signal.SIGKILL)
+        process.kill.assert_called_once_with()
+        process.join.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    unittest.main(verbosity=2)
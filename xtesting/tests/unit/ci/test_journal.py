@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+# pylint: disable=missing-docstring
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from xtesting.ci import journal
+from xtesting.core import testcase
+
+
+class FakeTestCase(testcase.TestCase):
+
+    def run(self, **kwargs):
+        self.start_time = 1
+        self.stop_time = 61
+        self.result = 100
+        self.details = {'foo': 'bar'}
+        return self.EX_OK
+
+
+class JournalTesting(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'journal.jsonl')
+        self.journal = journal.Journal(self.filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    @staticmethod
+    def _get_test_case(name):
+        test_case = FakeTestCase(case_name=name, project_name='xtesting')
+        test_case.run()
+        return test_case
+
+    def _read(self):
+        with open(self.filename, encoding='utf-8') as jfile:
+            return jfile.read()
+
+    def test_append(self):
+        self.journal.append(self._get_test_case('first'))
+        self.journal.append(self._get_test_case('first'))
+        self.journal.append(self._get_test_case('second'))
+        self.assertEqual(len(self._read().splitlines()), 2)
+        self.assertEqual(list(self.journal.records), ['first', 'second'])
+
+    def test_append_truncate(self):
+        with open(self.filename, 'w', encoding='utf-8') as jfile:
+            jfile.write('previous campaign\n')
+        self.journal.append(self._get_test_case('first'))
+        self.assertNotIn('previous', self._read())
+
+    @mock.patch('os.fsync', side_effect=OSError)
+    def test_append_ko(self, *args):
+        self.journal.append(self._get_test_case('first'))
+        self.assertEqual(self.journal.records, {})
+        args[0].assert_called_once_with(mock.ANY)
+
+    def test_load(self):
+        self.journal.append(self._get_test_case('first'))
+        resumed = journal.Journal(self.filename)
+        resumed.load()
+        record = resumed.get_test_case('first')
+        self.assertEqual(record.case_name, 'first')
+        self.assertEqual(record.details, {'foo': 'bar'})
+        self.assertEqual(record.get_duration(), '01:00')
+        self.assertEqual(record.is_successful(), testcase.TestCase.EX_OK)
+        self.assertIsNone(resumed.get_test_case('second'))
+        resumed.append(self._get_test_case('second'))
+        self.assertEqual(len(self._read().splitlines()), 2)
+
+    def test_load_partial(self):
+        self.journal.append(self._get_test_case('first'))
+        with open(self.filename, 'a', encoding='utf-8') as jfile:
+            jfile.write('{"case_name": "sec')
+        resumed = journal.Journal(self.filename)
+        resumed.load()
+        self.assertEqual(list(resumed.records), ['first'])
+        resumed.append(self._get_test_case('second'))
+        resumed.load()
+        self.assertEqual(list(resumed.records), ['first', 'second'])
+
+    def test_load_missing(self):
+        self.journal.load()
+        self.assertEqual(self.journal.records, {})
+        self.assertFalse(self.journal.truncate)
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    unittest.main(verbosity=2)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+# pylint: disable=missing-docstring
+
+import argparse
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from xtesting.ci import matrix
+
+
+class MatrixTesting(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_parse_scenario(self):
+        self.assertEqual(
+            matrix.parse_scenario('DEPLOY_SCENARIO=os-odl-ha,FOO=a=b'),
+            {'DEPLOY_SCENARIO': 'os-odl-ha', 'FOO': 'a=b'})
+        self.assertEqual(matrix.parse_scenario('FOO='), {'FOO': ''})
+
+    def test_parse_scenario_ko(self):
+        for value in ['', 'FOO', 'FOO=bar,', '1FOO=bar', 'FOO BAR=1']:
+            with self.assertRaises(argparse.ArgumentTypeError):
+                matrix.parse_scenario(value)
+
+    def test_get_names(self):
+        self.assertEqual(matrix.get_names([
+            {'DEPLOY_SCENARIO': 'os-nosdn-nofeature-ha',
+             'INSTALLER_TYPE': 'fuel'},
+            {'DEPLOY_SCENARIO': 'os/odl ha'},
+            {'DEPLOY_SCENARIO': 'os/odl ha'},
+            {'FOO': '..'}]),
+            ['os-nosdn-nofeature-ha_fuel', 'os_odl_ha', 'os_odl_ha-3',
+             'scenario'])
+
+    def test_get_environ(self):
+        with mock.patch.dict(os.environ, {'FOO': 'foo', 'BAR': 'bar'}):
+            environ = matrix.get_environ({'FOO': 'baz'})
+        self.assertEqual(environ['FOO'], 'baz')
+        self.assertEqual(environ['BAR'], 'bar')
+
+    def test_dump_load(self):
+        os.makedirs(os.path.join(self.tmpdir, 'foo'))
+        with mock.patch('xtesting.ci.matrix.constants.RESULTS_DIR',
+                        self.tmpdir):
+            matrix.dump('foo', {'FOO': 'foo'}, 0, [['test1']])
+            self.assertEqual(matrix.load('foo'), {
+                'scenario': 'foo', 'env': {'FOO': 'foo'}, 'result': 0,
+                'testcases': [['test1']]})
+
+    @mock.patch('xtesting.ci.matrix.LOGGER.error')
+    def test_load_ko(self, mock_method):
+        with mock.patch('xtesting.ci.matrix.constants.RESULTS_DIR',
+                        self.tmpdir):
+            self.assertIsNone(matrix.load('foo'))
+        mock_method.assert_called_once_with(
+            "No results found for the scenario %s", 'foo')
+
+    @mock.patch('os.waitpid')
+    @mock.patch('os.fork', side_effect=[12, 13])
+    def test_run(self, *args):
+        function = mock.Mock()
+        with mock.patch('xtesting.ci.matrix.load',
+                        side_effect=[{'result': 0}, None]) as mock_load:
+            self.assertEqual(
+                matrix.run([{'FOO': 'foo'}, {'FOO': 'bar'}], function),
+                [{'result': 0}, None])
+        mock_load.assert_has_calls([mock.call('foo'), mock.call('bar')])
+        function.assert_not_called()
+        args[1].assert_has_calls([mock.call(12, 0), mock.call(13, 0)])
+
+    @mock.patch('os.waitpid')
+    @mock.patch('os._exit')
+    @mock.patch('os.fork', return_value=0)
+    def test_run_child(self, *args):
+        function = mock.Mock(side_effect=[None, ValueError])
+        with mock.patch('xtesting.ci.matrix.constants.RESULTS_DIR',
+                        self.tmpdir):
+            matrix.run([{'FOO': 'foo'}, {'FOO': 'bar'}], function)
+        function.assert_has_calls([
+            mock.call('foo', {'FOO': 'foo'}),
+            mock.call('bar', {'FOO': 'bar'})])
+        args[1].assert_has_calls([
+            mock.call(os.EX_OK), mock.call(os.EX_SOFTWARE)])
+
+    def test_merge(self):
+        results = [
+            {'scenario': 'foo', 'result': 0, 'testcases': [
+                ['a', 'p', 't', '00:01', 'PASS']]},
+            {'scenario': 'bar', 'result': 0, 'testcases': [
+                ['a', 'p', 't', '00:02', 'PASS'],
+                ['b', 'p', 't', '00:00', 'SKIP']]}]
+        self.assertEqual(matrix.merge(results), ([
+            ['foo', 'a', 'p', 't', '00:01', 'PASS'],
+            ['bar', 'a', 'p', 't', '00:02', 'PASS'],
+            ['bar', 'b', 'p', 't', '00:00', 'SKIP']], False))
+
+    def test_merge_failed(self):
+        self.assertTrue(matrix.merge([
+            {'scenario': 'foo', 'result': 0, 'testcases': [
+                ['a', 'p', 't', '00:01', 'FAIL']]}])[1])
+        self.assertTrue(matrix.merge([
+            {'scenario': 'foo', 'result': -1, 'testcases': []}])[1])
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    unittest.main(verbosity=2)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+# pylint: disable=missing-docstring
+
+import logging
+import os
+import pickle
+import threading
+import unittest
+
+import mock
+
+from xtesting.ci import isolation
+from xtesting.ci import publisher
+from xtesting.core import testcase
+
+
+BULK_URL = 'http://127.0.0.1/bulk'
+
+
+class FakeTestCase(testcase.TestCase):
+
+    def run(self, **kwargs):
+        return self.EX_OK
+
+
+class CustomTestCase(FakeTestCase):
+
+    def push_to_db(self):
+        return self.EX_OK
+
+
+class PublisherTesting(unittest.TestCase):
+
+    def setUp(self):
+        self.publisher = publisher.Publisher()
+        self.test_case = FakeTestCase(case_name='foo', project_name='bar')
+        self.test_case.start_time = 1
+        self.test_case.stop_time = 2
+
+    @mock.patch('xtesting.ci.isolation.ExecutedTestCase.push_to_db',
+                side_effect=[testcase.TestCase.EX_OK,
+                             testcase.TestCase.EX_PUSH_TO_DB_ERROR,
+                             ValueError])
+    def test_submit(self, mock_method):
+        for name in ['foo', 'bar', 'baz']:
+            self.test_case.case_name = name
+            self.publisher.submit(self.test_case)
+        self.assertFalse(self.publisher.flush())
+        self.assertEqual(mock_method.call_count, 3)
+        self.assertEqual(self.publisher.statuses, {
+            'foo': 'OK', 'bar': 'FAIL', 'baz': 'FAIL'})
+        self.assertIsNone(self.publisher.thread)
+
+    def test_submit_record(self):
+        with mock.patch.object(self.publisher, 'start'):
+            self.publisher.queue = mock.Mock()
+            self.publisher.submit(self.test_case)
+        record, uid = self.publisher.queue.put.call_args[0][0]
+        self.assertIsNone(uid)
+        self.assertIsInstance(record, isolation.ExecutedTestCase)
+        self.assertEqual(record.case_name, 'foo')
+        self.assertEqual(record.start_time, 1)
+        self.assertEqual(self.publisher.get_status('foo'), 'PENDING')
+
+    @mock.patch('xtesting.ci.isolation.ExecutedTestCase.push_to_db',
+                side_effect=[testcase.TestCase.EX_OK,
+                             testcase.TestCase.EX_PUSH_TO_DB_ERROR])
+    def test_submit_spool(self, *args):
+        self.publisher.spool = mock.Mock()
+        self.publisher.spool.add.side_effect = ['uid1', 'uid2']
+        self.publisher.submit(self.test_case)
+        self.publisher.submit(self.test_case)
+        self.publisher.submit(CustomTestCase(case_name='bar'))
+        self.assertFalse(self.publisher.flush())
+        self.assertEqual(args[0].call_count, 2)
+        self.assertIsInstance(self.publisher.spool.add.call_args[0][0],
+                              isolation.ExecutedTestCase)
+        self.assertEqual(self.publisher.spool.add.call_count, 2)
+        self.publisher.spool.ack.assert_called_once_with('uid1')
+        self.publisher.spool.compact.assert_called_once_with()
+
+    @mock.patch('xtesting.ci.bulk.Bulk.push',
+                side_effect=lambda records: [testcase.TestCase.EX_OK] * len(
+                    records))
+    def test_submit_batch(self, mock_method):
+        with mock.patch.dict(os.environ, {'TEST_DB_BATCH_SIZE': '2',
+                                          'TEST_DB_BULK_URL': BULK_URL}):
+            for name in ['foo', 'bar', 'baz']:
+                self.test_case.case_name = name
+                self.publisher.submit(self.test_case)
+            self.publisher.submit(CustomTestCase(case_name='qux'))
+            self.assertTrue(self.publisher.flush())
+        self.assertEqual(
+            [[record.case_name for record in call[0][0]]
+             for call in mock_method.call_args_list],
+            [['foo', 'bar'], ['baz']])
+        self.assertEqual(self.publisher.statuses, {
+            'foo': 'OK', 'bar': 'OK', 'baz': 'OK', 'qux': 'OK'})
+
+    def test_submit_batch_interval(self):
+        event = threading.Event()
+        self.publisher.spool = mock.Mock()
+
+        def push(records):
+            event.set()
+            return [testcase.TestCase.EX_PUSH_TO_DB_ERROR] * len(records)
+
+        with mock.patch.dict(os.environ, {'TEST_DB_BATCH_SIZE': '10',
+                                          'TEST_DB_BATCH_INTERVAL': '0.01',
+                                          'TEST_DB_BULK_URL': BULK_URL}), \
+                mock.patch('xtesting.ci.bulk.Bulk.push',
+                           side_effect=push) as mock_method:
+            self.publisher.submit(self.test_case)
+            # the batch is pushed before flush() is called
+            self.assertTrue(event.wait(5))
+            self.assertFalse(self.publisher.flush())
+        mock_method.assert_called_once_with([mock.ANY])
+        self.assertEqual(self.publisher.get_status('foo'), 'FAIL')
+        self.publisher.spool.ack.assert_not_called()
+
+    @mock.patch('xtesting.ci.bulk.Bulk.push', side_effect=ValueError)
+    def test_submit_batch_ko(self, *args):
+        with mock.patch.dict(os.environ, {'TEST_DB_BATCH_SIZE': '2',
+                                          'TEST_DB_BULK_URL': BULK_URL}):
+            self.publisher.submit(self.test_case)
+            self.assertFalse(self.publisher.flush())
+        args[0].assert_called_once_with([mock.ANY])
+        self.assertEqual(self.publisher.get_status('foo'), 'FAIL')
+
+    @mock.patch('xtesting.ci.isolation.ExecutedTestCase.push_to_db',
+                return_value=testcase.TestCase.EX_OK)
+    @mock.patch('xtesting.ci.bulk.Bulk.push')
+    def test_submit_batch_no_bulk_url(self, *args):
+        with mock.patch.dict(os.environ, {'TEST_DB_BATCH_SIZE': '2'}):
+            self.publisher.submit(self.test_case)
+            self.assertIsNone(self.publisher.bulk)
+            self.assertTrue(self.publisher.flush())
+        args[0].assert_not_called()
+        args[1].assert_called_once_with()
+
+    @mock.patch('xtesting.utils.sink.flush')
+    def test_submit_custom(self, mock_method):
+        test_case = CustomTestCase(case_name='foo')
+        self.publisher.submit(test_case)
+        self.assertTrue(self.publisher.flush())
+        self.assertEqual(self.publisher.get_status('foo'), 'OK')
+        mock_method.assert_called_once_with()
+
+    def test_flush_timeout(self):
+        event = threading.Event()
+        test_case = CustomTestCase(case_name='foo')
+        with mock.patch.object(test_case, 'push_to_db',
+                               side_effect=event.wait):
+            self.publisher.submit(test_case)
+            with mock.patch('xtesting.ci.publisher.LOGGER.error') as mock_log:
+                self.assertFalse(self.publisher.flush(timeout=0.01))
+            mock_log.assert_called_once_with(
+                "The results of %s were not pushed to DB after %d seconds",
+                'foo', 0.01)
+            self.assertEqual(self.publisher.get_status('foo'), 'PENDING')
+            event.set()
+
+    def test_flush_timeout_spool(self):
+        event = threading.Event()
+        self.publisher.spool = mock.Mock()
+        self.publisher.spool.add.return_value = 'uid1'
+        with mock.patch('xtesting.ci.isolation.ExecutedTestCase.push_to_db',
+                        side_effect=event.wait):
+            self.publisher.submit(self.test_case)
+            self.assertFalse(self.publisher.flush(timeout=0.01))
+            event.set()
+        self.publisher.spool.compact.assert_not_called()
+
+    def test_flush_empty(self):
+        self.assertTrue(self.publisher.flush())
+        self.assertEqual(self.publisher.get_status('foo'), '')
+
+    def test_pickle(self):
+        self.publisher.submit(CustomTestCase(case_name='foo'))
+        copy = pickle.loads(pickle.dumps(self.publisher))
+        self.assertIsNone(copy.queue)
+        self.assertIsNone(copy.thread)
+        self.publisher.flush()
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    unittest.main(verbosity=2)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+# pylint: disable=missing-docstring
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from xtesting.ci import registry
+from xtesting.core import feature
+
+
+class RegistryTesting(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'drivers.json')
+        self.entry_points = [
+            mock.Mock(value='xtesting.core.feature:BashFeature'),
+            mock.Mock(value='xtesting.core.feature:Feature'),
+            mock.Mock(value='foo:Bar')]
+        for entry_point, name in zip(
+                self.entry_points, ['bashfeature', 'feature', 'feature']):
+            entry_point.name = name
+        self.registry = registry.Registry(self.filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _scan(self):
+        with mock.patch('xtesting.ci.registry.metadata.entry_points',
+                        return_value=self.entry_points) as mock_method:
+            self.registry.scan()
+        mock_method.assert_called_once_with(group='xtesting.testcase')
+
+    def test_get_key(self):
+        self.assertEqual(registry.get_key(), registry.get_key())
+        with mock.patch('sys.path', [self.tmpdir, '/foo']):
+            key = registry.get_key()
+            os.utime(self.tmpdir, ns=(0, 0))
+            self.assertNotEqual(registry.get_key(), key)
+
+    def test_scan(self):
+        self._scan()
+        self.assertEqual(self.registry.drivers, {
+            'bashfeature': 'xtesting.core.feature:BashFeature',
+            'feature': 'xtesting.core.feature:Feature'})
+        with open(self.filename, encoding='utf-8') as rfile:
+            data = json.load(rfile)
+        self.assertEqual(data['drivers'], self.registry.drivers)
+        self.assertEqual(data['key'], registry.get_key())
+
+    def test_scan_dir(self):
+        self.registry.filename = os.path.join(self.tmpdir, 'foo', 'bar')
+        self._scan()
+        self.assertTrue(os.path.isfile(self.registry.filename))
+
+    def test_scan_ko(self):
+        with open(os.path.join(self.tmpdir, 'foo'), 'w', encoding='utf-8'):
+            pass
+        self.registry.filename = os.path.join(self.tmpdir, 'foo', 'bar')
+        self._scan()
+        self.assertIn('feature', self.registry.drivers)
+        self.assertFalse(os.path.exists(f'{self.registry.filename}.tmp'))
+
+    def test_load(self):
+        self._scan()
+        other = registry.Registry(self.filename)
+        self.assertTrue(other.load())
+        self.assertEqual(other.drivers, self.registry.drivers)
+
+    @mock.patch('xtesting.ci.registry.get_key', side_effect=['foo', 'bar'])
+    def test_load_stale(self, *args):
+        self._scan()
+        self.assertFalse(registry.Registry(self.filename).load())
+        self.assertEqual(args[0].call_count, 2)
+
+    def test_load_ko(self):
+        self.assertFalse(self.registry.load())
+        with open(self.filename, 'w', encoding='utf-8') as rfile:
+            rfile.write('foo')
+        self.assertFalse(self.registry.load())
+
+    @mock.patch('xtesting.ci.registry.Registry.scan')
+    @mock.patch('xtesting.ci.registry.Registry.load', return_value=True)
+    def test_get_drivers(self, *args):
+        self.registry.get_drivers()
+        args[0].assert_called_once_with()
+        args[1].assert_not_called()
+
+    def test_get_class(self):
+        self._scan()
+        self.assertEqual(
+            self.registry.get_class('feature'), feature.Feature)
+        self.registry.drivers = {}
+        self.assertEqual(
+            self.registry.get_class('feature'), feature.Feature)
+
+    def test_get_class_stale(self):
+        self.registry.drivers = {'bashfeature': 'foo:Bar'}
+        with mock.patch('xtesting.ci.registry.metadata.entry_points',
+                        return_value=self.entry_points) as mock_method:
+            self.assertEqual(self.registry.get_class('bashfeature'),
+                             feature.BashFeature)
+        mock_method.assert_called_once_with(group='xtesting.testcase')
+
+    def test_get_class_ko(self):
+        self._scan()
+        with self.assertRaises(LookupError):
+            self.registry.get_class('foo')
+        self.registry.drivers['foo'] = 'xtesting.core.feature:Foo'
+        with self.assertRaises(AttributeError):
+            self.registry.get_class('foo')
+
+    def test_get_driver(self):
+        self._scan()
+        driver = self.registry.get_driver(
+            'bashfeature', case_name='foo', project_name='bar')
+        self.assertIsInstance(driver, feature.BashFeature)
+        self.assertEqual(driver.case_name, 'foo')
+        self.assertEqual(driver.project_name, 'bar')
+
+    def test_get_registry(self):
+        with mock.patch('xtesting.ci.registry._REGISTRY', None):
+            self.assertIs(registry.get_registry(), registry.get_registry())
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    unittest.main(verbosity=2)
@@ -5,16 +5,31 @@
 # which accompanies this distribution, and is available at
 # http://www.apache.org/licenses/LICENSE-2.0
 
-# pylint: disable=missing-docstring
+# pylint: disable=missing-docstring,too-many-lines
 
+import asyncio
+from concurrent import futures
+import copy
+import json
 import logging
+import multiprocessing
 import unittest
 import os
+import shutil
+import tempfile
+import threading
 
 import mock
 
+from xtesting.ci import isolation
+from xtesting.ci import registry
 from xtesting.ci import run_tests
+from xtesting.ci import scheduler
+from xtesting.ci import tier_builder
+from xtesting.ci import tier_handler
 from xtesting.core.testcase import TestCase
+from xtesting.utils import config
+from xtesting.utils import constants
 
 
 class FakeModule(TestCase):
@@ -27,10 +42,64 @@ class FakeModule(TestCase):
         return TestCase.EX_OK
 
 
+class FakeAsyncModule(FakeModule):
+
+    async def arun(self, **kwargs):
+        await asyncio.sleep(0)
+        return self.run(**kwargs)
+
+
+class LockedModule(FakeModule):
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock = threading.Lock()
+
+
+def run_locked_test(runner, test):
+    # the driver cannot be pickled to be sent back by the pool worker
+    test_case = LockedModule(case_name=test.get_name(), project_name='foo')
+    test_case.run()
+    runner.executed_test_cases[test.get_name()] = test_case
+    return test_case.is_successful()
+
+
+class FakeExecutor(futures.ThreadPoolExecutor):
+    # a single thread sharing a copy of the runner mimics a worker process
+
+    def __init__(self, max_workers, initializer, initargs):
+        # pylint: disable=unused-argument
+        runner = copy.copy(initargs[0])
+        runner.executed_test_cases = {}
+        self._processes = {}
+        super().__init__(
+            max_workers=1, initializer=self._initialize,
+            initargs=(initializer, runner))
+
+    @staticmethod
+    def _initialize(initializer, runner):
+        with mock.patch('os.setpgid'):
+            initializer(runner)
+
+
 class RunTestsTesting(unittest.TestCase):
+    # pylint: disable=too-many-public-methods,protected-access
 
     def setUp(self):
-        self.runner = run_tests.Runner()
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        patcher = mock.patch(
+            'xtesting.ci.registry._REGISTRY', registry.Registry(
+                filename=os.path.join(tmpdir, 'drivers.json')))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.runner = run_tests.Runner(tiers=tier_builder.TierBuilder(
+            config.get_xtesting_config(
+                constants.TESTCASE_DESCRIPTION,
+                constants.TESTCASE_DESCRIPTION_DEFAULT),
+            cache_dir=tmpdir))
+        self.runner.journal = mock.Mock()
+        self.runner.journal.get_test_case.return_value = None
         mock_test_case = mock.Mock()
         mock_test_case.is_successful.return_value = TestCase.EX_OK
         self.runner.executed_test_cases['test1'] = mock_test_case
@@ -44,11 +113,14 @@ class RunTestsTesting(unittest.TestCase):
         self.tier = mock.Mock()
         test1 = mock.Mock()
         test1.get_name.return_value = 'test1'
+        test1.get_depends_on.return_value = []
         test2 = mock.Mock()
         test2.get_name.return_value = 'test2'
+        test2.get_depends_on.return_value = []
         attrs = {'get_name.return_value': 'test_tier',
                  'get_tests.return_value': [test1, test2],
                  'get_ci_loop.return_value': 'test_ci_loop',
+                 'get_concurrency.return_value': 1,
                  'get_test_names.return_value': ['test1', 'test2']}
         self.tier.configure_mock(**attrs)
 
@@ -117,17 +189,21 @@ class RunTestsTesting(unittest.TestCase):
             'export "\'OS_TENANT_NAME\'" = "\'admin\'"')
 
     def test_get_dict_by_test(self):
-        with mock.patch('builtins.open', mock.mock_open()), \
-                mock.patch('yaml.safe_load') as mock_yaml:
-            mock_obj = mock.Mock()
-            testcase_dict = {'case_name': 'testname',
-                             'criteria': 50}
-            attrs = {'get.return_value': [{'testcases': [testcase_dict]}]}
-            mock_obj.configure_mock(**attrs)
-            mock_yaml.return_value = mock_obj
-            self.assertDictEqual(
-                run_tests.Runner.get_dict_by_test('testname'),
-                testcase_dict)
+        testcase_dict = {'case_name': 'testname', 'criteria': 50}
+        self.runner.tiers = mock.Mock()
+        self.runner.tiers.get_dict_by_test.return_value = testcase_dict
+        self.assertDictEqual(
+            self.runner.get_dict_by_test('testname'), testcase_dict)
+        self.runner.tiers.get_dict_by_test.assert_called_once_with(
+            'testname')
+
+    @mock.patch('xtesting.ci.run_tests.LOGGER.error')
+    def test_get_dict_by_test_ko(self, *args):
+        self.runner.tiers = mock.Mock()
+        self.runner.tiers.get_dict_by_test.return_value = None
+        self.assertIsNone(self.runner.get_dict_by_test('testname'))
+        args[0].assert_called_once_with(
+            'Project %s is not defined in testcases.yaml', 'testname')
 
     @mock.patch('xtesting.ci.run_tests.Runner.get_run_dict',
                 return_value=None)
@@ -136,6 +212,7 @@ class RunTestsTesting(unittest.TestCase):
         kwargs = {'get_name.return_value': 'test_name',
                   'is_skipped.return_value': False,
                   'is_enabled.return_value': True,
+                  'get_limits.return_value': {},
                   'needs_clean.return_value': False}
         mock_test.configure_mock(**kwargs)
         with self.assertRaises(Exception) as context:
@@ -144,14 +221,16 @@ class RunTestsTesting(unittest.TestCase):
         msg = "Cannot import the class for the test case."
         self.assertTrue(msg in str(context.exception))
 
-    @mock.patch('stevedore.driver.DriverManager',
-                return_value=mock.Mock(driver=FakeModule()))
-    @mock.patch('xtesting.ci.run_tests.Runner.get_dict_by_test')
+    @mock.patch('xtesting.ci.registry.Registry.get_driver',
+                return_value=FakeModule())
+    @mock.patch('xtesting.ci.run_tests.Runner.get_dict_by_test',
+                return_value={'case_name': 'test_name'})
     def test_run_tests_default(self, *args):
         mock_test = mock.Mock()
         kwargs = {'get_name.return_value': 'test_name',
                   'is_skipped.return_value': False,
                   'is_enabled.return_value': True,
+                  'get_limits.return_value': {},
                   'needs_clean.return_value': True}
         mock_test.configure_mock(**kwargs)
         test_run_dict = {'name': 'test_module'}
@@ -161,11 +240,104 @@ class RunTestsTesting(unittest.TestCase):
             self.assertEqual(self.runner.run_test(mock_test), TestCase.EX_OK)
         args[0].assert_called_with('test_name')
         args[1].assert_called_with(
-            invoke_kwds=mock.ANY, invoke_on_load=True, name='test_module',
-            namespace='xtesting.testcase')
+            'test_module', case_name='test_name')
         self.assertEqual(self.runner.overall_result,
                          run_tests.Result.EX_OK)
 
+    @mock.patch('xtesting.ci.registry.Registry.get_driver',
+                return_value=FakeAsyncModule())
+    @mock.patch('xtesting.ci.run_tests.Runner.get_dict_by_test',
+                return_value={'case_name': 'test_name'})
+    def test_aexecute_test(self, *args):
+        mock_test = mock.Mock()
+        mock_test.get_name.return_value = 'test_name'
+        with mock.patch('xtesting.ci.run_tests.Runner.get_run_dict',
+                        return_value={'name': 'test_module', 'args': {}}):
+            self.assertEqual(
+                asyncio.run(self.runner.aexecute_test(mock_test)),
+                TestCase.EX_OK)
+        args[0].assert_called_with('test_name')
+        args[1].assert_called_with(
+            'test_module', case_name='test_name')
+        self.assertIsInstance(
+            self.runner.executed_test_cases['test_name'], FakeAsyncModule)
+
+    @mock.patch('xtesting.ci.registry.Registry.get_driver',
+                side_effect=ImportError)
+    @mock.patch('xtesting.ci.run_tests.Runner.get_dict_by_test')
+    def test_aexecute_test_exception(self, *args):
+        mock_test = mock.Mock()
+        mock_test.get_name.return_value = 'test_name'
+        with mock.patch('xtesting.ci.run_tests.Runner.get_run_dict',
+                        return_value={'name': 'test_module',
+                                      'module': 'test_module'}):
+            self.assertEqual(
+                asyncio.run(self.runner.aexecute_test(mock_test)),
+                TestCase.EX_TESTCASE_FAILED)
+        with mock.patch('xtesting.ci.run_tests.Runner.get_run_dict',
+                        return_value=None), \
+                self.assertRaises(Exception):
+            asyncio.run(self.runner.aexecute_test(mock_test))
+        args[1].assert_called_once_with('test_module')
+
+    @mock.patch('xtesting.ci.run_tests.Runner.run_test_isolated',
+                return_value=TestCase.EX_OK)
+    def test_arun_test_isolated(self, *args):
+        test = self._get_tests(True)[0]
+        test.is_enabled.return_value = True
+        test.is_skipped.return_value = False
+        test.get_limits.return_value = {'timeout': 1}
+        with mock.patch.object(self.runner, 'aexecute_test') as mock_method:
+            self.assertEqual(asyncio.run(self.runner.arun_test(test)),
+                             TestCase.EX_OK)
+        args[0].assert_called_once_with(test)
+        mock_method.assert_not_called()
+
+    @mock.patch('xtesting.ci.run_tests.Runner.run_test',
+                return_value=TestCase.EX_TESTCASE_SKIPPED)
+    def test_arun_test_skipped(self, *args):
+        test = self._get_tests(True)[0]
+        test.is_enabled.return_value = False
+        with mock.patch.object(self.runner, 'aexecute_test') as mock_method:
+            self.assertEqual(asyncio.run(self.runner.arun_test(test)),
+                             TestCase.EX_TESTCASE_SKIPPED)
+        args[0].assert_called_once_with(test)
+        mock_method.assert_not_called()
+
+    @mock.patch('xtesting.ci.run_tests.Runner.get_run_dict',
+                return_value={'name': 'test_module'})
+    def test_arun_test_driver(self, *args):
+        test = self._get_tests(True)[0]
+        test.is_enabled.return_value = True
+        test.is_skipped.return_value = False
+        for driver, isolated in [(FakeAsyncModule, False), (FakeModule, True)]:
+            with mock.patch('xtesting.ci.registry.Registry.get_class',
+                            return_value=driver), \
+                    mock.patch.object(self.runner, 'run_test_isolated',
+                                      return_value=TestCase.EX_OK) as mock_1, \
+                    mock.patch.object(self.runner, 'aexecute_test',
+                                      return_value=TestCase.EX_OK) as mock_2:
+                self.assertEqual(asyncio.run(self.runner.arun_test(test)),
+                                 TestCase.EX_OK)
+            self.assertEqual(mock_1.called, isolated)
+            self.assertEqual(mock_2.called, not isolated)
+        args[0].assert_called_with('test0')
+
+    def test_is_async(self):
+        test = self._get_tests(True)[0]
+        with mock.patch('xtesting.ci.run_tests.Runner.get_run_dict',
+                        return_value={'name': 'test_module'}), \
+                mock.patch('xtesting.ci.registry.Registry.get_class',
+                           side_effect=[FakeAsyncModule, FakeModule,
+                                        ImportError]) as mock_method:
+            self.assertTrue(self.runner.is_async(test))
+            self.assertFalse(self.runner.is_async(test))
+            self.assertFalse(self.runner.is_async(test))
+        mock_method.assert_called_with('test_module')
+        with mock.patch('xtesting.ci.run_tests.Runner.get_run_dict',
+                        return_value=None):
+            self.assertFalse(self.runner.is_async(test))
+
     @mock.patch('xtesting.ci.run_tests.Runner.get_dict_by_test')
     def test_run_tests_disabled(self, *args):
         mock_test = mock.Mock()
@@ -215,6 +387,732 @@ class RunTestsTesting(unittest.TestCase):
                          run_tests.Result.EX_ERROR)
         self.assertTrue(mock_logger_info.called)
 
+    @staticmethod
+    def _get_tests(*blockings, depends_on=None):
+        tests = []
+        depends_on = depends_on or {}
+        for i, blocking in enumerate(blockings):
+            test = mock.Mock()
+            test.get_name.return_value = f'test{i}'
+            test.is_blocking.return_value = blocking
+            test.get_depends_on.return_value = depends_on.get(f'test{i}', [])
+            test.get_limits.return_value = {}
+            test.get_resources.return_value = {}
+            test.get_project.return_value = 'project'
+            test.get_criteria.return_value = 100
+            tests.append(test)
+        return tests
+
+    @staticmethod
+    def _run_test(results, runner=None):
+        def run_test(test):
+            test_case = isolation.ExecutedTestCase(
+                case_name=test.get_name(), project_name='project',
+                successful=results[test.get_name()])
+            (runner or run_tests._WORKER_RUNNER).executed_test_cases[
+                test.get_name()] = test_case
+            return results[test.get_name()]
+        return run_test
+
+    @mock.patch('xtesting.ci.run_tests.futures.ProcessPoolExecutor',
+                FakeExecutor)
+    def test_run_tier_jobs(self):
+        tests = self._get_tests(True, True, True)
+        self.tier.get_tests.return_value = tests
+        results = {'test0': TestCase.EX_OK, 'test1': TestCase.EX_OK,
+                   'test2': TestCase.EX_OK}
+        self.runner.jobs = 2
+        with mock.patch('xtesting.ci.run_tests.Runner.run_test',
+                        side_effect=self._run_test(results)) as mock_run:
+            self.assertEqual(self.runner.run_tier(self.tier),
+                             run_tests.Result.EX_OK)
+        self.assertEqual(mock_run.call_count, 3)
+        for name in results:
+            self.assertIn(name, self.runner.executed_test_cases)
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork',
+                         'the workers must inherit the mocks')
+    @mock.patch('xtesting.ci.run_tests.Runner.run_test', run_locked_test)
+    def test_run_tier_jobs_process(self):
+        tests = [tier_handler.TestCase(
+            f'test{i}', True, False, 100, True) for i in range(3)]
+        self.tier.get_tests.return_value = tests
+        self.runner.executed_test_cases.clear()
+        self.runner.jobs = 2
+        self.assertEqual(self.runner.run_tier(self.tier),
+                         run_tests.Result.EX_OK)
+        self.assertEqual(sorted(self.runner.executed_test_cases),
+                         ['test0', 'test1', 'test2'])
+        for test_case in self.runner.executed_test_cases.values():
+            self.assertEqual(test_case.is_successful(), TestCase.EX_OK)
+            self.assertEqual(test_case.result, 100)
+        self.assertEqual(self.runner.overall_result, run_tests.Result.EX_OK)
+
+    @mock.patch('xtesting.ci.run_tests.futures.ProcessPoolExecutor',
+                FakeExecutor)
+    def test_run_tier_jobs_failed(self):
+        tests = self._get_tests(False, False)
+        self.tier.get_tests.return_value = tests
+        results = {'test0': TestCase.EX_TESTCASE_FAILED,
+                   'test1': TestCase.EX_OK}
+        self.runner.jobs = 2
+        with mock.patch('xtesting.ci.run_tests.Runner.run_test',
+                        side_effect=self._run_test(results)):
+            self.assertEqual(self.runner.run_tier(self.tier),
+                             run_tests.Result.EX_ERROR)
+
+    @mock.patch('xtesting.ci.run_tests.futures.ProcessPoolExecutor',
+                FakeExecutor)
+    def test_run_tier_jobs_blocking(self):
+        tests = self._get_tests(True, False, False)
+        self.tier.get_tests.return_value = tests
+        results = {'test0': TestCase.EX_TESTCASE_FAILED,
+                   'test1': TestCase.EX_OK, 'test2': TestCase.EX_OK}
+        self.runner.jobs = 1
+        with mock.patch('xtesting.ci.run_tests.Runner.run_test',
+                        side_effect=self._run_test(results)) as mock_run:
+            self.assertEqual(
+                self.runner.run_tests_in_pool(
+                    scheduler.Scheduler(tests, fail_fast=True)), 'test0')
+        mock_run.assert_called_once_with(tests[0])
+        self.assertEqual(self.runner.overall_result,
+                         run_tests.Result.EX_ERROR)
+        self.runner.jobs = 2
+        with mock.patch('xtesting.ci.run_tests.Runner.run_test',
+                        side_effect=self._run_test(results)), \
+                self.assertRaises(run_tests.BlockingTestFailed):
+            self.runner.run_tier(self.tier)
+
+    @mock.patch('xtesting.ci.run_tests.futures.ProcessPoolExecutor',
+                FakeExecutor)
+    @mock.patch('xtesting.ci.run_tests.Runner.run_test',
+                side_effect=Exception)
+    def test_run_tier_jobs_exception(self, *args):
+        tests = self._get_tests(True, False)
+        self.runner.jobs = 2
+        self.assertEqual(
+            self.runner.run_tests_in_pool(scheduler.Scheduler(tests)),
+            'test0')
+        self.assertEqual(args[0].call_count, 2)
+        self.assertEqual(self.runner.overall_result,
+                         run_tests.Result.EX_ERROR)
+
+    @mock.patch('xtesting.ci.run_tests.futures.ProcessPoolExecutor',
+                FakeExecutor)
+    def test_run_tier_jobs_cancelled(self):
+        tests = self._get_tests(False, False)
+        results = {'test0': TestCase.EX_OK}
+
+        def run_test(test):
+            if test.get_name() == 'test1':
+                raise run_tests.isolation.Cancelled('foo')
+            return self._run_test(results)(test)
+        self.runner.jobs = 2
+        self.runner.executed_test_cases.clear()
+        test_scheduler = scheduler.Scheduler(tests)
+        with mock.patch('xtesting.ci.run_tests.Runner.run_test',
+                        side_effect=run_test):
+            self.assertIsNone(self.runner.run_tests_in_pool(test_scheduler))
+        self.assertEqual(test_scheduler.cancelled, ['test1'])
+        self.assertEqual(list(self.runner.executed_test_cases), ['test0'])
+        self.assertEqual(self.runner.overall_result, run_tests.Result.EX_OK)
+
+    @mock.patch('xtesting.ci.run_tests.isolation.kill')
+    def test_cancel_running_tests(self, *args):
+        tests = self._get_tests(True, False, False)
+        test_scheduler = scheduler.Scheduler(tests, fail_fast=True)
+        test_scheduler.get_ready_tests(2)
+        test_scheduler.set_finished('test0', blocking_failure=True)
+        self.runner.cancel_event = mock.Mock()
+        process = mock.Mock()
+        executor = mock.Mock(_processes={42: process})
+        future = futures.Future()
+        running = {future: tests[1]}
+        with mock.patch('xtesting.ci.run_tests.futures.wait',
+                        return_value=(set(), {future})) as mock_wait:
+            self.runner.cancel_running_tests(
+                executor, running, test_scheduler)
+        mock_wait.assert_called_once_with(
+            running, timeout=run_tests.Runner.CANCEL_TIMEOUT)
+        self.runner.cancel_event.set.assert_called_once_with()
+        args[0].assert_called_once_with(process)
+        self.assertEqual(running, {})
+        self.assertEqual(test_scheduler.cancelled, ['test2', 'test1'])
+        self.assertTrue(test_scheduler.is_finished())
+
+    @mock.patch('xtesting.ci.run_tests.isolation.kill')
+    def test_cancel_running_tests_stopped(self, *args):
+        tests = self._get_tests(True, False, False)
+        test_scheduler = scheduler.Scheduler(tests, fail_fast=True)
+        test_scheduler.get_ready_tests(3)
+        test_scheduler.set_finished('test0', blocking_failure=True)
+        self.runner.cancel_event = mock.Mock()
+        done, not_done = futures.Future(), futures.Future()
+        running = {done: tests[1], not_done: tests[2]}
+        with mock.patch('xtesting.ci.run_tests.futures.wait',
+                        return_value=({done}, {not_done})):
+            self.runner.cancel_running_tests(
+                mock.Mock(_processes={}), running, test_scheduler)
+        args[0].assert_not_called()
+        self.assertEqual(running, {done: tests[1]})
+        self.assertEqual(test_scheduler.cancelled, ['test2'])
+        self.assertEqual(test_scheduler.running, ['test1'])
+
+    def test_run_tier_jobs_cancel_finished(self):
+        tests = self._get_tests(True, False)
+
+        def run_test_in_worker(test):
+            test_case = mock.Mock(
+                EX_TESTCASE_FAILED=TestCase.EX_TESTCASE_FAILED)
+            if test.get_name() == 'test0':
+                result = TestCase.EX_TESTCASE_FAILED
+            else:
+                # it stops once asked to but still has a result
+                self.runner.cancel_event.wait(5)
+                result = TestCase.EX_OK
+            test_case.is_successful.return_value = result
+            return result, test_case
+        self.runner.jobs = 2
+        with mock.patch('xtesting.ci.run_tests.futures.ProcessPoolExecutor',
+                        side_effect=lambda max_workers, **kwargs:
+                        futures.ThreadPoolExecutor(max_workers)), \
+                mock.patch('xtesting.ci.run_tests._run_test_in_worker',
+                           side_effect=run_test_in_worker):
+            test_scheduler = scheduler.Scheduler(tests, fail_fast=True)
+            self.assertEqual(
+                self.runner.run_tests_in_pool(test_scheduler), 'test0')
+        self.assertEqual(test_scheduler.cancelled, [])
+        self.assertEqual(test_scheduler.finished, ['test0', 'test1'])
+        test_case = self.runner.executed_test_cases['test1']
+        self.assertEqual(test_case.is_successful(), TestCase.EX_OK)
+        self.runner.journal.append.assert_called_with(test_case)
+
+    def _arun_test(self, results, running):
+        async def arun_test(test):
+            running['current'] += 1
+            running['max'] = max(running['max'], running['current'])
+            await asyncio.sleep(0.01)
+            running['current'] -= 1
+            return self._run_test(results, self.runner)(test)
+        return arun_test
+
+    def test_run_tier_concurrency(self):
+        tests = self._get_tests(True, True, True)
+        self.tier.get_tests.return_value = tests
+        self.tier.get_concurrency.return_value = 2
+        results = {'test0': TestCase.EX_OK, 'test1': TestCase.EX_OK,
+                   'test2': TestCase.EX_OK}
+        running = {'current': 0, 'max': 0}
+        with mock.patch.object(self.runner, 'arun_test',
+                               side_effect=self._arun_test(
+                                   results, running)) as mock_run:
+            self.assertEqual(self.runner.run_tier(self.tier),
+                             run_tests.Result.EX_OK)
+        self.assertEqual(mock_run.call_count, 3)
+        self.assertEqual(running['max'], 2)
+        self.assertIsNone(TestCase.cancel_event)
+
+    def test_run_tier_concurrency_blocking(self):
+        tests = self._get_tests(True, False, False, False)
+        self.tier.get_tests.return_value = tests
+        self.tier.get_concurrency.return_value = 4
+        self.runner.executed_test_cases.clear()
+        results = {'test0': TestCase.EX_TESTCASE_FAILED,
+                   'test1': TestCase.EX_OK, 'test3': TestCase.EX_OK}
+
+        async def arun_test(test):
+            if test.get_name() != 'test0':
+                # test1 stops in time, test2 is an isolated child killed
+                # and test3 ignores the cancellation
+                while not self.runner.cancel_event.is_set():
+                    await asyncio.sleep(0.01)
+                if test.get_name() == 'test2':
+                    raise run_tests.isolation.Cancelled('foo')
+                if test.get_name() == 'test3':
+                    self._run_test(results, self.runner)(test)
+                    await asyncio.sleep(10)
+            return self._run_test(results, self.runner)(test)
+
+        with mock.patch.object(self.runner, 'arun_test',
+                               side_effect=arun_test) as mock_run, \
+                mock.patch.object(run_tests.Runner, 'CANCEL_TIMEOUT', 0.5), \
+                self.assertRaises(run_tests.BlockingTestFailed):
+            self.runner.run_tier(self.tier)
+        self.assertEqual(mock_run.call_count, 4)
+        self.assertEqual(sorted(self.runner.cancelled_tests),
+                         ['test2', 'test3'])
+        self.assertEqual(sorted(self.runner.executed_test_cases),
+                         ['test0', 'test1'])
+        self.runner.journal.append.assert_called_with(
+            self.runner.executed_test_cases['test1'])
+        self.assertEqual(self.runner.overall_result,
+                         run_tests.Result.EX_ERROR)
+        self.assertIsNone(self.runner.cancel_event)
+        self.assertIsNone(TestCase.cancel_event)
+
+    def test_run_tier_dependencies(self):
+        tests = self._get_tests(
+            True, False, False, depends_on={'test0': ['test2'],
+                                            'test1': ['test0']})
+        self.tier.get_tests.return_value = tests
+        results = {'test0': TestCase.EX_TESTCASE_FAILED,
+                   'test1': TestCase.EX_OK, 'test2': TestCase.EX_OK}
+        with mock.patch('xtesting.ci.run_tests.Runner.run_test',
+                        side_effect=self._run_test(
+                            results, self.runner)) as mock_run:
+            self.assertEqual(self.runner.run_tier(self.tier),
+                             run_tests.Result.EX_ERROR)
+        mock_run.assert_has_calls([mock.call(tests[2]), mock.call(tests[0])])
+        self.assertEqual(mock_run.call_count, 2)
+
+    @mock.patch('xtesting.ci.run_tests.Runner.run_tier')
+    @mock.patch('xtesting.ci.run_tests.Runner.run_scheduled')
+    def test_run_all_dependencies(self, *args):
+        tests = self._get_tests(True, True, depends_on={'test0': ['test1']})
+        self.tier.get_tests.return_value = tests
+        self.tier.description = 'test_desc'
+        self.runner.tiers = self.tiers
+        self.runner.run_all()
+        self.assertEqual(
+            args[0].call_args[0][0].dependencies,
+            {'test0': ['test1'], 'test1': []})
+        args[1].assert_not_called()
+
+    @mock.patch('xtesting.ci.run_tests.isolation.run',
+                return_value=(TestCase.EX_OK, 'record'))
+    def test_run_test_isolated(self, *args):
+        test = self._get_tests(True)[0]
+        test.is_enabled.return_value = True
+        test.is_skipped.return_value = False
+        self.runner.isolate_flag = True
+        self.runner.tiers = mock.Mock()
+        self.runner.tiers.get_dict_by_test.return_value = {
+            'case_name': 'test0'}
+        self.assertEqual(self.runner.run_test(test), TestCase.EX_OK)
+        self.assertEqual(
+            self.runner.executed_test_cases['test0'], 'record')
+        args[0].assert_called_once_with(
+            run_tests._run_test_in_child, test, {'case_name': 'test0'},
+            {'clean_flag': True, 'push_flag': False,
+             'results_dir': self.runner.results_dir, 'cancel_event': None},
+            limits={}, cancel_event=None)
+
+    @mock.patch('xtesting.ci.run_tests.isolation.run',
+                side_effect=run_tests.isolation.IsolationError('foo'))
+    def test_run_test_isolated_ko(self, *args):
+        test = self._get_tests(True)[0]
+        self.assertEqual(self.runner.run_test_isolated(test),
+                         TestCase.EX_TESTCASE_FAILED)
+        record = self.runner.executed_test_cases['test0']
+        self.assertEqual(record.is_successful(), TestCase.EX_TESTCASE_FAILED)
+        self.assertEqual(record.details,
+                         {'reason': 'crash', 'message': 'foo'})
+        self.assertEqual(record.project_name, 'project')
+        args[0].assert_called_once_with(
+            run_tests._run_test_in_child, test, mock.ANY, mock.ANY,
+            limits={}, cancel_event=None)
+
+    @mock.patch('xtesting.ci.run_tests.isolation.run',
+                side_effect=run_tests.isolation.LimitExceeded(
+                    'timeout', 'foo'))
+    def test_run_test_limits(self, *args):
+        test = self._get_tests(True)[0]
+        test.is_enabled.return_value = True
+        test.is_skipped.return_value = False
+        test.get_limits.return_value = {'timeout': 1}
+        self.assertEqual(self.runner.run_test(test),
+                         TestCase.EX_TESTCASE_FAILED)
+        record = self.runner.executed_test_cases['test0']
+        self.assertEqual(record.details['reason'], 'timeout')
+        self.assertTrue(self.runner.check_test(test))
+        args[0].assert_called_once_with(
+            run_tests._run_test_in_child, test, mock.ANY, mock.ANY,
+            limits={'timeout': 1}, cancel_event=None)
+
+    @mock.patch('xtesting.ci.run_tests.isolation.run',
+                side_effect=run_tests.isolation.Cancelled('foo'))
+    def test_run_test_isolated_cancelled(self, *args):
+        test = self._get_tests(True)[0]
+        with self.assertRaises(run_tests.isolation.Cancelled):
+            self.runner.run_test_isolated(test)
+        self.assertNotIn('test0', self.runner.executed_test_cases)
+        args[0].assert_called_once_with(
+            run_tests._run_test_in_child, test, mock.ANY, mock.ANY,
+            limits={}, cancel_event=None)
+
+    @mock.patch('xtesting.ci.run_tests.isolation.run',
+                return_value=(TestCase.EX_TESTCASE_FAILED, None))
+    def test_run_test_isolated_not_loaded(self, *args):
+        test = self._get_tests(True)[0]
+        self.assertEqual(self.runner.run_test_isolated(test),
+                         TestCase.EX_TESTCASE_FAILED)
+        self.assertNotIn('test0', self.runner.executed_test_cases)
+        args[0].assert_called_once_with(
+            run_tests._run_test_in_child, test, mock.ANY, mock.ANY,
+            limits={}, cancel_event=None)
+
+    @mock.patch('xtesting.utils.config.configure_logging')
+    @mock.patch('xtesting.ci.run_tests.logging.getLogger',
+                return_value=mock.Mock(handlers=[]))
+    def test_run_test_in_child(self, *args):
+        test = self._get_tests(True)[0]
+        fake = FakeModule(case_name='test0')
+        fake.run()
+        flags = {'clean_flag': False, 'push_flag': True,
+                 'results_dir': '/foo', 'cancel_event': None}
+
+        def execute_test(runner, test):
+            self.assertEqual(runner.tiers.get_dict_by_test('test0'),
+                             {'case_name': 'test0'})
+            self.assertFalse(runner.clean_flag)
+            self.assertTrue(runner.push_flag)
+            self.assertEqual(TestCase.dir_results, '/foo')
+            runner.executed_test_cases[test.get_name()] = fake
+            return TestCase.EX_OK
+        with mock.patch.object(run_tests.Runner, 'execute_test',
+                               autospec=True, side_effect=execute_test), \
+                mock.patch.object(TestCase, 'dir_results'):
+            result, record = run_tests._run_test_in_child(
+                test, {'case_name': 'test0'}, flags)
+        self.assertEqual(result, TestCase.EX_OK)
+        self.assertEqual(record.case_name, 'test0')
+        self.assertEqual(record.is_successful(), TestCase.EX_OK)
+        args[0].assert_called_once_with('xtesting')
+        args[1].assert_called_once_with()
+        with mock.patch.object(run_tests.Runner, 'execute_test',
+                               return_value=TestCase.EX_TESTCASE_FAILED), \
+                mock.patch.object(TestCase, 'dir_results'):
+            self.assertEqual(
+                run_tests._run_test_in_child(
+                    test, {'case_name': 'test0'}, flags),
+                (TestCase.EX_TESTCASE_FAILED, None))
+
+    def test_get_scheduler(self):
+        tests = self._get_tests(True, True)
+        self.runner.history = mock.Mock()
+        self.runner.history.get.return_value = 1
+        self.assertEqual(self.runner.get_scheduler(tests).priorities, {})
+        self.runner.jobs = 2
+        self.assertEqual(self.runner.get_scheduler(tests).priorities,
+                         {'test0': 1, 'test1': 1})
+        self.assertTrue(
+            self.runner.get_scheduler(tests, fail_fast=True).fail_fast)
+        with mock.patch('xtesting.ci.run_tests.scheduler.get_capacity',
+                        return_value={'cpu': 4}):
+            self.assertEqual(
+                self.runner.get_scheduler(tests).capacity, {'cpu': 4})
+
+    def test_check_test_history(self):
+        self.runner.history = mock.Mock()
+        test = self._get_tests(True)[0]
+        test_case = mock.Mock(EX_TESTCASE_FAILED=TestCase.EX_TESTCASE_FAILED)
+        test_case.is_successful.return_value = TestCase.EX_OK
+        self.runner.executed_test_cases['test0'] = test_case
+        self.assertFalse(self.runner.check_test(test))
+        self.runner.history.update.assert_called_once_with(test_case)
+
+    def test_parse_default_duration(self):
+        self.assertEqual(
+            self.run_tests_parser.parse_args(['-d', '2'])['default_duration'],
+            2.0)
+
+    def test_set_shard(self):
+        self.runner.tiers = self.tiers
+        self.runner.set_shard(2, 2)
+        self.assertEqual(self.runner.shard, (2, 2))
+        self.assertEqual(self.runner.shard_tests, {'test2'})
+        self.assertEqual(
+            [test.get_name() for test in self.runner.get_tests(self.tier)],
+            ['test2'])
+
+    def _get_shards(self, durations, shard_durations=None):
+        tests = []
+        for name in ['test1', 'test2', 'test3', 'test4']:
+            test = mock.Mock()
+            test.get_name.return_value = name
+            test.get_depends_on.return_value = []
+            tests.append(test)
+        self.tier.get_tests.return_value = tests
+        runner = run_tests.Runner(tiers=self.tiers)
+        runner.history.durations = durations
+        runner.shard_durations = shard_durations
+        shards = []
+        for index in [1, 2]:
+            runner.set_shard(index, 2)
+            shards.append(runner.shard_tests)
+        return shards
+
+    def test_set_shard_histories(self):
+        # the local histories of the nodes differ after their first run
+        shards = self._get_shards({'test1': 100})
+        self.assertEqual(shards, self._get_shards({'test2': 100}))
+        self.assertEqual(shards, [{'test1', 'test3'}, {'test2', 'test4'}])
+
+    def test_set_shard_durations(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as hfile:
+            json.dump({'test3': 150, 'test4': 10}, hfile)
+            hfile.flush()
+            shards = self._get_shards({'test1': 100}, hfile.name)
+            self.assertEqual(
+                shards, self._get_shards({'test2': 100}, hfile.name))
+        self.assertEqual(shards, [{'test3'}, {'test1', 'test2', 'test4'}])
+
+    def test_select(self):
+        self.runner.tiers = self.tiers
+        self.tiers.select.return_value = ['test2']
+        self.assertTrue(self.runner.select('foo,tag:bar'))
+        self.tiers.select.assert_called_once_with('foo,tag:bar')
+        self.assertEqual(
+            [test.get_name() for test in self.runner.get_tests(self.tier)],
+            ['test2'])
+
+    def test_select_shard(self):
+        self.runner.tiers = self.tiers
+        self.runner.set_shard(1, 2)
+        self.tiers.select.return_value = ['test2']
+        self.assertTrue(self.runner.select('foo'))
+        self.assertEqual(self.runner.shard_tests, {'test2'})
+
+    def test_select_lazy(self):
+        self.runner.tiers = self.tiers
+        self.tiers.select.return_value = ['test2']
+        self.runner.select('foo')
+        self.tier.is_loaded.return_value = False
+        self.assertEqual(self.runner.get_tests(self.tier), [])
+        self.tier.get_tests.assert_not_called()
+        self.runner.selected_tests = None
+        self.assertEqual(len(self.runner.get_tests(self.tier)), 2)
+
+    def test_select_ko(self):
+        self.runner.tiers = self.tiers
+        self.tiers.select.side_effect = ValueError
+        self.assertFalse(self.runner.select('foo'))
+        self.assertIsNone(self.runner.selected_tests)
+
+    def test_run_tier_blocking(self):
+        tests = self._get_tests(True, False, False)
+        self.tier.get_tests.return_value = tests
+        results = {'test0': TestCase.EX_TESTCASE_FAILED}
+        with mock.patch('xtesting.ci.run_tests.Runner.run_test',
+                        side_effect=self._run_test(
+                            results, self.runner)) as mock_run, \
+                self.assertRaises(run_tests.BlockingTestFailed):
+            self.runner.run_tier(self.tier)
+        mock_run.assert_called_once_with(tests[0])
+        self.assertEqual(self.runner.cancelled_tests, ['test1', 'test2'])
+
+    @mock.patch('xtesting.ci.run_tests.Runner.run_test')
+    def test_run_tier_shard_empty(self, *args):
+        self.runner.shard_tests = {'test3'}
+        self.assertEqual(self.runner.run_tier(self.tier),
+                         run_tests.Result.EX_OK)
+        args[0].assert_not_called()
+
+    def test_get_summary_rows(self):
+        self.runner.tiers = mock.Mock()
+        self.runner.tiers.get_tiers.return_value = [self.tier]
+        self.runner.tiers.get_tier_name.return_value = 'test_tier'
+        skipped = mock.Mock()
+        skipped.get_name.return_value = 'test3'
+        skipped.get_project.return_value = 'project'
+        self.tier.get_skipped_test.return_value = [skipped]
+        self.tier.get_tests.return_value[1].get_project.return_value = (
+            'project')
+        self.runner.executed_test_cases = {'test1': mock.Mock(
+            case_name='test1', project_name='project', is_skipped=False,
+            EX_OK=TestCase.EX_OK)}
+        self.runner.executed_test_cases['test1'].is_successful.return_value = (
+            TestCase.EX_OK)
+        self.runner.executed_test_cases[
+            'test1'].get_duration.return_value = '00:01'
+        self.assertEqual(self.runner.get_summary_rows(), [
+            ['test1', 'project', 'test_tier', '00:01', 'PASS'],
+            ['test2', 'project', 'test_tier', '00:00', 'SKIP'],
+            ['test3', 'project', 'test_tier', '00:00', 'SKIP']])
+        self.runner.cancelled_tests = ['test2']
+        self.assertEqual(
+            self.runner.get_summary_rows()[1],
+            ['test2', 'project', 'test_tier', '00:00', 'CANCELLED'])
+        self.runner.selected_tests = {'test1'}
+        self.assertEqual(self.runner.get_summary_rows(), [
+            ['test1', 'project', 'test_tier', '00:01', 'PASS']])
+
+    @mock.patch('xtesting.ci.shard.dump')
+    @mock.patch('xtesting.ci.run_tests.Runner.set_shard')
+    @mock.patch('xtesting.ci.run_tests.Runner.source_envfile')
+    @mock.patch('xtesting.ci.run_tests.Runner.run_all')
+    @mock.patch('xtesting.ci.run_tests.Runner.summary')
+    def test_main_shard(self, *args):
+        self.runner.tiers = mock.Mock()
+        self.runner.tiers.configure_mock(**{
+            'get_tier.return_value': None, 'get_test.return_value': None,
+            'get_tiers.return_value': []})
+
+        def set_shard(index, count):
+            self.runner.shard = (index, count)
+        args[3].side_effect = set_shard
+        self.assertEqual(self.runner.main(test='all', shard=(1, 2),
+                                          durations='/foo.json'),
+                         run_tests.Result.EX_OK)
+        args[3].assert_called_once_with(1, 2)
+        self.assertEqual(self.runner.shard_durations, '/foo.json')
+        args[4].assert_called_once_with(
+            self.runner.results_dir, (1, 2), os.EX_OK, [])
+
+    @mock.patch('xtesting.ci.run_tests.Runner.run_matrix',
+                return_value=run_tests.Result.EX_OK)
+    @mock.patch('xtesting.ci.run_tests.Runner.source_envfile')
+    def test_main_matrix(self, *args):
+        self.assertEqual(
+            self.runner.main(test='all', matrix=[{'FOO': 'foo'}]),
+            run_tests.Result.EX_OK)
+        args[0].assert_not_called()
+        args[1].assert_called_once_with(test='all', matrix=[{'FOO': 'foo'}])
+
+    @mock.patch('xtesting.ci.run_tests.preload_modules')
+    @mock.patch('xtesting.ci.run_tests.Runner.source_envfile')
+    def test_run_matrix(self, *args):
+        self.runner.tiers = mock.Mock()
+        self.runner.tiers.evaluate.return_value = [['test1'], []]
+        result = {'scenario': 'foo', 'result': 0, 'testcases': [
+            ['test1', 'p', 't', '00:01', 'PASS']]}
+        with mock.patch('xtesting.ci.run_tests.matrix.run',
+                        return_value=[result, None]) as mock_run:
+            self.assertEqual(
+                self.runner.run_matrix(
+                    test='all', matrix=[{'FOO': 'foo'}, {'FOO': 'bar'}]),
+                run_tests.Result.EX_ERROR)
+        mock_run.assert_called_once_with(
+            [{'FOO': 'foo'}, {'FOO': 'bar'}], mock.ANY)
+        self.assertEqual(mock_run.call_args[0][1].keywords, {'test': 'all'})
+        self.assertEqual(
+            len(self.runner.tiers.evaluate.call_args[0][0]), 2)
+        args[0].assert_called_once_with()
+        args[1].assert_called_once_with()
+
+    @mock.patch('xtesting.ci.run_tests.Runner.main',
+                return_value=run_tests.Result.EX_OK)
+    def test_run_scenario(self, mock_main):
+        tmpdir = tempfile.mkdtemp()
+        self.runner.tiers = mock.Mock()
+        self.runner.tiers.get_tier.return_value = None
+        self.runner.tiers.get_test.return_value = None
+        with mock.patch('xtesting.ci.matrix.constants.RESULTS_DIR',
+                        tmpdir), \
+                mock.patch.object(TestCase, 'dir_results', None), \
+                mock.patch.dict(os.environ, {'FOO': 'bar'}), \
+                mock.patch.object(self.runner, 'get_summary_rows',
+                                  return_value=[['test1']]):
+            self.assertEqual(
+                self.runner.run_scenario('foo', {'FOO': 'foo'}, test='all'),
+                run_tests.Result.EX_OK)
+            self.assertEqual(os.environ['FOO'], 'foo')
+            self.assertEqual(TestCase.dir_results,
+                             os.path.join(tmpdir, 'foo'))
+        self.runner.tiers.generate_tiers.assert_called_once_with()
+        mock_main.assert_called_once_with(test='all')
+        self.assertEqual(self.runner.overlay, {'FOO': 'foo'})
+        self.assertEqual(self.runner.journal.filename,
+                         os.path.join(tmpdir, 'foo', 'journal.jsonl'))
+        self.assertEqual(self.runner.history.filename,
+                         os.path.join(tmpdir, 'foo', 'durations.json'))
+        with open(os.path.join(tmpdir, 'foo', 'matrix.json'),
+                  encoding='utf-8') as rfile:
+            self.assertEqual(json.load(rfile)['testcases'], [['test1']])
+        shutil.rmtree(tmpdir)
+
+    @mock.patch('xtesting.ci.run_tests.matrix.dump')
+    @mock.patch('xtesting.ci.run_tests.Runner.main',
+                return_value=run_tests.Result.EX_OK)
+    def test_run_scenario_test(self, *args):
+        self.runner.tiers = mock.Mock()
+        self.runner.tiers.get_tier.return_value = None
+        with mock.patch('os.makedirs'), \
+                mock.patch.object(TestCase, 'dir_results', None), \
+                mock.patch.dict(os.environ, {}), \
+                mock.patch.object(self.runner, 'get_summary_rows',
+                                  return_value=[['test1'], ['test2']]):
+            self.runner.run_scenario('foo', {}, test='test1')
+        args[1].assert_called_once_with('foo', {}, 0, [['test1']])
+
+    def test_parse_shard(self):
+        self.assertEqual(
+            self.run_tests_parser.parse_args(['-s', '1/2'])['shard'], (1, 2))
+        self.assertIsNone(self.run_tests_parser.parse_args([])['shard'])
+
+    def test_parse_durations(self):
+        self.assertEqual(self.run_tests_parser.parse_args(
+            ['--durations', '/foo.json'])['durations'], '/foo.json')
+        self.assertIsNone(self.run_tests_parser.parse_args([])['durations'])
+
+    @mock.patch('xtesting.ci.run_tests.Runner.get_run_dict')
+    def test_run_test_journaled(self, *args):
+        test = self._get_tests(True)[0]
+        test.is_enabled.return_value = True
+        test.is_skipped.return_value = False
+        record = mock.Mock()
+        record.is_successful.return_value = TestCase.EX_OK
+        self.runner.journal.get_test_case.return_value = record
+        self.assertEqual(self.runner.run_test(test), TestCase.EX_OK)
+        self.assertEqual(self.runner.executed_test_cases['test0'], record)
+        self.runner.journal.get_test_case.assert_called_once_with('test0')
+        args[0].assert_not_called()
+
+    def test_record(self):
+        self.runner.history = mock.Mock()
+        self.runner.publisher = mock.Mock()
+        self.runner.record('test_case')
+        self.runner.history.update.assert_called_once_with('test_case')
+        self.runner.journal.append.assert_called_once_with('test_case')
+        self.runner.publisher.submit.assert_not_called()
+
+    def test_record_report(self):
+        self.runner.history = mock.Mock()
+        self.runner.publisher = mock.Mock()
+        self.runner.report_flag = True
+        test_cases = [mock.Mock(case_name='test1', is_skipped=False),
+                      mock.Mock(case_name='test2', is_skipped=True),
+                      mock.Mock(case_name='test3', is_skipped=False)]
+        self.runner.journal.get_test_case.side_effect = [None, 'record']
+        for test_case in test_cases:
+            self.runner.record(test_case)
+        self.runner.publisher.submit.assert_called_once_with(test_cases[0])
+        self.assertEqual(self.runner.journal.append.call_count, 3)
+
+    @mock.patch('xtesting.ci.run_tests.LOGGER.info')
+    def test_summary_report(self, mock_method):
+        self.runner.report_flag = True
+        self.runner.publisher.statuses = {'test1': 'OK'}
+        with mock.patch.object(self.runner, 'get_summary_rows', return_value=[
+                ['test1', 'p', 't', '00:01', 'PASS'],
+                ['test2', 'p', 't', '00:00', 'SKIP']]):
+            self.runner.summary()
+        msg = str(mock_method.call_args[0][1])
+        self.assertIn('PUSH', msg)
+        self.assertIn('OK', msg)
+
+    @mock.patch('xtesting.ci.run_tests.Runner.source_envfile')
+    @mock.patch('xtesting.ci.run_tests.Runner.run_all')
+    @mock.patch('xtesting.ci.run_tests.Runner.summary')
+    def test_main_resume(self, *args):
+        self.runner.tiers = mock.Mock()
+        self.runner.tiers.configure_mock(**{
+            'get_tier.return_value': None, 'get_test.return_value': None})
+        self.assertEqual(self.runner.main(test='all', resume=True),
+                         run_tests.Result.EX_OK)
+        self.runner.journal.load.assert_called_once_with()
+        args[1].assert_called_once_with()
+
+    def test_parse_resume(self):
+        self.assertTrue(
+            self.run_tests_parser.parse_args(['--resume'])['resume'])
+        self.assertFalse(self.run_tests_parser.parse_args([])['resume'])
+
+    def test_parse_jobs(self):
+        self.assertEqual(
+            self.run_tests_parser.parse_args(['-j', '4'])['jobs'], 4)
+        self.assertEqual(self.run_tests_parser.parse_args([])['jobs'], 1)
+
     @mock.patch('xtesting.ci.run_tests.LOGGER.info')
     @mock.patch('xtesting.ci.run_tests.Runner.run_tier')
     @mock.patch('xtesting.ci.run_tests.Runner.summary')
@@ -244,8 +1142,10 @@ class RunTestsTesting(unittest.TestCase):
         mock_tier = mock.Mock()
         test_mock = mock.Mock()
         test_mock.get_name.return_value = 'test1'
+        test_mock.get_depends_on.return_value = []
         args = {'get_name.return_value': 'tier_name',
-                'get_tests.return_value': [test_mock]}
+                'get_tests.return_value': [test_mock],
+                'get_concurrency.return_value': 1}
         mock_tier.configure_mock(**args)
         kwargs = {'test': 'tier_name', 'noclean': True, 'report': True}
         args = {'get_tier.return_value': mock_tier,
@@ -260,15 +1160,41 @@ class RunTestsTesting(unittest.TestCase):
     @mock.patch('xtesting.ci.run_tests.Runner.run_test',
                 return_value=TestCase.EX_OK)
     def test_main_test(self, *mock_methods):
-        kwargs = {'test': 'test_name', 'noclean': True, 'report': True}
+        kwargs = {'test': 'test_name', 'noclean': True, 'report': True,
+                  'default_duration': 2.0}
         args = {'get_tier.return_value': None,
                 'get_test.return_value': 'test_name'}
         self.runner.tiers = mock.Mock()
+        self.runner.history = mock.Mock()
+        self.runner.publisher = mock.Mock()
+        test_case = mock.Mock(is_skipped=False)
+        self.runner.executed_test_cases['test_name'] = test_case
         mock_methods[1].return_value = self.creds
         self.runner.tiers.configure_mock(**args)
         self.assertEqual(self.runner.main(**kwargs),
                          run_tests.Result.EX_OK)
         mock_methods[0].assert_called_once_with('test_name')
+        self.runner.history.update.assert_called_once_with(test_case)
+        self.runner.history.save.assert_called_once_with()
+        self.runner.publisher.submit.assert_called_once_with(test_case)
+        self.runner.publisher.flush.assert_called_once_with()
+        self.assertEqual(self.runner.history.default, 2.0)
+
+    @mock.patch('xtesting.ci.run_tests.Runner.source_envfile')
+    @mock.patch('xtesting.ci.run_tests.Runner.run_all')
+    @mock.patch('xtesting.ci.run_tests.Runner.summary')
+    def test_main_selection(self, *args):
+        self.runner.tiers = mock.Mock()
+        self.runner.tiers.configure_mock(**{
+            'get_tier.return_value': None, 'get_test.return_value': None,
+            'select.return_value': ['test1', 'test2']})
+        self.assertEqual(
+            self.runner.main(test='test1,tag:foo', noclean=True,
+                             report=True),
+            run_tests.Result.EX_OK)
+        self.assertEqual(self.runner.selected_tests, {'test1', 'test2'})
+        args[0].assert_called_once_with(None)
+        args[1].assert_called_once_with()
 
     @mock.patch('xtesting.ci.run_tests.Runner.source_envfile')
     @mock.patch('xtesting.ci.run_tests.Runner.run_all')
@@ -285,16 +1211,79 @@ class RunTestsTesting(unittest.TestCase):
         args[1].assert_called_once_with()
         args[2].assert_called_once_with()
 
+    @mock.patch('xtesting.ci.run_tests.LOGGER.error')
     @mock.patch('xtesting.ci.run_tests.Runner.source_envfile')
     def test_main_any_tier_test_ko(self, *args):
         kwargs = {'get_tier.return_value': None,
                   'get_test.return_value': None}
         self.runner.tiers = mock.Mock()
         self.runner.tiers.configure_mock(**kwargs)
+        for test in ['any', None]:
+            args[1].reset_mock()
+            self.assertEqual(
+                self.runner.main(test=test, noclean=True, report=True),
+                run_tests.Result.EX_ERROR)
+            args[1].assert_called_once_with(
+                mock.ANY, test, mock.ANY)
+        self.runner.tiers.select.assert_not_called()
+        self.assertEqual(args[0].call_count, 2)
+
+    @mock.patch('xtesting.ci.run_tests.LOGGER.error')
+    @mock.patch('xtesting.ci.run_tests.Runner.source_envfile')
+    @mock.patch('xtesting.ci.run_tests.Runner.run_all')
+    def test_main_selection_ko(self, *args):
+        self.runner.tiers = mock.Mock()
+        self.runner.tiers.configure_mock(**{
+            'get_tier.return_value': None, 'get_test.return_value': None,
+            'select.side_effect': ValueError('foo matches nothing')})
         self.assertEqual(
-            self.runner.main(test='any', noclean=True, report=True),
+            self.runner.main(test='foo,bar', noclean=True, report=True),
             run_tests.Result.EX_ERROR)
-        args[0].assert_called_once_with()
+        args[0].assert_not_called()
+        args[2].assert_called_once_with('%s', mock.ANY)
+
+    @mock.patch('xtesting.ci.run_tests.Runner.main',
+                return_value=run_tests.Result.EX_OK)
+    def test_run_request(self, mock_main):
+        tiers = mock.Mock()
+        self.assertEqual(
+            run_tests.run_request(tiers, ['-t', 'test1', '-r']),
+            run_tests.Result.EX_OK.value)
+        tiers.generate_tiers.assert_called_once_with()
+        kwargs = mock_main.call_args[1]
+        self.assertNotIn('serve', kwargs)
+        self.assertEqual(kwargs['test'], 'test1')
+        self.assertTrue(kwargs['report'])
+
+    @mock.patch('xtesting.ci.run_tests.Runner.main')
+    def test_run_request_ko(self, mock_main):
+        with self.assertRaises(SystemExit):
+            run_tests.run_request(mock.Mock(), ['--foo'])
+        mock_main.assert_not_called()
+
+    @mock.patch('xtesting.ci.run_tests.daemon.serve', return_value=0)
+    @mock.patch('xtesting.ci.run_tests.tier_builder.TierBuilder')
+    @mock.patch('xtesting.ci.run_tests.importlib.import_module',
+                side_effect=[None, ImportError])
+    @mock.patch('xtesting.ci.run_tests.isolation.get_preloaded_modules',
+                return_value=['foo', 'bar'])
+    def test_serve(self, *args):
+        self.assertEqual(run_tests.serve(), 0)
+        args[1].assert_has_calls([mock.call('foo'), mock.call('bar')])
+        args[2].assert_called_once_with(mock.ANY)
+        handler = args[3].call_args[0][0]
+        self.assertEqual(handler.func, run_tests.run_request)
+        self.assertEqual(handler.args, (args[2].return_value, ))
+
+    @mock.patch('xtesting.ci.run_tests.serve', return_value=0)
+    @mock.patch('xtesting.ci.run_tests.Runner')
+    @mock.patch('xtesting.utils.config.configure_logging')
+    @mock.patch('os.makedirs')
+    def test_main_serve(self, *args):
+        with mock.patch('sys.argv', ['run_tests', '--serve']):
+            self.assertEqual(run_tests.main(), 0)
+        args[2].assert_not_called()
+        args[3].assert_called_once_with()
 
 
 if __name__ == "__main__":
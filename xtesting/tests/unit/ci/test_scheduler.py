@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+# pylint: disable=missing-docstring
+
+import logging
+import unittest
+
+import mock
+
+from xtesting.ci import scheduler
+from xtesting.ci import tier_handler
+
+
+class SchedulerTesting(unittest.TestCase):
+
+    @staticmethod
+    def _get_test(name, depends_on=None, resources=None):
+        return tier_handler.TestCase(
+            name, True, False, 100, True, depends_on=depends_on,
+            resources=resources)
+
+    def setUp(self):
+        self.tests = [
+            self._get_test('setup'),
+            self._get_test('check', depends_on=['setup']),
+            self._get_test('healthcheck'),
+            self._get_test('smoke', depends_on=['check']),
+            self._get_test('other', depends_on=['missing'])]
+        self.scheduler = scheduler.Scheduler(self.tests)
+
+    @staticmethod
+    def _get_names(tests):
+        return [test.get_name() for test in tests]
+
+    def test_dependencies(self):
+        self.assertEqual(self.scheduler.dependencies, {
+            'setup': [], 'check': ['setup'], 'healthcheck': [],
+            'smoke': ['check'], 'other': []})
+        self.assertEqual(self.scheduler.dependents['setup'], ['check'])
+
+    def test_cycle(self):
+        with self.assertRaises(ValueError):
+            scheduler.Scheduler([
+                self._get_test('foo', depends_on=['bar']),
+                self._get_test('bar', depends_on=['foo'])])
+
+    def test_get_ready_tests(self):
+        self.assertEqual(
+            self._get_names(self.scheduler.get_ready_tests()),
+            ['setup', 'healthcheck', 'other'])
+        self.assertEqual(self.scheduler.get_ready_tests(), [])
+        self.scheduler.set_finished('setup')
+        self.assertEqual(
+            self._get_names(self.scheduler.get_ready_tests()), ['check'])
+
+    def test_get_ready_tests_limit(self):
+        self.assertEqual(
+            self._get_names(self.scheduler.get_ready_tests(1)), ['setup'])
+        self.assertEqual(
+            self._get_names(self.scheduler.get_ready_tests(1)),
+            ['healthcheck'])
+
+    def test_topological_order(self):
+        order = []
+        while not self.scheduler.is_finished():
+            for test in self.scheduler.get_ready_tests(1):
+                order.append(test.get_name())
+                self.scheduler.set_finished(test.get_name())
+        self.assertEqual(
+            order, ['setup', 'check', 'healthcheck', 'smoke', 'other'])
+
+    def test_longest_first(self):
+        durations = {'setup': 1, 'check': 1, 'healthcheck': 5,
+                     'smoke': 10, 'other': 3}
+        self.scheduler = scheduler.Scheduler(
+            self.tests, durations=durations.get)
+        self.assertEqual(self.scheduler.priorities['setup'], 12)
+        self.assertEqual(
+            self._get_names(self.scheduler.get_ready_tests(2)),
+            ['setup', 'healthcheck'])
+        self.assertEqual(
+            self._get_names(self.scheduler.get_ready_tests()), ['other'])
+
+    def test_packing(self):
+        tests = [
+            self._get_test('big', resources={'cpu': 3, 'mem': 1024}),
+            self._get_test('medium', resources={'cpu': 2}),
+            self._get_test('small', resources={'cpu': 1, 'mem': 1024}),
+            self._get_test('light')]
+        self.scheduler = scheduler.Scheduler(
+            tests, capacity={'cpu': 4, 'mem': 1024})
+        self.assertEqual(
+            self._get_names(self.scheduler.get_ready_tests()),
+            ['big', 'light'])
+        self.assertEqual(self.scheduler.used, {'cpu': 3, 'mem': 1024})
+        self.scheduler.set_finished('big')
+        self.assertEqual(
+            self._get_names(self.scheduler.get_ready_tests()),
+            ['medium', 'small'])
+        self.assertEqual(self.scheduler.used, {'cpu': 3, 'mem': 1024})
+
+    def test_packing_oversized(self):
+        tests = [self._get_test('huge', resources={'cpu': 16}),
+                 self._get_test('small', resources={'cpu': 1})]
+        self.scheduler = scheduler.Scheduler(tests, capacity={'cpu': 4})
+        self.assertEqual(
+            self._get_names(self.scheduler.get_ready_tests()), ['huge'])
+        self.assertEqual(self.scheduler.get_ready_tests(), [])
+        self.scheduler.set_finished('huge')
+        self.assertEqual(
+            self._get_names(self.scheduler.get_ready_tests()), ['small'])
+
+    def test_locks(self):
+        tests = [self._get_test('foo', resources={'locks': ['tgen']}),
+                 self._get_test('bar', resources={'locks': ['admin', 'tgen']}),
+                 self._get_test('baz', resources={'locks': ['admin']})]
+        self.scheduler = scheduler.Scheduler(tests)
+        self.assertEqual(
+            self._get_names(self.scheduler.get_ready_tests()),
+            ['foo', 'baz'])
+        self.assertEqual(self.scheduler.locks, {'tgen': 'foo', 'admin': 'baz'})
+        self.scheduler.set_finished('foo')
+        self.assertEqual(self.scheduler.get_ready_tests(), [])
+        self.scheduler.set_cancelled('baz')
+        self.assertEqual(
+            self._get_names(self.scheduler.get_ready_tests()), ['bar'])
+        self.scheduler.set_finished('bar')
+        self.assertEqual(self.scheduler.locks, {})
+        self.assertTrue(self.scheduler.is_finished())
+
+    @mock.patch('os.sysconf', side_effect=[4096, 1024])
+    @mock.patch('os.cpu_count', return_value=None)
+    def test_get_capacity(self, *args):
+        self.assertEqual(scheduler.get_capacity(),
+                         {'cpu': 1, 'mem': 4096 * 1024})
+        args[0].assert_called_once_with()
+        args[1].assert_has_calls(
+            [mock.call('SC_PAGE_SIZE'), mock.call('SC_PHYS_PAGES')])
+
+    def test_blocking_failure(self):
+        self.scheduler.get_ready_tests()
+        self.scheduler.set_finished('setup', blocking_failure=True)
+        self.assertEqual(self.scheduler.cancelled, ['check', 'smoke'])
+        self.assertEqual(self.scheduler.pending, [])
+        self.assertFalse(self.scheduler.is_finished())
+        self.scheduler.set_finished('healthcheck')
+        self.scheduler.set_finished('other')
+        self.assertTrue(self.scheduler.is_finished())
+
+    def test_blocking_failure_fail_fast(self):
+        self.scheduler.fail_fast = True
+        self.scheduler.get_ready_tests(1)
+        self.scheduler.set_finished('setup', blocking_failure=True)
+        self.assertEqual(
+            self.scheduler.cancelled,
+            ['check', 'healthcheck', 'smoke', 'other'])
+        self.assertTrue(self.scheduler.is_finished())
+
+    def test_set_cancelled(self):
+        self.scheduler.fail_fast = True
+        self.scheduler.get_ready_tests(2)
+        self.scheduler.set_finished('setup', blocking_failure=True)
+        self.assertFalse(self.scheduler.is_finished())
+        self.scheduler.set_cancelled('healthcheck')
+        self.assertEqual(
+            self.scheduler.cancelled,
+            ['check', 'smoke', 'other', 'healthcheck'])
+        self.assertTrue(self.scheduler.is_finished())
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    unittest.main(verbosity=2)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+# pylint: disable=missing-docstring
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from xtesting.ci import shard
+from xtesting.ci import tier_handler
+
+
+class ShardTesting(unittest.TestCase):
+
+    def setUp(self):
+        self.tests = [
+            tier_handler.TestCase('a', True, False, 100, True),
+            tier_handler.TestCase('b', True, False, 100, True,
+                                  depends_on=['a']),
+            tier_handler.TestCase('c', True, False, 100, True),
+            tier_handler.TestCase('d', True, False, 100, True),
+            tier_handler.TestCase('e', True, False, 100, True,
+                                  depends_on=['b', 'missing'])]
+        self.durations = {'a': 1, 'b': 2, 'c': 5, 'd': 2, 'e': 1}
+
+    def test_parse_shard(self):
+        self.assertEqual(shard.parse_shard('2/3'), (2, 3))
+
+    def test_parse_shard_ko(self):
+        for value in ['0/3', '4/3', '1', 'a/b', '1/2/3']:
+            with self.assertRaises(argparse.ArgumentTypeError):
+                shard.parse_shard(value)
+
+    def test_get_groups(self):
+        self.assertEqual(shard.get_groups(self.tests),
+                         [['a', 'b', 'e'], ['c'], ['d']])
+
+    def test_split(self):
+        self.assertEqual(
+            shard.split(self.tests, 2, self.durations.get),
+            [['c'], ['a', 'b', 'e', 'd']])
+
+    def test_split_default(self):
+        self.assertEqual(
+            shard.split(self.tests, 3, lambda name: 1),
+            [['a', 'b', 'e'], ['c'], ['d']])
+        self.assertEqual(
+            shard.split(self.tests, 4, lambda name: 1)[3], [])
+        self.assertEqual(shard.split(self.tests, 3),
+                         shard.split(self.tests, 3, lambda name: 1))
+
+    def test_split_deterministic(self):
+        self.assertEqual(
+            shard.split(self.tests, 2, self.durations.get),
+            shard.split(list(self.tests), 2, dict(self.durations).get))
+
+    def test_merge(self):
+        results = [
+            {'result': 0, 'testcases': [
+                ['a', 'p', 't', '00:01', 'PASS'],
+                ['b', 'p', 't', '00:00', 'SKIP']]},
+            {'result': 0, 'testcases': [
+                ['b', 'p', 't', '00:02', 'PASS'],
+                ['a', 'p', 't', '00:00', 'SKIP']]}]
+        self.assertEqual(shard.merge(results), (
+            [['a', 'p', 't', '00:01', 'PASS'],
+             ['b', 'p', 't', '00:02', 'PASS']], False))
+
+    def test_merge_failed(self):
+        self.assertTrue(shard.merge([
+            {'result': 0, 'testcases': [['a', 'p', 't', '00:01', 'FAIL']]}
+        ])[1])
+        self.assertTrue(shard.merge([{'result': -1, 'testcases': []}])[1])
+
+
+class DumpTesting(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_dump(self):
+        shard.dump(self.tmpdir, (1, 2), 0, [['test1']])
+        with open(os.path.join(self.tmpdir, 'shard1of2.json'),
+                  encoding='utf-8') as rfile:
+            self.assertEqual(json.load(rfile), {
+                'shard': [1, 2], 'result': 0, 'testcases': [['test1']]})
+
+    @mock.patch('xtesting.ci.shard.LOGGER.exception')
+    def test_dump_ko(self, *args):
+        shard.dump(os.path.join(self.tmpdir, 'foo'), (1, 2), 0, [])
+        args[0].assert_called_once_with(
+            "Cannot dump the results in %s",
+            os.path.join(self.tmpdir, 'foo', 'shard1of2.json'))
+
+    def test_main(self):
+        files = []
+        for i, result in enumerate(['PASS', 'FAIL']):
+            files.append(os.path.join(self.tmpdir, f'shard{i}.json'))
+            with open(files[-1], 'w', encoding='utf-8') as rfile:
+                json.dump({'result': 0, 'testcases': [
+                    [f'test{i}', 'project', 'tier', '00:01', result]]},
+                    rfile)
+        with mock.patch('sys.argv', ['merge_results'] + files), \
+                mock.patch('builtins.print') as mock_print:
+            self.assertEqual(shard.main(), os.EX_SOFTWARE)
+        self.assertIn('test1', mock_print.call_args_list[0][0][0])
+        with mock.patch('sys.argv', ['merge_results'] + files[:1]), \
+                mock.patch('builtins.print'):
+            self.assertEqual(shard.main(), os.EX_OK)
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    unittest.main(verbosity=2)
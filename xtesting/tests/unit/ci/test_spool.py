@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+# pylint: disable=missing-docstring
+
+import json
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from xtesting.ci import isolation
+from xtesting.ci import spool
+from xtesting.core import testcase
+
+
+class SpoolTesting(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'spool.jsonl')
+        self.spool = spool.Spool(self.filename)
+        self.records = []
+        for name in ['foo', 'bar', 'baz']:
+            record = isolation.ExecutedTestCase(
+                case_name=name, project_name='xtesting')
+            record.start_time = 1
+            record.stop_time = 2
+            self.records.append(record)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _add(self):
+        with mock.patch.dict(os.environ, {'BUILD_TAG': 'foo'}):
+            return [self.spool.add(record) for record in self.records]
+
+    def test_overlay(self):
+        with mock.patch.dict(os.environ, {'FOO': 'foo', 'BAR': 'bar'}):
+            with spool.overlay({'FOO': 'baz', 'BAR': None, 'QUX': 'qux'}):
+                self.assertEqual(os.environ['FOO'], 'baz')
+                self.assertNotIn('BAR', os.environ)
+                self.assertEqual(os.environ['QUX'], 'qux')
+            self.assertEqual(os.environ['FOO'], 'foo')
+            self.assertEqual(os.environ['BAR'], 'bar')
+            self.assertNotIn('QUX', os.environ)
+
+    def test_add(self):
+        uids = self._add()
+        self.assertEqual(len(set(uids)), 3)
+        with open(self.filename, encoding='utf-8') as sfile:
+            data = json.loads(sfile.readline())
+        self.assertEqual(data['id'], uids[0])
+        self.assertEqual(data['record']['case_name'], 'foo')
+        self.assertEqual(data['env']['BUILD_TAG'], 'foo')
+        self.assertIn('TEST_DB_URL', data['env'])
+
+    @mock.patch('xtesting.ci.spool.LOGGER.exception')
+    def test_add_ko(self, mock_method):
+        self.spool.filename = os.path.join(self.tmpdir, 'foo', 'spool.jsonl')
+        self.assertIsNone(self.spool.add(self.records[0]))
+        self.spool.ack('foo')
+        self.assertEqual(mock_method.call_count, 2)
+
+    def test_get_unacked(self):
+        uids = self._add()
+        self.spool.ack(uids[1])
+        with open(self.filename, 'a', encoding='utf-8') as sfile:
+            sfile.write('{"id": ')
+        self.assertEqual(
+            [data['id'] for data in self.spool.get_unacked()],
+            [uids[0], uids[2]])
+
+    def test_get_unacked_none(self):
+        self.assertEqual(self.spool.get_unacked(), [])
+
+    def test_compact(self):
+        uids = self._add()
+        self.spool.ack(uids[0])
+        other = spool.Spool(self.filename)
+        other.ack(uids[2])
+        self.spool.compact()
+        with open(self.filename, encoding='utf-8') as sfile:
+            self.assertEqual([json.loads(line)['id'] for line in sfile],
+                             [uids[1]])
+        self.assertFalse(os.path.exists(f'{self.filename}.tmp'))
+        uid = other.add(self.records[0])
+        self.assertEqual(
+            [data['id'] for data in self.spool.get_unacked()],
+            [uids[1], uid])
+
+    def test_compact_none(self):
+        self.spool.compact()
+        self.assertFalse(os.path.exists(self.filename))
+
+    @mock.patch('os.replace', side_effect=OSError)
+    @mock.patch('xtesting.ci.spool.LOGGER.exception')
+    def test_compact_ko(self, *args):
+        uids = self._add()
+        self.spool.compact()
+        args[0].assert_called_once_with("Cannot compact %s", self.filename)
+        self.assertEqual(
+            [data['id'] for data in self.spool.get_unacked()], uids)
+
+    @mock.patch('xtesting.ci.isolation.ExecutedTestCase.push_to_db',
+                return_value=testcase.TestCase.EX_OK)
+    def test_replay(self, mock_method):
+        self._add()
+        with mock.patch.dict(os.environ, {'BUILD_TAG': 'bar'}):
+            mock_method.side_effect = lambda: self.assertEqual(
+                os.environ['BUILD_TAG'], 'foo') or testcase.TestCase.EX_OK
+            self.assertEqual(self.spool.replay(), (3, 0))
+            self.assertEqual(os.environ['BUILD_TAG'], 'bar')
+        self.assertEqual(mock_method.call_count, 3)
+        self.assertEqual(self.spool.get_unacked(), [])
+        self.assertEqual(os.path.getsize(self.filename), 0)
+
+    @mock.patch('time.sleep')
+    @mock.patch('xtesting.ci.isolation.ExecutedTestCase.push_to_db',
+                side_effect=[testcase.TestCase.EX_OK,
+                             testcase.TestCase.EX_PUSH_TO_DB_ERROR,
+                             testcase.TestCase.EX_OK,
+                             testcase.TestCase.EX_PUSH_TO_DB_ERROR,
+                             testcase.TestCase.EX_PUSH_TO_DB_ERROR,
+                             testcase.TestCase.EX_PUSH_TO_DB_ERROR])
+    def test_replay_ko(self, *args):
+        uids = self._add()
+        self.assertEqual(self.spool.replay(attempts=3, backoff=2), (2, 1))
+        self.assertEqual(args[0].call_count, 6)
+        args[1].assert_has_calls([
+            mock.call(2), mock.call(2), mock.call(4)])
+        self.assertEqual(
+            [data['id'] for data in self.spool.get_unacked()], uids[2:])
+
+    def test_pickle(self):
+        copy = pickle.loads(pickle.dumps(self.spool))
+        self.assertEqual(copy.filename, self.filename)
+        copy.ack('foo')
+        self.assertEqual(self.spool.get_unacked(), [])
+
+
+class MainTesting(unittest.TestCase):
+
+    @mock.patch('xtesting.utils.config.configure_logging')
+    @mock.patch('xtesting.ci.spool.Spool.replay', return_value=(1, 0))
+    def test_main(self, *args):
+        with mock.patch('sys.argv', ['replay_spool']):
+            self.assertEqual(spool.main(), os.EX_OK)
+        args[0].assert_called_once_with(5, 1.0)
+        args[1].assert_called_once_with()
+
+    @mock.patch('xtesting.utils.config.configure_logging')
+    @mock.patch('xtesting.ci.spool.Spool.replay', return_value=(0, 1))
+    def test_main_ko(self, *args):
+        with mock.patch('sys.argv', ['replay_spool', '--attempts', '2',
+                                     '--backoff', '0.5']):
+            self.assertEqual(spool.main(), os.EX_SOFTWARE)
+        args[0].assert_called_once_with(2, 0.5)
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    unittest.main(verbosity=2)
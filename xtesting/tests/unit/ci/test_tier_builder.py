@@ -9,6 +9,8 @@
 
 import logging
 import os
+import shutil
+import tempfile
 import unittest
 
 import mock
@@ -17,28 +19,32 @@ from xtesting.ci import tier_builder
 
 
 class TierBuilderTesting(unittest.TestCase):
+    # pylint: disable=too-many-public-methods
 
     def setUp(self):
         self.testcase = {
             'enabled': True,
             'case_name': 'test_name', 'criteria': 'test_criteria',
             'blocking': 'test_blocking', 'description': 'test_desc',
-            'project_name': 'project_name'}
+            'project_name': 'project_name', 'depends_on': ['test_name2'],
+            'timeout': 60, 'memory_limit': '1G',
+            'resources': {'cpu': 2, 'mem': '4G', 'locks': ['tgen']},
+            'tags': ['smoke', 'fast']}
         self.testcase_disabled = {
             'enabled': False,
             'case_name': 'test_name_disabled', 'criteria': 'test_criteria',
             'blocking': 'test_blocking', 'description': 'test_desc',
-            'project_name': 'project_name'}
+            'project_name': 'project_name', 'tags': 'smoke'}
         self.dic_tier = {
             'name': 'test_tier', 'description': 'test_desc',
+            'concurrency': '4',
             'testcases': [self.testcase, self.testcase_disabled]}
         self.mock_yaml = mock.Mock()
         attrs = {'get.return_value': [self.dic_tier]}
         self.mock_yaml.configure_mock(**attrs)
 
-        with mock.patch('xtesting.ci.tier_builder.yaml.safe_load',
-                        return_value=self.mock_yaml), \
-                mock.patch('builtins.open', mock.mock_open()):
+        with mock.patch('xtesting.ci.tier_builder.config.load_yaml',
+                        return_value=self.mock_yaml):
             os.environ["INSTALLER_TYPE"] = 'test_installer'
             os.environ["DEPLOY_SCENARIO"] = 'test_scenario'
             self.tierbuilder = tier_builder.TierBuilder('testcases_file')
@@ -77,19 +83,179 @@ class TierBuilderTesting(unittest.TestCase):
 
     def test_get_tests_present_tier(self):
         self.assertEqual(self.tierbuilder.get_tests('test_tier'),
-                         self.tier_obj.tests_array)
+                         tuple(self.tier_obj.tests_array))
 
     def test_get_tests_missing_tier(self):
         self.assertEqual(self.tierbuilder.get_tests('test_tier2'),
                          None)
 
+    def test_get_dict_by_test(self):
+        self.assertEqual(
+            self.tierbuilder.get_dict_by_test('test_name'), self.testcase)
+        self.assertIsNone(self.tierbuilder.get_dict_by_test('test_name2'))
+
     def test_get_tier_name_ok(self):
         self.assertEqual(self.tierbuilder.get_tier_name('test_name'),
                          'test_tier')
 
+    def test_generate_tiers(self):
+        self.tierbuilder.generate_tiers()
+        tier = self.tierbuilder.get_tiers()[0]
+        self.assertIsNot(tier, self.tier_obj)
+        self.assertEqual(self.tierbuilder.get_tier('test_tier'), tier)
+        self.assertEqual(self.tierbuilder.get_test('test_name'),
+                         tier.get_test('test_name'))
+        self.assertEqual(self.tierbuilder.get_tagged_tests('fast'),
+                         ['test_name'])
+
     def test_get_tier_name_ko(self):
         self.assertEqual(self.tierbuilder.get_tier_name('test_name2'), None)
 
+    def test_get_depends_on(self):
+        self.assertEqual(
+            self.tierbuilder.get_test('test_name').get_depends_on(),
+            ['test_name2'])
+        self.assertEqual(
+            self.tierbuilder.get_test('test_name_disabled').get_depends_on(),
+            [])
+        self.assertEqual(
+            tier_builder.get_depends_on({'depends_on': 'setup'}), ['setup'])
+        self.assertEqual(tier_builder.get_depends_on({'depends_on': 1}), ['1'])
+        self.assertEqual(tier_builder.get_depends_on({}), [])
+
+    def test_get_depends_on_scalar(self):
+        self.testcase['depends_on'] = 'test_name2'
+        self.testcase_disabled['depends_on'] = 'test_name'
+        with mock.patch('xtesting.ci.tier_builder.config.load_yaml',
+                        return_value=self.mock_yaml):
+            tierbuilder = tier_builder.TierBuilder('testcases_file')
+        self.assertEqual(
+            tierbuilder.get_test('test_name').get_depends_on(),
+            ['test_name2'])
+        self.assertEqual(
+            tierbuilder.get_test('test_name_disabled').get_depends_on(),
+            ['test_name'])
+
+    def test_get_limits(self):
+        self.assertEqual(
+            self.tierbuilder.get_test('test_name').get_limits(),
+            {'timeout': 60.0, 'memory_limit': 1024 ** 3})
+        self.assertEqual(
+            self.tierbuilder.get_test('test_name_disabled').get_limits(), {})
+        self.assertEqual(tier_builder.get_limits({'cpu_limit': '10'}),
+                         {'cpu_limit': 10.0})
+
+    def test_get_concurrency(self):
+        self.assertEqual(self.tier_obj.get_concurrency(), 4)
+
+    def test_get_resources(self):
+        self.assertEqual(
+            self.tierbuilder.get_test('test_name').get_resources(),
+            {'cpu': 2.0, 'mem': 4 * 1024 ** 3, 'locks': ['tgen']})
+        self.assertEqual(
+            self.tierbuilder.get_test('test_name_disabled').get_resources(),
+            {})
+        self.assertEqual(tier_builder.get_resources(
+            {'resources': {'locks': None}}), {'locks': []})
+        self.assertEqual(tier_builder.get_resources(
+            {'resources': {'locks': 'tgen'}}), {'locks': ['tgen']})
+
+    def test_get_tags(self):
+        self.assertEqual(
+            self.tierbuilder.get_test('test_name').get_tags(),
+            ['smoke', 'fast'])
+        self.assertEqual(tier_builder.get_tags({'tags': 1}), ['1'])
+        self.assertEqual(tier_builder.get_tags({'tags': None}), [])
+
+    def test_get_tagged_tests(self):
+        self.assertEqual(self.tierbuilder.get_tagged_tests('smoke'),
+                         ['test_name', 'test_name_disabled'])
+        self.assertEqual(self.tierbuilder.get_tagged_tests('fast'),
+                         ['test_name'])
+        self.assertEqual(self.tierbuilder.get_tagged_tests('foo'), [])
+
+    def test_select(self):
+        self.assertEqual(self.tierbuilder.select('test_tier'),
+                         ['test_name', 'test_name_disabled'])
+        self.assertEqual(self.tierbuilder.select('all'),
+                         ['test_name', 'test_name_disabled'])
+        self.assertEqual(self.tierbuilder.select('tag:fast'), ['test_name'])
+        self.assertEqual(
+            self.tierbuilder.select(' test_name_disabled, tag:f*,'),
+            ['test_name', 'test_name_disabled'])
+        self.assertEqual(self.tierbuilder.select('*_disabled'),
+                         ['test_name_disabled'])
+
+    def test_select_ko(self):
+        with self.assertRaises(ValueError):
+            self.tierbuilder.select('test_name,tag:foo')
+        with self.assertRaises(ValueError):
+            self.tierbuilder.select('foo*')
+
+    def test_get_dependencies(self):
+        dependencies = tier_builder.get_dependencies(
+            {'dependencies': [{'DEPLOY_SCENARIO': '^os-'}, {'FOO': 1}]})
+        self.assertEqual(
+            [(key, regex.pattern) for key, regex in dependencies],
+            [('DEPLOY_SCENARIO', '^os-'), ('FOO', '1')])
+        self.assertIs(dependencies[0][1], tier_builder.compile_regex('^os-'))
+        self.assertEqual(tier_builder.get_dependencies({}), ())
+
+    def test_check_dependencies(self):
+        dependencies = tier_builder.get_dependencies(
+            {'dependencies': [{'DEPLOY_SCENARIO': 'nofeature'},
+                              {'FOO': 'bar'}]})
+        self.assertFalse(tier_builder.check_dependencies(
+            dependencies, {'FOO': 'bar', 'DEPLOY_SCENARIO': 'os-nosdn-ovs'}))
+        self.assertTrue(tier_builder.check_dependencies(
+            dependencies, {'FOO': 'bar'}))
+        self.assertTrue(tier_builder.check_dependencies(
+            dependencies, {'FOO': 'bar',
+                           'DEPLOY_SCENARIO': 'os-nosdn-nofeature-ha'}))
+        self.assertFalse(tier_builder.check_dependencies(
+            dependencies, {'FOO': 'foo'}))
+        self.assertFalse(tier_builder.check_dependencies(
+            dependencies, {}))
+        self.assertTrue(tier_builder.check_dependencies((), {}))
+
+    def test_match(self):
+        # pylint: disable=no-value-for-parameter
+        regex = tier_builder.compile_regex('^foo')
+        hits = tier_builder.match.cache_info().hits
+        self.assertTrue(tier_builder.match(regex, 'foobar'))
+        self.assertTrue(tier_builder.match(regex, 'foobar'))
+        self.assertFalse(tier_builder.match(regex, 'barfoo'))
+        self.assertEqual(tier_builder.match.cache_info().hits, hits + 1)
+
+    def test_generate_tiers_dependencies(self):
+        self.testcase['dependencies'] = [{'DEPLOY_SCENARIO': '^foo'}]
+        self.tierbuilder.generate_tiers()
+        tier = self.tierbuilder.get_tier('test_tier')
+        self.assertEqual(tier.get_tests(), ())
+        self.assertEqual(
+            [test.get_name() for test in tier.get_skipped_test()],
+            ['test_name', 'test_name_disabled'])
+        with mock.patch.dict(os.environ, {'DEPLOY_SCENARIO': 'foo'}):
+            self.tierbuilder.generate_tiers()
+        self.assertEqual(
+            self.tierbuilder.get_tier('test_tier').get_test_names(),
+            ['test_name'])
+
+    def test_evaluate(self):
+        self.testcase['dependencies'] = [{'DEPLOY_SCENARIO': '^foo'}]
+        self.tierbuilder.generate_tiers()
+        self.assertEqual(self.tierbuilder.evaluate(
+            [{'DEPLOY_SCENARIO': 'foo'}, {'DEPLOY_SCENARIO': 'bar'}, {}]),
+            [['test_name'], [], []])
+        self.assertEqual(self.tierbuilder.evaluate([]), [])
+
+    def test_parse_size(self):
+        self.assertEqual(tier_builder.parse_size(1024), 1024)
+        self.assertEqual(tier_builder.parse_size('512M'), 512 * 1024 ** 2)
+        self.assertEqual(tier_builder.parse_size('1.5kb'), 1536)
+        with self.assertRaises(ValueError):
+            tier_builder.parse_size('foo')
+
     def test_str(self):
         message = str(self.tierbuilder)
         self.assertTrue('test_tier' in message)
@@ -97,6 +263,89 @@ class TierBuilderTesting(unittest.TestCase):
         self.assertTrue('test_name' in message)
 
 
+class IncludeTesting(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.tmpdir, 'tiers'))
+        self.filename = os.path.join(self.tmpdir, 'testcases.yaml')
+        with open(self.filename, 'w', encoding='utf-8') as yfile:
+            yfile.write(
+                "tiers:\n"
+                "  - {name: tier1, include: tiers/tier1.yaml}\n"
+                "  - {name: tier2, include: tiers/missing.yaml}\n"
+                "  - {name: tier3, testcases: "
+                "[{case_name: test3, project_name: foo}]}\n")
+        with open(os.path.join(self.tmpdir, 'tiers', 'tier1.yaml'), 'w',
+                  encoding='utf-8') as yfile:
+            yfile.write(
+                "testcases:\n"
+                "  - {case_name: test1, project_name: foo, tags: smoke}\n"
+                "  - {case_name: test2, project_name: foo, enabled: false}\n")
+        self.cache_dir = os.path.join(self.tmpdir, 'cache')
+        self.tierbuilder = tier_builder.TierBuilder(
+            self.filename, cache_dir=self.cache_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_cache_dir(self):
+        self.tierbuilder.get_tests('tier1')
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+    def test_generate_tiers(self):
+        self.assertEqual(self.tierbuilder.get_tier_names(),
+                         ['tier1', 'tier2', 'tier3'])
+        self.assertFalse(self.tierbuilder.get_tier('tier1').is_loaded())
+        self.assertFalse(self.tierbuilder.get_tier('tier2').is_loaded())
+        self.assertTrue(self.tierbuilder.get_tier('tier3').is_loaded())
+        self.assertEqual(self.tierbuilder.get_tier_name('test3'), 'tier3')
+        self.assertFalse(self.tierbuilder.get_tier('tier1').is_loaded())
+
+    def test_load_tier(self):
+        tier = self.tierbuilder.get_tier('tier1')
+        self.assertEqual(tier.get_test_names(), ['test1'])
+        self.assertEqual(
+            [test.get_name() for test in tier.get_skipped_test()],
+            ['test2'])
+        self.assertEqual(self.tierbuilder.get_tier_name('test2'), 'tier1')
+        self.assertEqual(
+            self.tierbuilder.get_dict_by_test('test1')['project_name'],
+            'foo')
+        self.assertFalse(self.tierbuilder.get_tier('tier2').is_loaded())
+
+    def test_load_tier_ko(self):
+        with self.assertRaises(OSError):
+            self.tierbuilder.get_tests('tier2')
+
+    def test_get_test_unknown(self):
+        with self.assertRaises(OSError):
+            self.tierbuilder.get_test('test1')
+
+    def test_select(self):
+        self.assertEqual(self.tierbuilder.select('tier1,tier3'),
+                         ['test1', 'test2', 'test3'])
+        self.assertFalse(self.tierbuilder.get_tier('tier2').is_loaded())
+        with self.assertRaises(OSError):
+            self.tierbuilder.select('tag:smoke')
+
+    def test_is_selection(self):
+        for value in ['tier1,tier3', 'tag:smoke', 'test*', 'test[12]']:
+            self.assertTrue(tier_builder.is_selection(value))
+        for value in ['tier1', 'test1', None, '']:
+            self.assertFalse(tier_builder.is_selection(value))
+
+
+class TestDescriptionsTesting(unittest.TestCase):
+
+    def test_get_dict_by_test(self):
+        descriptions = tier_builder.TestDescriptions(
+            {'test1': {'case_name': 'test1'}})
+        self.assertEqual(descriptions.get_dict_by_test('test1'),
+                         {'case_name': 'test1'})
+        self.assertIsNone(descriptions.get_dict_by_test('test2'))
+
+
 if __name__ == "__main__":
     logging.disable(logging.CRITICAL)
     unittest.main(verbosity=2)
@@ -41,26 +41,57 @@ class TierHandlerTesting(unittest.TestCase):
         self.assertEqual(self.tier.get_skipped_test(), [self.test])
 
     def test_get_tests(self):
-        self.tier.tests_array = [self.test]
-        self.assertEqual(self.tier.get_tests(), [self.test])
+        self.tier.add_test(self.test)
+        tests = self.tier.get_tests()
+        self.assertEqual(tests, (self.test,))
+        self.assertIs(self.tier.get_tests(), tests)
+        self.tier.add_test(self.test)
+        self.assertEqual(self.tier.get_tests(), (self.test, self.test))
+        self.assertEqual(tests, (self.test,))
 
     def test_get_test_names(self):
-        self.tier.tests_array = [self.test]
+        self.tier.add_test(self.test)
         self.assertEqual(self.tier.get_test_names(), ['test_name'])
 
     def test_get_test(self):
-        self.tier.tests_array = [self.test]
-        with mock.patch.object(self.tier, 'is_test', return_value=True):
-            self.assertEqual(self.tier.get_test('test_name'), self.test)
+        self.tier.add_test(self.test)
+        self.assertEqual(self.tier.get_test('test_name'), self.test)
+        self.assertTrue(self.tier.is_test('test_name'))
+
+    def test_get_test_skipped(self):
+        self.tier.skip_test(self.test)
+        self.assertEqual(self.tier.get_test('test_name'), self.test)
+        self.assertTrue(self.tier.is_test('test_name'))
 
     def test_get_test_missing_test(self):
-        self.tier.tests_array = [self.test]
-        with mock.patch.object(self.tier, 'is_test', return_value=False):
-            self.assertEqual(self.tier.get_test('test_name'), None)
+        self.tier.add_test(self.test)
+        self.assertEqual(self.tier.get_test('test_name2'), None)
+        self.assertFalse(self.tier.is_test('test_name2'))
+
+    def test_load(self):
+        loader = mock.Mock(side_effect=lambda tier: tier.add_test(self.test))
+        tier = tier_handler.Tier('test_tier', loader=loader)
+        self.assertFalse(tier.is_loaded())
+        self.assertEqual(tier.get_tests(), (self.test,))
+        self.assertTrue(tier.is_test('test_name'))
+        self.assertTrue(tier.is_loaded())
+        loader.assert_called_once_with(tier)
+
+    def test_load_skipped(self):
+        tier = tier_handler.Tier('test_tier', loader=mock.Mock(
+            side_effect=lambda tier: tier.skip_test(self.test)))
+        self.assertEqual(tier.get_skipped_test(), [self.test])
+        self.assertEqual(tier.get_test('test_name'), self.test)
 
     def test_get_name(self):
         self.assertEqual(self.tier.get_name(), 'test_tier')
 
+    def test_get_concurrency(self):
+        self.assertEqual(self.tier.get_concurrency(), 1)
+        self.assertEqual(
+            tier_handler.Tier('test_tier', concurrency=8).get_concurrency(),
+            8)
+
     def test_testcase_get_name(self):
         self.assertEqual(self.tier.get_name(), 'test_tier')
 
@@ -76,6 +107,12 @@ class TierHandlerTesting(unittest.TestCase):
     def test_testcase_get_project(self):
         self.assertEqual(self.testcase.get_project(), 'project_name')
 
+    def test_testcase_get_tags(self):
+        self.assertEqual(self.testcase.get_tags(), [])
+        self.assertEqual(tier_handler.TestCase(
+            'test_name', True, False, 'test_criteria', True,
+            tags=['smoke']).get_tags(), ['smoke'])
+
 
 if __name__ == "__main__":
     logging.disable(logging.CRITICAL)
@@ -77,6 +77,42 @@ class ParseResultTesting(unittest.TestCase):
             self.assertEqual(self.test.details['skip_tests'], 1)
             self.assertEqual(self.test.details['total_tests'], 3)
 
+    def test_flaky(self):
+        response = [{'location': 'foo.feature:1', 'status': 'failed',
+                     'elements': [
+                         {'location': 'foo.feature:3', 'name': 'foo',
+                          'status': 'passed'},
+                         {'location': 'foo.feature:5', 'name': 'bar',
+                          'status': 'failed'}]}]
+        rerun = [{'location': 'foo.feature:1', 'status': 'passed',
+                  'elements': [
+                      {'location': 'foo.feature:3', 'name': 'foo',
+                       'status': 'skipped'},
+                      {'location': 'foo.feature:5', 'name': 'bar',
+                       'status': 'passed'}]}]
+        self.test.rerun_files = ['rerun1.json']
+        with mock.patch('builtins.open', mock.mock_open()), \
+                mock.patch('json.load', side_effect=[response, rerun]):
+            self.test.parse_results()
+        self.assertEqual(self.test.result, 100)
+        self.assertEqual(self.test.details['flaky'], ['bar'])
+        self.assertEqual(
+            [element['status'] for element in
+             self.test.details['tests'][0]['elements']],
+            ['passed', 'passed'])
+
+    def test_merge_results_failed(self):
+        self.test.response = [
+            {'location': 'foo.feature:1', 'status': 'failed',
+             'elements': [{'location': 'foo.feature:3', 'name': 'foo',
+                           'status': 'failed'}]}]
+        self.assertEqual(self.test.merge_results([
+            {'location': 'foo.feature:1', 'status': 'failed',
+             'elements': [{'location': 'foo.feature:3', 'name': 'foo',
+                           'status': 'failed'}]},
+            {'location': 'bar.feature:1', 'status': 'passed'}]), [])
+        self.assertEqual(self.test.response[0]['status'], 'failed')
+
 
 class RunTesting(unittest.TestCase):
 
@@ -172,6 +208,62 @@ class RunTesting(unittest.TestCase):
     def test_parse_results_exc_console(self):
         self.test_parse_results_exc(console=True)
 
+    @mock.patch('os.remove')
+    @mock.patch('os.path.exists', return_value=True)
+    @mock.patch('xtesting.core.behaveframework.behave_main')
+    def test_retries(self, *args):
+        with mock.patch.object(self.test, 'parse_results'), \
+                mock.patch.object(self.test,
+                                  'rerun_failed_tests') as mock_method:
+            self.assertEqual(
+                self.test.run(suites=self.suites, tags=self.tags, retries=2),
+                self.test.EX_OK)
+        rerun_list = f'{self.test.res_dir}/rerun0.txt'
+        self.assertEqual(
+            args[0].call_args[0][0][-3:],
+            ['--format=rerun', f'--outfile={rerun_list}', 'foo'])
+        mock_method.assert_called_once_with(
+            ['--tags='+','.join(self.tags)], 2)
+        args[2].assert_called_once_with(rerun_list)
+
+
+class RerunTesting(unittest.TestCase):
+
+    """The class testing BehaveFramework.rerun_failed_tests()."""
+    # pylint: disable=missing-docstring
+
+    def setUp(self):
+        self.test = behaveframework.BehaveFramework(
+            case_name='behave', project_name='xtesting')
+
+    @mock.patch('os.path.exists', return_value=True)
+    @mock.patch('xtesting.core.behaveframework.behave_main')
+    def test_rerun(self, *args):
+        with mock.patch('builtins.open', mock.mock_open(
+                read_data='# -- RERUN\nfoo.feature:5\n')):
+            self.test.rerun_failed_tests(['--tags=bar'], 1)
+        rerun_file = os.path.join(self.test.res_dir, 'rerun1.json')
+        args[0].assert_called_once_with([
+            '--tags=bar', '--format=json', f'--outfile={rerun_file}',
+            '--format=rerun', f'--outfile={self.test.res_dir}/rerun1.txt',
+            'foo.feature:5'])
+        self.assertEqual(self.test.rerun_files, [rerun_file])
+
+    @mock.patch('os.path.exists', return_value=True)
+    @mock.patch('xtesting.core.behaveframework.behave_main')
+    def test_rerun_passed(self, *args):
+        with mock.patch('builtins.open', mock.mock_open(
+                read_data='')):
+            self.test.rerun_failed_tests([], 2)
+        args[0].assert_not_called()
+        self.assertEqual(self.test.rerun_files, [])
+
+    @mock.patch('os.path.exists', return_value=False)
+    @mock.patch('xtesting.core.behaveframework.behave_main')
+    def test_rerun_missing(self, *args):
+        self.test.rerun_failed_tests([], 2)
+        args[0].assert_not_called()
+
 
 if __name__ == "__main__":
     logging.disable(logging.CRITICAL)
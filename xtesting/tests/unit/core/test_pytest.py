@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2026 Orange and others.
+#
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+"""Define the classes required to fully cover pytest."""
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+import pytest
+
+from xtesting.core import pytest as pytest_driver
+from xtesting.core import testcase
+
+
+class MakeReportTesting(unittest.TestCase):
+
+    """The class testing pytest_runtest_makereport()."""
+    # pylint: disable=missing-docstring
+
+    def _make_report(self, **kwargs):
+        hook = pytest_driver.pytest_runtest_makereport(None, None)
+        next(hook)
+        with self.assertRaises(StopIteration):
+            hook.send(mock.Mock(**{'get_result.return_value': mock.Mock(
+                nodeid='foo.py::test_foo', **kwargs)}))
+
+    @mock.patch.object(pytest_driver.Pytest, 'tests', [])
+    def test_passed(self):
+        self._make_report(when='call', outcome='passed', failed=False)
+        self.assertEqual(pytest_driver.Pytest.tests, [
+            {'name': 'foo.py::test_foo', 'status': 'PASSED'}])
+
+    @mock.patch.object(pytest_driver.Pytest, 'tests', [])
+    def test_failed(self):
+        self._make_report(when='call', outcome='failed', failed=True,
+                          longreprtext='assert False')
+        self.assertEqual(pytest_driver.Pytest.tests, [
+            {'name': 'foo.py::test_foo', 'status': 'FAILED',
+             'failure': 'assert False'}])
+
+    @mock.patch.object(pytest_driver.Pytest, 'tests', [])
+    def test_setup(self):
+        self._make_report(when='setup', outcome='passed', failed=False)
+        self.assertEqual(pytest_driver.Pytest.tests, [])
+
+
+class ParseResultsTesting(unittest.TestCase):
+
+    """The class testing Pytest.parse_results()."""
+    # pylint: disable=missing-docstring
+
+    def setUp(self):
+        self.test = pytest_driver.Pytest(
+            case_name='pytest', project_name='xtesting')
+
+    def test_get_options(self):
+        self.assertEqual(
+            self.test.get_options({'k': 'foo', 'tb': 'no', 'v': None}),
+            ['-k', 'foo', '--tb', 'no', '-v'])
+
+    def test_parse_results(self):
+        self.test.parse_results([
+            {'name': 'a', 'status': 'PASSED'},
+            {'name': 'b', 'status': 'FAILED', 'failure': 'b1'},
+            {'name': 'c', 'status': 'FAILED', 'failure': 'c1'},
+            {'name': 'd', 'status': 'SKIPPED'}])
+        self.assertAlmostEqual(self.test.result, 100 / 3)
+        self.assertEqual(len(self.test.details['tests']), 4)
+        self.assertNotIn('flaky', self.test.details)
+
+    def test_parse_results_rerun(self):
+        self.test.parse_results([
+            {'name': 'a', 'status': 'PASSED'},
+            {'name': 'b', 'status': 'FAILED', 'failure': 'b1'},
+            {'name': 'c', 'status': 'FAILED', 'failure': 'c1'},
+            {'name': 'b', 'status': 'PASSED'},
+            {'name': 'c', 'status': 'FAILED', 'failure': 'c2'}])
+        self.assertAlmostEqual(self.test.result, 200 / 3)
+        self.assertEqual(self.test.details['tests'], [
+            {'name': 'a', 'status': 'PASSED'},
+            {'name': 'b', 'status': 'PASSED'},
+            {'name': 'c', 'status': 'FAILED', 'failure': 'c2'}])
+        self.assertEqual(self.test.details['flaky'], ['b'])
+
+    def test_parse_results_none(self):
+        self.test.parse_results([{'name': 'a', 'status': 'SKIPPED'}])
+        self.assertEqual(self.test.result, 0)
+        self.assertEqual(self.test.details['tests'], [
+            {'name': 'a', 'status': 'SKIPPED'}])
+
+
+class RunTesting(unittest.TestCase):
+
+    """The class testing Pytest.run()."""
+    # pylint: disable=missing-docstring
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        with mock.patch.object(testcase.TestCase, 'dir_results',
+                               self.tmpdir):
+            self.test = pytest_driver.Pytest(
+                case_name='pytest', project_name='xtesting')
+        self.test.dir_results = self.tmpdir
+        self.runs = []
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _main(self, *results):
+        # every run reports its tests as pytest_runtest_makereport does
+        def main(args):
+            self.runs.append(args)
+            os.makedirs(self.test.res_dir, exist_ok=True)
+            print(f"== {len(self.runs)} run ==")
+            exit_code, tests = results[len(self.runs) - 1]
+            pytest_driver.Pytest.tests.extend(tests)
+            return exit_code
+        return main
+
+    @mock.patch.object(pytest_driver.Pytest, 'tests', [])
+    def test_run(self):
+        with mock.patch('pytest.main', side_effect=self._main(
+                (pytest.ExitCode.OK, [{'name': 'a', 'status': 'PASSED'}]))):
+            self.assertEqual(self.test.run(dir='tests', options={'k': 'a'}),
+                             testcase.TestCase.EX_OK)
+        self.assertEqual(self.runs, [[
+            'tests', '-p', 'xtesting.core.pytest', '-k', 'a',
+            '--html', f'{self.test.res_dir}/results.html',
+            '--junitxml', f'{self.test.res_dir}/results.xml',
+            '-p', 'no:cacheprovider', '--tb', 'no']])
+        self.assertEqual(self.test.result, 100)
+        with open(os.path.join(self.test.res_dir, 'stdout.log'),
+                  encoding='utf-8') as output:
+            self.assertEqual(output.read(), "== 1 run ==\n")
+
+    @mock.patch.object(pytest_driver.Pytest, 'tests', [])
+    def test_run_retries(self):
+        with mock.patch('pytest.main', side_effect=self._main(
+                (pytest.ExitCode.TESTS_FAILED,
+                 [{'name': 'a', 'status': 'PASSED'},
+                  {'name': 'b', 'status': 'FAILED', 'failure': 'b1'},
+                  {'name': 'c', 'status': 'FAILED', 'failure': 'c1'}]),
+                (pytest.ExitCode.TESTS_FAILED,
+                 [{'name': 'b', 'status': 'PASSED'},
+                  {'name': 'c', 'status': 'FAILED', 'failure': 'c2'}]),
+                (pytest.ExitCode.OK, [{'name': 'c', 'status': 'PASSED'}]))):
+            self.assertEqual(self.test.run(dir='tests', retries=3),
+                             testcase.TestCase.EX_OK)
+        self.assertEqual(len(self.runs), 3)
+        self.assertNotIn('--last-failed', self.runs[0])
+        for retry, args in enumerate(self.runs[1:], 1):
+            self.assertEqual(args[:4], [
+                'tests', '-p', 'xtesting.core.pytest', '--last-failed'])
+            self.assertIn(f'{self.test.res_dir}/rerun{retry}.html', args)
+            self.assertIn(f'{self.test.res_dir}/rerun{retry}.xml', args)
+            self.assertIn(
+                f'cache_dir={self.test.res_dir}/.pytest_cache', args)
+            self.assertNotIn('no:cacheprovider', args)
+        self.assertEqual(self.test.result, 100)
+        self.assertEqual(self.test.details['flaky'], ['b', 'c'])
+
+    @mock.patch.object(pytest_driver.Pytest, 'tests', [])
+    def test_run_retries_exhausted(self):
+        with mock.patch('pytest.main', side_effect=self._main(
+                (pytest.ExitCode.TESTS_FAILED,
+                 [{'name': 'a', 'status': 'FAILED', 'failure': 'a1'}]),
+                (pytest.ExitCode.TESTS_FAILED,
+                 [{'name': 'a', 'status': 'FAILED', 'failure': 'a2'}]))):
+            self.assertEqual(self.test.run(dir='tests', retries=1),
+                             testcase.TestCase.EX_OK)
+        self.assertEqual(len(self.runs), 2)
+        self.assertEqual(self.test.result, 0)
+        self.assertEqual(self.test.details['tests'], [
+            {'name': 'a', 'status': 'FAILED', 'failure': 'a2'}])
+        self.assertNotIn('flaky', self.test.details)
+
+    @mock.patch.object(pytest_driver.Pytest, 'tests', [
+        {'name': 'z', 'status': 'FAILED'}])
+    def test_run_previous(self):
+        os.makedirs(os.path.join(self.test.res_dir, 'foo'))
+        with mock.patch('pytest.main', side_effect=self._main(
+                (pytest.ExitCode.OK, [{'name': 'a', 'status': 'PASSED'}]))):
+            self.assertEqual(self.test.run(dir='tests'),
+                             testcase.TestCase.EX_OK)
+        self.assertFalse(
+            os.path.exists(os.path.join(self.test.res_dir, 'foo')))
+        self.assertEqual(self.test.details['tests'], [
+            {'name': 'a', 'status': 'PASSED'}])
+
+    @mock.patch('pytest.main')
+    def test_run_ko(self, mock_method):
+        self.assertEqual(self.test.run(), testcase.TestCase.EX_RUN_ERROR)
+        mock_method.assert_not_called()
+        self.assertIsNotNone(self.test.stop_time)
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    unittest.main(verbosity=2)
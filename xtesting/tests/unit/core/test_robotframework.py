@@ -122,6 +122,75 @@ class ParseResultTesting(unittest.TestCase):
                              'statistics.total': 5})
         self._test_result(self._config, 100)
 
+    def test_flaky(self):
+        self._config.update({'statistics.skipped': 0,
+                             'statistics.passed': 2,
+                             'statistics.total': 2})
+        self.test.retried = {('suite', 'flaky')}
+        tests = [{'name': 'stable', 'parent': 'suite', 'status': 'PASS'},
+                 {'name': 'flaky', 'parent': 'suite', 'status': 'PASS'}]
+        suite = mock.Mock()
+        suite.configure_mock(**self._config)
+        with mock.patch('robot.api.ExecutionResult',
+                        return_value=mock.Mock(suite=suite)), \
+                mock.patch.object(robotframework.ResultVisitor, 'get_data',
+                                  return_value=tests):
+            self.test.parse_results()
+        self.assertEqual(self.test.details['flaky'], ['flaky'])
+
+
+class RerunTesting(unittest.TestCase):
+
+    """The class testing RobotFramework.rerun_failed_tests()."""
+    # pylint: disable=missing-docstring
+
+    def setUp(self):
+        self.test = robotframework.RobotFramework(
+            case_name='robot', project_name='xtesting')
+
+    @mock.patch('robot.api.ExecutionResult')
+    def test_get_failed_tests(self, *args):
+        tests = [{'name': 'foo', 'parent': 'suite', 'status': 'PASS'},
+                 {'name': 'bar', 'parent': 'suite', 'status': 'FAIL'}]
+        with mock.patch.object(robotframework.ResultVisitor, 'get_data',
+                               return_value=tests):
+            self.assertEqual(self.test.get_failed_tests(), {('suite', 'bar')})
+        args[0].assert_called_once_with(self.test.xml_file)
+
+    @mock.patch('robot.api.ExecutionResult')
+    @mock.patch('robot.rebot')
+    @mock.patch('robot.run')
+    def test_rerun(self, *args):
+        with mock.patch.object(
+                self.test, 'get_failed_tests',
+                side_effect=[{('suite', 'foo'), ('suite', 'bar')},
+                             {('suite', 'bar')}]):
+            self.test.rerun_failed_tests(
+                ['suite'], 2, output=self.test.xml_file, stdout='stdout')
+        self.assertEqual(self.test.retried,
+                         {('suite', 'foo'), ('suite', 'bar')})
+        rerun_file = os.path.join(self.test.res_dir, 'rerun2.xml')
+        args[0].assert_called_with(
+            'suite', output=rerun_file, rerunfailed=self.test.xml_file,
+            stdout='stdout')
+        self.assertEqual(args[0].call_count, 2)
+        args[1].assert_called_with(
+            self.test.xml_file, rerun_file, merge=True,
+            output=self.test.xml_file, starttime=mock.ANY,
+            endtime=mock.ANY, log='NONE', report='NONE', stdout='stdout')
+
+    @mock.patch('robot.api.ExecutionResult')
+    @mock.patch('robot.rebot')
+    @mock.patch('robot.run')
+    def test_rerun_passed(self, *args):
+        with mock.patch.object(self.test, 'get_failed_tests',
+                               return_value=set()):
+            self.test.rerun_failed_tests(
+                ['suite'], 2, output=self.test.xml_file, stdout='stdout')
+        args[0].assert_not_called()
+        args[1].assert_not_called()
+        self.assertEqual(self.test.retried, set())
+
 
 class GenerateReportTesting(unittest.TestCase):
 
@@ -317,6 +386,23 @@ class RunTesting(unittest.TestCase):
             self._test_generate_report(self.test.EX_OK)
             mmethod.assert_called_once_with()
 
+    @mock.patch('os.makedirs')
+    @mock.patch('robot.run')
+    def test_retries(self, *args):
+        with mock.patch.object(self.test, 'parse_results'), \
+                mock.patch.object(self.test, 'generate_report'), \
+                mock.patch.object(self.test,
+                                  'rerun_failed_tests') as mock_method:
+            self.assertEqual(
+                self.test.run(suites=self.suites, retries=2),
+                self.test.EX_OK)
+        args[0].assert_called_once_with(
+            *self.suites, log='NONE', output=self.test.xml_file,
+            report='NONE', stdout=mock.ANY)
+        mock_method.assert_called_once_with(
+            self.suites, 2, log='NONE', output=self.test.xml_file,
+            report='NONE', stdout=mock.ANY)
+
 
 if __name__ == "__main__":
     logging.disable(logging.CRITICAL)
@@ -11,6 +11,7 @@
 
 """Define the class required to fully cover testcase."""
 
+import asyncio
 from datetime import datetime
 import json
 import logging
@@ -109,7 +110,10 @@ class TestCaseTesting(unittest.TestCase):
         self.test.stop_time = None
         self._test_pushdb_missing_attribute()
 
-    def _test_pushdb_missing_env(self, var):
+    @mock.patch('xtesting.utils.session.post',
+                side_effect=requests.exceptions.ConnectionError)
+    def _test_pushdb_missing_env(self, var, *args):
+        # pylint: disable=unused-argument
         del os.environ[var]
         self.assertEqual(self.test.push_to_db(),
                          testcase.TestCase.EX_PUSH_TO_DB_ERROR)
@@ -129,7 +133,7 @@ class TestCaseTesting(unittest.TestCase):
     def test_pushdb_no_build_tag(self):
         self._test_pushdb_missing_env('BUILD_TAG')
 
-    @mock.patch('requests.post')
+    @mock.patch('xtesting.utils.session.post')
     def test_pushdb_bad_start_time(self, mock_function=None):
         self.test.start_time = "1"
         self.assertEqual(
@@ -137,7 +141,7 @@ class TestCaseTesting(unittest.TestCase):
             testcase.TestCase.EX_PUSH_TO_DB_ERROR)
         mock_function.assert_not_called()
 
-    @mock.patch('requests.post')
+    @mock.patch('xtesting.utils.session.post')
     def test_pushdb_bad_end_time(self, mock_function=None):
         self.test.stop_time = "2"
         self.assertEqual(
@@ -145,7 +149,7 @@ class TestCaseTesting(unittest.TestCase):
             testcase.TestCase.EX_PUSH_TO_DB_ERROR)
         mock_function.assert_not_called()
 
-    @mock.patch('requests.post')
+    @mock.patch('xtesting.utils.session.post')
     def test_pushdb_skipped_test(self, mock_function=None):
         self.test.is_skipped = True
         self.assertEqual(
@@ -170,9 +174,17 @@ class TestCaseTesting(unittest.TestCase):
                 self.test.stop_time).strftime('%Y-%m-%d %H:%M:%S'),
             "version": "master"}
 
+    def test_get_db_data(self):
+        self.assertEqual(self.test.get_db_data(), self._get_data())
+
+    def test_get_db_data_ko(self):
+        self.test.start_time = None
+        with self.assertRaises(AssertionError):
+            self.test.get_db_data()
+
     @mock.patch('os.path.join', return_value='')
     @mock.patch('re.sub', return_value='')
-    @mock.patch('requests.post')
+    @mock.patch('xtesting.utils.session.post')
     def _test_pushdb_version(self, *args, **kwargs):
         payload = self._get_data()
         payload["version"] = kwargs.get("version", "unknown")
@@ -180,8 +192,7 @@ class TestCaseTesting(unittest.TestCase):
         args[0].assert_called_once_with(
             os.environ['TEST_DB_URL'],
             data=json.dumps(payload, sort_keys=True),
-            headers=self._headers,
-            timeout=10)
+            headers=self._headers)
 
     def test_pushdb_daily_job(self):
         self._test_pushdb_version(version="master")
@@ -194,7 +205,7 @@ class TestCaseTesting(unittest.TestCase):
         os.environ['BUILD_TAG'] = 'whatever'
         self._test_pushdb_version(version="unknown")
 
-    @mock.patch('requests.post', return_value=mock.Mock(
+    @mock.patch('xtesting.utils.session.post', return_value=mock.Mock(
         raise_for_status=mock.Mock(
             side_effect=requests.exceptions.HTTPError)))
     def test_pushdb_http_errors(self, mock_function=None):
@@ -204,13 +215,27 @@ class TestCaseTesting(unittest.TestCase):
         mock_function.assert_called_once_with(
             os.environ['TEST_DB_URL'],
             data=json.dumps(self._get_data(), sort_keys=True),
-            headers=self._headers,
-            timeout=10)
+            headers=self._headers)
 
     def test_check_requirements(self):
         self.test.check_requirements()
         self.assertEqual(self.test.is_skipped, False)
 
+    def test_arun(self):
+        with mock.patch.object(self.test, 'run',
+                               return_value=testcase.TestCase.EX_OK) as run:
+            self.assertEqual(asyncio.run(self.test.arun(foo='bar')),
+                             testcase.TestCase.EX_OK)
+        run.assert_called_once_with(foo='bar')
+
+    def test_is_cancelled(self):
+        self.assertFalse(self.test.is_cancelled())
+        self.test.cancel_event = mock.Mock()
+        self.test.cancel_event.is_set.return_value = False
+        self.assertFalse(self.test.is_cancelled())
+        self.test.cancel_event.is_set.return_value = True
+        self.assertTrue(self.test.is_cancelled())
+
     def test_check_criteria_missing(self):
         self.test.criteria = None
         self.assertEqual(self.test.is_successful(),
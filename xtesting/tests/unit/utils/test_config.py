@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2026 Orange and others.
+#
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+# pylint: disable=missing-docstring
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from xtesting.utils import config
+from xtesting.utils import constants
+
+
+class ConfigTesting(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'testcases.yaml')
+        with open(self.filename, 'w', encoding='utf-8') as yfile:
+            yfile.write("tiers:\n  - name: foo\n    testcases: []\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    @mock.patch('logging.captureWarnings')
+    @mock.patch('logging.config.fileConfig')
+    def test_configure_logging(self, *args):
+        with mock.patch.dict(os.environ, {'DEBUG': 'true'}):
+            config.configure_logging()
+        args[0].assert_called_once_with(mock.ANY)
+        self.assertIn('logging.debug.ini', str(args[0].call_args[0][0]))
+        with mock.patch.dict(os.environ, {'DEBUG': 'false'}):
+            config.configure_logging()
+        self.assertIn('logging.ini', str(args[0].call_args[0][0]))
+        args[1].assert_called_with(True)
+
+    def test_get_xtesting_config(self):
+        with mock.patch('xtesting.utils.constants.XTESTING_PATHES',
+                        [os.path.join(self.tmpdir, 'bar'), self.tmpdir]):
+            self.assertEqual(
+                config.get_xtesting_config('testcases.yaml', 'foo'),
+                self.filename)
+            self.assertEqual(
+                config.get_xtesting_config('bar.yaml', 'foo'), 'foo')
+
+    def test_load_yaml(self):
+        self.assertEqual(config.load_yaml(self.filename, None),
+                         {'tiers': [{'name': 'foo', 'testcases': []}]})
+
+    def test_load_yaml_default(self):
+        self.assertIn('tiers', config.load_yaml(
+            constants.TESTCASE_DESCRIPTION_DEFAULT, self.tmpdir))
+
+    def test_load_yaml_ko(self):
+        with self.assertRaises(OSError):
+            config.load_yaml(os.path.join(self.tmpdir, 'foo.yaml'))
+
+    def test_load_yaml_cache(self):
+        cache_dir = os.path.join(self.tmpdir, 'cache')
+        data = config.load_yaml(self.filename, cache_dir)
+        self.assertTrue(os.path.isfile(
+            config.get_cache_path(self.filename, cache_dir)))
+        with mock.patch('yaml.load') as mock_method:
+            self.assertEqual(config.load_yaml(self.filename, cache_dir), data)
+        mock_method.assert_not_called()
+
+    def test_load_yaml_cache_changed(self):
+        config.load_yaml(self.filename, self.tmpdir)
+        with open(self.filename, 'w', encoding='utf-8') as yfile:
+            yfile.write("tiers: []\n")
+        self.assertEqual(config.load_yaml(self.filename, self.tmpdir),
+                         {'tiers': []})
+        self.assertEqual(config.load_yaml(self.filename, self.tmpdir),
+                         {'tiers': []})
+
+    def test_load_yaml_cache_corrupted(self):
+        with open(config.get_cache_path(self.filename, self.tmpdir),
+                  'wb') as cfile:
+            cfile.write(b'foo')
+        self.assertEqual(config.load_yaml(self.filename, self.tmpdir),
+                         {'tiers': [{'name': 'foo', 'testcases': []}]})
+
+    def test_load_yaml_cache_altered(self):
+        with open(self.filename, 'w', encoding='utf-8') as yfile:
+            yfile.write("timeouts: {1: 60}\n")
+        for _ in range(2):
+            self.assertEqual(config.load_yaml(self.filename, self.tmpdir),
+                             {'timeouts': {1: 60}})
+        self.assertFalse(os.path.isfile(
+            config.get_cache_path(self.filename, self.tmpdir)))
+
+    def test_load_yaml_cache_ko(self):
+        with open(self.filename, 'w', encoding='utf-8') as yfile:
+            yfile.write("date: 2026-10-18 10:00:00\n")
+        self.assertIn('date', config.load_yaml(self.filename, self.tmpdir))
+        self.assertFalse(os.path.isfile(
+            config.get_cache_path(self.filename, self.tmpdir)))
+        with mock.patch('os.makedirs', side_effect=OSError):
+            self.assertIn('date', config.load_yaml(
+                self.filename, os.path.join(self.tmpdir, 'foo')))
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    unittest.main(verbosity=2)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2026 Orange and others.
+#
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+# pylint: disable=missing-docstring
+
+import logging
+import os
+import unittest
+
+import mock
+
+from xtesting.utils import session
+
+
+class SessionTesting(unittest.TestCase):
+
+    def setUp(self):
+        session.reset()
+
+    def tearDown(self):
+        session.reset()
+
+    def test_get_session(self):
+        with mock.patch.dict(os.environ, {
+                'TEST_DB_POOL_SIZE': '4', 'TEST_DB_RETRIES': '2',
+                'TEST_DB_TIMEOUT': '5'}):
+            shared = session.get_session()
+        self.assertIs(session.get_session(), shared)
+        self.assertEqual(shared.timeout, 5.0)
+        adapter = shared.get_adapter('https://127.0.0.1')
+        self.assertIs(shared.get_adapter('http://127.0.0.1'), adapter)
+        self.assertEqual(adapter._pool_maxsize, 4)  # pylint: disable=W0212
+        self.assertEqual(adapter.max_retries.total, 2)
+        self.assertEqual(adapter.max_retries.read, 0)
+        self.assertIsInstance(adapter.max_retries, session.Retry)
+
+    def test_retry(self):
+        retry = session.get_adapter(1, 3).max_retries
+        self.assertTrue(retry.is_retry('POST', 503))
+        self.assertFalse(retry.is_retry('POST', 502))
+        self.assertFalse(retry.is_retry('POST', 504))
+        self.assertFalse(retry.is_retry('POST', 500))
+        self.assertTrue(retry.is_retry('GET', 502))
+        self.assertTrue(retry.is_retry('GET', 504))
+        self.assertFalse(retry.is_retry('GET', 500))
+        self.assertIsInstance(retry.new(total=2), session.Retry)
+
+    def test_get_session_default(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            shared = session.get_session()
+        self.assertEqual(shared.timeout, 10.0)
+        self.assertEqual(
+            shared.get_adapter('http://127.0.0.1').max_retries.total, 3)
+
+    def test_reset(self):
+        shared = session.get_session()
+        session.reset()
+        self.assertIsNot(session.get_session(), shared)
+
+    def test_reset_fork(self):
+        session.get_session()
+        pid = os.fork()
+        if pid == 0:
+            # pylint: disable=protected-access
+            os._exit(os.EX_OK if session._SESSION is None else 1)
+        self.assertEqual(os.waitpid(pid, 0)[1], 0)
+        self.assertIsNotNone(session._SESSION)  # pylint: disable=W0212
+
+    @mock.patch('requests.Session.request')
+    def test_request_timeout(self, mock_method):
+        shared = session.Session(timeout=5)
+        shared.request('get', 'http://127.0.0.1')
+        mock_method.assert_called_once_with(
+            'get', 'http://127.0.0.1', timeout=5)
+        shared.request('get', 'http://127.0.0.1', timeout=1)
+        mock_method.assert_called_with('get', 'http://127.0.0.1', timeout=1)
+
+    @mock.patch('xtesting.utils.session.get_session')
+    def test_get_post(self, mock_method):
+        session.get('http://127.0.0.1', headers={})
+        mock_method.return_value.request.assert_called_once_with(
+            'get', 'http://127.0.0.1', headers={})
+        session.post('http://127.0.0.1', data='foo')
+        mock_method.return_value.request.assert_called_with(
+            'post', 'http://127.0.0.1', data='foo')
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    unittest.main(verbosity=2)
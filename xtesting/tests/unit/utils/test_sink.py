@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2026 Orange and others.
+#
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+# pylint: disable=missing-docstring
+
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import mock
+
+from xtesting.core import testcase
+from xtesting.utils import sink
+
+
+class FakeTestCase(testcase.TestCase):
+
+    def run(self, **kwargs):
+        return testcase.TestCase.EX_OK
+
+
+class SinkTesting(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'results', 'results.json')
+        self.url = f'file://{self.path}'
+
+    def tearDown(self):
+        sink.close()
+        shutil.rmtree(self.tmpdir)
+
+    def _read(self):
+        with open(self.path, encoding='utf-8') as rfile:
+            return [json.loads(line) for line in rfile]
+
+    def test_get_sink(self):
+        file_sink = sink.get_sink(self.url)
+        self.assertIs(sink.get_sink(self.url), file_sink)
+        self.assertEqual(file_sink.path, self.path)
+        self.assertTrue(os.path.isfile(self.path))
+
+    def test_write(self):
+        file_sink = sink.get_sink(self.url)
+        file_sink.write({'foo': 'bar'})
+        file_sink.write({'foo': 'baz'})
+        self.assertEqual(self._read(), [])
+        sink.flush()
+        self.assertEqual(self._read(), [{'foo': 'bar'}, {'foo': 'baz'}])
+
+    def test_close(self):
+        file_sink = sink.get_sink(self.url)
+        file_sink.write({'foo': 'bar'})
+        sink.close()
+        self.assertTrue(file_sink.file.closed)
+        self.assertEqual(self._read(), [{'foo': 'bar'}])
+        self.assertIsNot(sink.get_sink(self.url), file_sink)
+
+    def test_fork(self):
+        sink.get_sink(self.url).write({'foo': 'bar'})
+        sys.stdout.flush()
+        pid = os.fork()
+        if pid == 0:
+            # the buffer of the parent must not be written again
+            sink.close()
+            os._exit(os.EX_OK)  # pylint: disable=protected-access
+        self.assertEqual(os.waitpid(pid, 0)[1], 0)
+        self.assertEqual(self._read(), [{'foo': 'bar'}])
+        sink.close()
+        self.assertEqual(self._read(), [{'foo': 'bar'}])
+
+    def test_push_to_db(self):
+        test = FakeTestCase(project_name='xtesting', case_name='foo')
+        test.start_time = 1
+        test.stop_time = 2
+        with mock.patch.dict(os.environ, {'TEST_DB_URL': self.url}), \
+                mock.patch('xtesting.utils.session.post') as mock_method:
+            self.assertEqual(test.push_to_db(), testcase.TestCase.EX_OK)
+            test.case_name = 'bar'
+            self.assertEqual(test.push_to_db(), testcase.TestCase.EX_OK)
+            sink.flush()
+            self.assertEqual(
+                self._read(), [dict(test.get_db_data(), case_name='foo'),
+                               test.get_db_data()])
+        mock_method.assert_not_called()
+
+    @mock.patch('os.makedirs', side_effect=OSError)
+    def test_push_to_db_ko(self, *args):
+        test = FakeTestCase(project_name='xtesting', case_name='foo')
+        test.start_time = 1
+        test.stop_time = 2
+        with mock.patch.dict(os.environ, {'TEST_DB_URL': self.url}):
+            self.assertEqual(test.push_to_db(),
+                             testcase.TestCase.EX_PUSH_TO_DB_ERROR)
+        args[0].assert_called_once_with(os.path.dirname(self.path),
+                                        exist_ok=True)
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    unittest.main(verbosity=2)
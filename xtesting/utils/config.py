@@ -9,9 +9,24 @@
 
 # pylint: disable=missing-docstring
 
+import hashlib
+import json
+import logging
+import logging.config
 import os
+import sys
+
+import yaml
 
 from xtesting.utils import constants
+from xtesting.utils import env
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+LOGGER = logging.getLogger('xtesting.utils.config')
 
 
 def get_xtesting_config(filename, default):
@@ -21,3 +36,57 @@ def get_xtesting_config(filename, default):
         if os.path.isfile(os.path.join(abspath, filename)):
             return os.path.join(abspath, filename)
     return default
+
+
+def configure_logging():
+    """Configure logging according to DEBUG"""
+    if env.get('DEBUG').lower() == 'true':
+        logging.config.fileConfig(get_xtesting_config(
+            'logging.debug.ini', constants.DEBUG_INI_PATH_DEFAULT))
+    else:
+        logging.config.fileConfig(get_xtesting_config(
+            'logging.ini', constants.INI_PATH_DEFAULT))
+    logging.captureWarnings(True)
+
+
+def get_cache_path(filename, cache_dir=constants.CACHE_DIR):
+    """Get the path of the cached form of a yaml file"""
+    return os.path.join(cache_dir, hashlib.sha256(
+        os.path.abspath(filename).encode('utf-8')).hexdigest() + '.json')
+
+
+def load_yaml(filename, cache_dir=constants.CACHE_DIR):
+    """Load a yaml file (i.e. testcases.yaml) via libyaml if available
+
+    The parsed content is also stored as json in cache_dir. It is loaded
+    instead of parsing the file again as long as the content of the file
+    is unchanged. The content which json cannot store as is (e.g.
+    timestamps or integer keys) is never cached.
+    """
+    with open(filename, 'rb') as yfile:
+        content = yfile.read()
+    if not cache_dir:
+        return yaml.load(content.decode('utf-8'), Loader=SafeLoader)
+    key = [list(sys.version_info[:2]), os.path.abspath(filename),
+           hashlib.sha256(content).hexdigest()]
+    cache_path = get_cache_path(filename, cache_dir)
+    try:
+        with open(cache_path, encoding='utf-8') as cfile:
+            cache_key, data = json.load(cfile)
+        if cache_key == key:
+            return data
+    except (OSError, ValueError, TypeError):
+        LOGGER.debug("No valid cached form of %s", filename)
+    data = yaml.load(content.decode('utf-8'), Loader=SafeLoader)
+    try:
+        cached = json.dumps([key, data])
+        if json.loads(cached)[1] != data:
+            raise ValueError("the content is altered by json")
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(f'{cache_path}.{os.getpid()}', 'w',
+                  encoding='utf-8') as cfile:
+            cfile.write(cached)
+        os.replace(f'{cache_path}.{os.getpid()}', cache_path)
+    except (OSError, ValueError, TypeError):
+        LOGGER.debug("Cannot cache %s in %s", filename, cache_dir)
+    return data
@@ -29,6 +29,13 @@ with importlib.resources.as_file(
 RESULTS_DIR = '/var/lib/xtesting/results'
 LOG_PATH = os.path.join(RESULTS_DIR, 'xtesting.log')
 DEBUG_LOG_PATH = os.path.join(RESULTS_DIR, 'xtesting.debug.log')
+DURATIONS_PATH = os.path.join(RESULTS_DIR, 'durations.json')
+JOURNAL_PATH = os.path.join(RESULTS_DIR, 'journal.jsonl')
+SPOOL_PATH = os.path.join(RESULTS_DIR, 'spool.jsonl')
+SOCKET_PATH = '/var/lib/xtesting/run_tests.sock'
+CACHE_DIR = os.path.join(os.environ.get(
+    'XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'xtesting')
+DRIVERS_PATH = os.path.join(CACHE_DIR, 'drivers.json')
 
 with importlib.resources.as_file(
         importlib.resources.files('xtesting') /
@@ -23,6 +23,12 @@ INPUTS = {
     'NODE_NAME': None,
     'TEST_DB_URL': 'http://testresults.opnfv.org/test/api/v1/results',
     'TEST_DB_EXT_URL': None,
+    'TEST_DB_BULK_URL': None,
+    'TEST_DB_BATCH_INTERVAL': '10',
+    'TEST_DB_BATCH_SIZE': '0',
+    'TEST_DB_POOL_SIZE': '10',
+    'TEST_DB_RETRIES': '3',
+    'TEST_DB_TIMEOUT': '10',
     'S3_ENDPOINT_URL': None,
     'S3_DST_URL': None,
     'HTTP_DST_URL': None
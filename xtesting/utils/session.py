@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2026 Orange and others.
+#
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+"""Share one pooled HTTP session to publish and to collect the results
+
+All the test cases (push_to_db) and Campaign.dump_db reuse the keep-alive
+connections of one session per process instead of opening a new TCP/TLS
+connection for every request. It can be tuned via env:
+
+    * TEST_DB_POOL_SIZE (connections kept per host),
+    * TEST_DB_RETRIES (retries on connection errors and on 503, and also
+      on 502 and 504 if the method is idempotent),
+    * TEST_DB_TIMEOUT (seconds).
+"""
+
+import logging
+import os
+
+import requests
+import requests.adapters
+from urllib3.util import retry
+
+from xtesting.utils import env
+
+LOGGER = logging.getLogger('xtesting.utils.session')
+
+_SESSION = None
+
+
+class Session(requests.Session):
+    """Session applying a default timeout to all its requests"""
+
+    def __init__(self, timeout=None):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, *args, **kwargs):
+        # pylint: disable=arguments-differ
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, *args, **kwargs)
+
+
+class Retry(retry.Retry):
+    """Retry policy never sending again a request which may be processed
+
+    A POST may have reached the test db if the gateway answers 502 or 504
+    (or if the read times out). Only the connection errors and 503 are
+    retried whatever the method, the other statuses of status_forcelist
+    are only retried if the method is idempotent (allowed_methods).
+    """
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if status_code == 503 and self.status_forcelist and (
+                status_code in self.status_forcelist):
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+def get_adapter(pool_size, retries):
+    """Get the adapter pooling the connections of the session
+
+    The requests are only retried if they cannot have been processed by
+    the server so that a result is never pushed twice (see Retry).
+    """
+    return requests.adapters.HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size,
+        max_retries=Retry(
+            total=retries, read=0, backoff_factor=0.5,
+            status_forcelist=(502, 503, 504), raise_on_status=False))
+
+
+def get_session():
+    """Get the session shared by the process (it is created on first use
+    according to env)"""
+    global _SESSION  # pylint: disable=global-statement
+    if _SESSION is None:
+        _SESSION = Session(timeout=float(env.get('TEST_DB_TIMEOUT')))
+        adapter = get_adapter(int(env.get('TEST_DB_POOL_SIZE')),
+                              int(env.get('TEST_DB_RETRIES')))
+        _SESSION.mount('http://', adapter)
+        _SESSION.mount('https://', adapter)
+        LOGGER.debug("New HTTP session (pool size: %s, retries: %s, "
+                     "timeout: %s)", env.get('TEST_DB_POOL_SIZE'),
+                     env.get('TEST_DB_RETRIES'), _SESSION.timeout)
+    return _SESSION
+
+
+def reset():
+    """Forget the session of the parent process
+
+    The connections of the pool must not be shared by forked processes.
+    """
+    global _SESSION  # pylint: disable=global-statement
+    _SESSION = None
+
+
+os.register_at_fork(after_in_child=reset)
+
+
+def request(method, url, **kwargs):
+    """Send a request via the shared session (see requests.request)"""
+    return get_session().request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    """Send a GET request via the shared session (see requests.get)"""
+    return request('get', url, **kwargs)
+
+
+def post(url, **kwargs):
+    """Send a POST request via the shared session (see requests.post)"""
+    return request('post', url, **kwargs)
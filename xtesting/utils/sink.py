@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2026 Orange and others.
+#
+# All rights reserved. This program and the accompanying materials
+# are made available under the terms of the Apache License, Version 2.0
+# which accompanies this distribution, and is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+
+"""Write the results to a local file instead of the DB
+
+push_to_db() appends one json line per test case if TEST_DB_URL is a
+file:// URL. Every file is opened once per process and kept open for the
+whole run. Its buffer is flushed when the results are flushed by the
+runner, before forking and at exit.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+from urllib.parse import urlparse
+
+LOGGER = logging.getLogger('xtesting.utils.sink')
+
+_SINKS = {}
+_LOCK = threading.Lock()
+
+
+class FileSink():
+    """Buffered file of json lines"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # pylint: disable=consider-using-with
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def write(self, data):
+        """Append one json line (it may stay in the buffer)"""
+        line = json.dumps(data, sort_keys=True) + '\n'
+        with self.lock:
+            self.file.write(line)
+
+    def flush(self):
+        """Write the buffer to the file"""
+        with self.lock:
+            self.file.flush()
+
+    def close(self):
+        """Flush and close the file"""
+        with self.lock:
+            self.file.close()
+
+
+def get_sink(url):
+    """Get the sink of a file:// URL (it is opened on first use)"""
+    path = urlparse(url).path
+    with _LOCK:
+        if path not in _SINKS:
+            _SINKS[path] = FileSink(path)
+            LOGGER.debug("The results are written to %s", path)
+        return _SINKS[path]
+
+
+def flush():
+    """Flush all the sinks of the process"""
+    for file_sink in list(_SINKS.values()):
+        file_sink.flush()
+
+
+def close():
+    """Flush and close all the sinks of the process"""
+    with _LOCK:
+        for file_sink in _SINKS.values():
+            file_sink.close()
+        _SINKS.clear()
+
+
+def reset():
+    """Forget the sinks of the parent process
+
+    Their buffers were flushed before forking and must not be written
+    again by the child.
+    """
+    global _LOCK  # pylint: disable=global-statement
+    _LOCK = threading.Lock()
+    for file_sink in _SINKS.values():
+        file_sink.file.close()
+    _SINKS.clear()
+
+
+atexit.register(close)
+os.register_at_fork(before=flush, after_in_child=reset)